@@ -0,0 +1,101 @@
+"""
+Micro-benchmark of per-request object construction on the agent hot path.
+
+Compares building the supervisor and explain prompt chains on every call
+(template, failover LLM runnable and ``prompt | llm``) with the prebuilt
+chains returned by ``get_chain``, and times compiling the workflow graph,
+which used to happen at import. No network calls are made.
+
+Usage:
+    python -m scripts.bench_hot_path            # 2000 iterations
+    python -m scripts.bench_hot_path -n 10000
+"""
+
+import argparse
+import os
+import timeit
+from functools import partial
+
+# Provider clients need a key to be constructed; nothing is sent
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("LLM_CACHE_PATH", "")
+
+
+def _report(label: str, seconds: float, number: int) -> float:
+    per_call_us = seconds / number * 1e6
+    print(f"  {label:<34} {per_call_us:10.1f} µs/call")
+    return per_call_us
+
+
+def _rebuild(name, prompt, temperature, schema, tier):
+    """What the agents did before: new template and chain every call."""
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from src.agents.llm import _assemble, _resolve_keys
+
+    template = ChatPromptTemplate.from_messages(
+        [(message.__class__, message.prompt.template) for message in prompt.messages]
+    )
+    return template | _assemble(_resolve_keys(None, temperature, schema, tier))
+
+
+def _prebuilt(name, prompt, temperature, schema, tier):
+    from src.agents.llm import get_chain
+
+    return get_chain(
+        name, prompt, temperature=temperature, structured_output=schema, tier=tier
+    )
+
+
+def bench_chains(number: int) -> None:
+    """Per-call chain construction: rebuilt each time vs prebuilt."""
+    from src.agents.explain_agent import EXPLAIN_PROMPT, StructuredAnswer
+    from src.agents.state import RouterDecision
+    from src.agents.supervisor import SUPERVISOR_PROMPT
+
+    cases = [
+        ("supervisor", SUPERVISOR_PROMPT, 0, RouterDecision, "fast"),
+        ("explain_structured", EXPLAIN_PROMPT, 0.7, StructuredAnswer, "standard"),
+    ]
+
+    for case in cases:
+        print(f"{case[0]}:")
+        rebuild = partial(_rebuild, *case)
+        prebuilt = partial(_prebuilt, *case)
+
+        # First call populates the client registry for both variants
+        prebuilt()
+        before = _report(
+            "rebuilt per call", timeit.timeit(rebuild, number=number), number
+        )
+        after = _report(
+            "prebuilt (get_chain)", timeit.timeit(prebuilt, number=number), number
+        )
+        print(f"  {'speedup':<34} {before / after:10.1f}x")
+
+
+def bench_compile(number: int) -> None:
+    """Cost of compiling the workflow graph (paid once, lazily)."""
+    from src.agents.workflow import create_workflow
+
+    print("workflow:")
+    _report("create_workflow().compile()", timeit.timeit(
+        lambda: create_workflow().compile(), number=number
+    ), number)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hot-path construction micro-benchmark"
+    )
+    parser.add_argument(
+        "-n", "--number", type=int, default=2000, help="Iterations per case"
+    )
+    args = parser.parse_args()
+
+    bench_chains(args.number)
+    bench_compile(max(1, args.number // 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -24,8 +24,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 def seed_database():
     """Seed the vector database with tool data."""
-    from database.vectorstore import get_or_create_vectorstore, index_tools
     from data.seed_tools import get_seed_tools
+    from database.vectorstore import get_or_create_vectorstore, index_tools
     
     print("🌱 Seeding vector database...")
     tools = get_seed_tools()
@@ -45,7 +45,7 @@ def check_health():
         response = httpx.get(f"{api_url}/health", timeout=10)
         if response.status_code == 200:
             data = response.json()
-            print(f"✅ API is healthy")
+            print("✅ API is healthy")
             print(f"   Status: {data.get('status', 'unknown')}")
             print(f"   LLM Available: {data.get('llm_available', 'unknown')}")
         else:
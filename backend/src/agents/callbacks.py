@@ -0,0 +1,129 @@
+"""LangChain callback handlers for LLM calls.
+
+``UsageCallbackHandler`` is attached to every chat model built by
+``get_llm``. The agent label comes from the LangGraph node that made the
+call, so the metrics show which node spends the tokens, dollars and provider
+time. ``StreamWatchHandler`` notes whether a call has streamed tokens yet.
+"""
+
+import time
+from typing import Any
+from uuid import UUID
+
+import structlog
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.config import settings
+from src.metrics import (
+    llm_cost_dollars,
+    llm_latency,
+    llm_time_to_first_token,
+    llm_tokens,
+)
+
+log = structlog.get_logger()
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call, or 0 for models missing from the price table."""
+    prices = settings.llm_prices.get(model)
+    if prices is None:
+        return 0.0
+    input_rate, output_rate = prices
+    return (prompt_tokens * input_rate + completion_tokens * output_rate) / 1_000_000
+
+
+def _usage(response: LLMResult) -> tuple[int, int]:
+    """Prompt and completion tokens reported for a call."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    # Older providers report usage in llm_output instead
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """Record tokens, cost, time to first token and latency for a model.
+
+    Time to first token is only observed for streamed calls (e.g. the
+    explain node under ``stream_query``).
+
+    Args:
+        provider: Provider name ('openai', 'groq')
+        model: Model name, used for labels and price lookup
+    """
+
+    # Bookkeeping only; safe to run on the event loop
+    run_inline = True
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._runs: dict[UUID, dict[str, Any]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        agent = (metadata or {}).get("langgraph_node", "unknown")
+        self._runs[run_id] = {"agent": agent, "start": time.perf_counter(), "first_token": None}
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.get(run_id)
+        if run is not None and run["first_token"] is None:
+            run["first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        labels = {"agent": run["agent"], "provider": self.provider, "model": self.model}
+        now = time.perf_counter()
+        llm_latency.labels(**labels).observe(now - run["start"])
+        if run["first_token"] is not None:
+            llm_time_to_first_token.labels(**labels).observe(run["first_token"] - run["start"])
+
+        prompt_tokens, completion_tokens = _usage(response)
+        llm_tokens.labels(**labels, kind="prompt").inc(prompt_tokens)
+        llm_tokens.labels(**labels, kind="completion").inc(completion_tokens)
+        cost = estimate_cost(self.model, prompt_tokens, completion_tokens)
+        llm_cost_dollars.labels(**labels).inc(cost)
+
+        log.debug(
+            "llm_usage",
+            **labels,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=round(cost, 6),
+            latency_ms=round((now - run["start"]) * 1000, 1),
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._runs.pop(run_id, None)
+
+
+class StreamWatchHandler(BaseCallbackHandler):
+    """Note whether a call has streamed any token to its listeners.
+
+    Once tokens have reached a client (e.g. the explain node under
+    ``stream_query``), retrying the call would stream them a second time.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.streamed = False
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.streamed = True
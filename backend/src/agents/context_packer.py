@@ -0,0 +1,227 @@
+"""Token-budgeted context packing for LLM prompts.
+
+RAG returns full tool blocks (including code examples) and web search adds
+its own results; passed verbatim they make prompt size, and with it latency
+and cost, unbounded. The packer fits both into a per-agent token budget:
+tools are taken in similarity order, each at the richest detail level that
+still fits, and search results get a reserved share of the budget.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+import structlog
+import tiktoken
+
+from src.config import settings
+from src.data.seed_tools import get_tool_by_id
+from src.metrics import record_context_tokens
+from src.models.tool import AITool
+
+log = structlog.get_logger()
+
+# Rough characters-per-token ratio used when the tokenizer is unavailable
+_CHARS_PER_TOKEN = 4
+
+
+# Seconds between background attempts to load the tokenizer after a failure
+_LOAD_RETRY_SECONDS = 60.0
+
+_encoding_loaded: tiktoken.Encoding | None = None
+_load_lock = threading.Lock()
+_next_load_attempt = 0.0
+
+
+def load_encoding() -> tiktoken.Encoding | None:
+    """Load the tokenizer, downloading its BPE file on first use.
+
+    Blocks on network I/O, so it runs in warmup or a background thread, never
+    on the event loop. A failed load is not cached and is retried later.
+    """
+    global _encoding_loaded, _next_load_attempt
+
+    with _load_lock:
+        if _encoding_loaded is None:
+            try:
+                _encoding_loaded = tiktoken.get_encoding(settings.context_encoding)
+            except Exception as e:
+                _next_load_attempt = time.monotonic() + _LOAD_RETRY_SECONDS
+                log.warning(
+                    "tiktoken_unavailable",
+                    encoding=settings.context_encoding,
+                    error=str(e),
+                )
+    return _encoding_loaded
+
+
+def _encoding() -> tiktoken.Encoding | None:
+    """The tokenizer if loaded; otherwise load it in the background and estimate."""
+    global _next_load_attempt
+
+    if _encoding_loaded is None and time.monotonic() >= _next_load_attempt:
+        _next_load_attempt = time.monotonic() + _LOAD_RETRY_SECONDS
+        threading.Thread(
+            target=load_encoding, name="tiktoken-load", daemon=True
+        ).start()
+    return _encoding_loaded
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in ``text`` (estimated if the tokenizer is unavailable)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    tokens = encoding.encode(text)
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+def format_tool_block(tool: AITool, include_code: bool = True) -> str:
+    """Full markdown context block for a tool."""
+    code = f"""
+**Code Example:**
+```
+{tool.code_example}
+```""" if include_code else ""
+
+    return f"""
+## {tool.name}
+**Provider:** {tool.provider}
+**Category:** {tool.category} / {tool.subcategory}
+**Pricing:** {tool.pricing}
+**Languages:** {', '.join(tool.languages)}
+
+{tool.description}
+
+**Use Cases:** {', '.join(tool.use_cases)}
+
+**Pros:**
+{chr(10).join(f'- {p}' for p in tool.pros)}
+
+**Cons:**
+{chr(10).join(f'- {c}' for c in tool.cons)}
+
+**Alternatives:** {', '.join(tool.alternatives)}
+
+**Documentation:** {tool.documentation_url}
+{code}
+---
+"""
+
+
+def format_tool_summary(tool: AITool) -> str:
+    """Compact block used when the full one does not fit."""
+    return f"""
+## {tool.name}
+**Provider:** {tool.provider} | **Category:** {tool.category} | **Pricing:** {tool.pricing}
+
+{tool.description}
+---
+"""
+
+
+@dataclass
+class PackedContext:
+    """Prompt context after packing, with token accounting."""
+
+    retrieved_context: str
+    search_results: str
+    packed_tokens: int
+    dropped_tokens: int
+
+
+def _budget(agent: str) -> int:
+    if agent == "supervisor":
+        return settings.context_budget_supervisor
+    return settings.context_budget_explain
+
+
+def context_tool_ids(state: dict) -> list[str]:
+    """Tools to pack for a prompt: this turn's hits, then carried-over ones."""
+    return [
+        *(state.get("retrieved_tool_ids") or []),
+        *(state.get("carried_tool_ids") or []),
+    ]
+
+
+def pack_context(
+    retrieved_context: str,
+    retrieved_tool_ids: list[str],
+    search_results: str,
+    agent: str,
+    include_code: bool = True,
+) -> PackedContext:
+    """Fit retrieved tools and search results into an agent's token budget.
+
+    Args:
+        retrieved_context: RAG context text, used when tool ids are unavailable
+        retrieved_tool_ids: Retrieved tools, most similar first
+        search_results: Formatted web search results
+        agent: Agent name selecting the budget ('explain' or 'supervisor')
+        include_code: Whether tool code examples may be included
+
+    Returns:
+        Packed context and packed/dropped token counts
+    """
+    budget = _budget(agent)
+    search_tokens = count_tokens(search_results)
+    # Reserve part of the budget so search results survive a long tool list
+    reserved = min(search_tokens, int(budget * settings.context_search_share))
+    tool_budget = budget - reserved
+
+    tools = [tool for tool in map(get_tool_by_id, retrieved_tool_ids) if tool]
+    used = 0
+    dropped = 0
+    if tools:
+        blocks = []
+        for tool in tools:
+            full = format_tool_block(tool, include_code=include_code)
+            full_tokens = count_tokens(full)
+            if used + full_tokens <= tool_budget:
+                blocks.append(full)
+                used += full_tokens
+                continue
+
+            summary = format_tool_summary(tool)
+            summary_tokens = count_tokens(summary)
+            if used + summary_tokens <= tool_budget:
+                blocks.append(summary)
+                used += summary_tokens
+                dropped += full_tokens - summary_tokens
+            else:
+                dropped += full_tokens
+        packed_retrieved = "\n".join(blocks)
+    else:
+        context_tokens = count_tokens(retrieved_context)
+        packed_retrieved = truncate_tokens(retrieved_context, tool_budget)
+        used = min(context_tokens, tool_budget)
+        dropped = context_tokens - used
+
+    search_budget = budget - used
+    packed_search = truncate_tokens(search_results, search_budget)
+    search_used = min(search_tokens, search_budget)
+    used += search_used
+    dropped += search_tokens - search_used
+
+    record_context_tokens(agent, used, dropped)
+    if dropped:
+        log.info("context_packed", agent=agent, budget=budget, packed=used, dropped=dropped)
+
+    return PackedContext(
+        retrieved_context=packed_retrieved,
+        search_results=packed_search,
+        packed_tokens=used,
+        dropped_tokens=dropped,
+    )
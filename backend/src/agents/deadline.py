@@ -0,0 +1,168 @@
+"""Request deadlines and per-node time budgets for the agent workflow.
+
+Each workflow run carries an absolute deadline in ``AgentState``. Every node
+runs under the smaller of its own timeout and the time left on the request,
+so one hung Tavily or LLM call cannot hold a request (and its admission slot)
+indefinitely. Nodes that run out of time return a degraded result instead of
+failing: search is skipped, and explain falls back to listing the tools it
+retrieved.
+Degraded outputs set ``degraded`` in the state so the response is not cached.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+from src.agents.state import AgentState
+from src.config import settings
+from src.data.seed_tools import get_tool_by_id
+from src.metrics import record_deadline_event
+from src.tracing import tracer
+
+log = structlog.get_logger()
+
+def request_deadline() -> float:
+    """Absolute deadline (monotonic clock) for a request starting now."""
+    return time.monotonic() + settings.request_timeout_seconds
+
+
+def remaining_budget(state: AgentState) -> float:
+    """Seconds left before the request deadline (infinite if none is set)."""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return math.inf
+    return max(0.0, deadline - time.monotonic())
+
+
+def budget_low(state: AgentState) -> bool:
+    """Whether too little time is left for the full (slow) path."""
+    return remaining_budget(state) < settings.deadline_low_budget_seconds
+
+
+def _node_timeouts() -> dict[str, float]:
+    return {
+        "supervisor": settings.supervisor_timeout_seconds,
+        "rag": settings.rag_timeout_seconds,
+        "search": settings.search_timeout_seconds,
+        "explain": settings.explain_timeout_seconds,
+    }
+
+
+def node_budget(state: AgentState, node: str) -> float:
+    """Time a node may run: its own timeout capped by the request deadline."""
+    return min(_node_timeouts().get(node, math.inf), remaining_budget(state))
+
+
+def _supervisor_fallback(state: AgentState) -> AgentState:
+    # Answer from whatever context has been gathered so far
+    return {
+        "next_agent": "explain",
+        "messages": ["[Supervisor] Routing to explain: deadline budget low"],
+        "iteration": state.get("iteration", 0) + 1,
+        "degraded": True,
+    }
+
+
+def _rag_fallback(state: AgentState) -> AgentState:
+    return {
+        "retrieved_context": "No relevant tools found in the database.",
+        "retrieved_tool_ids": [],
+        "messages": ["[RAG] Timed out (deadline)"],
+        "degraded": True,
+    }
+
+
+def _search_fallback(state: AgentState) -> AgentState:
+    return {
+        "search_results": "",
+        "searched": True,
+        "messages": ["[Search] Skipped - deadline budget exhausted"],
+        "degraded": True,
+    }
+
+
+def _explain_fallback(state: AgentState) -> AgentState:
+    tools = [get_tool_by_id(tool_id) for tool_id in state.get("retrieved_tool_ids") or []]
+    lines = [f"- **{tool.name}**: {tool.description}" for tool in tools if tool]
+    if lines:
+        response = (
+            "I ran out of time writing a full answer. These are the most relevant "
+            "tools I found:\n\n" + "\n".join(lines)
+        )
+    else:
+        response = "I ran out of time answering this query. Please try again."
+    return {
+        "final_response": response,
+        "messages": ["[Explain] Timed out (deadline)"],
+        "degraded": True,
+    }
+
+
+_FALLBACKS: dict[str, Callable[[AgentState], AgentState]] = {
+    "supervisor": _supervisor_fallback,
+    "rag": _rag_fallback,
+    "search": _search_fallback,
+    "explain": _explain_fallback,
+}
+
+
+async def run_node(
+    node: str,
+    agent: Callable[[AgentState], Awaitable[AgentState]],
+    state: AgentState,
+) -> tuple[AgentState, str]:
+    """Run a workflow node inside its time budget.
+
+    Args:
+        node: Node name ('supervisor', 'rag', 'search' or 'explain')
+        agent: The node's agent function
+        state: Current workflow state
+
+    Returns:
+        (node output, outcome) where outcome is 'ok', 'skipped' (not started
+        because the budget was too low) or 'timeout'
+    """
+    budget = node_budget(state, node)
+
+    with tracer.start_as_current_span(node) as span:
+        span.set_attribute("deadline.budget_seconds", round(min(budget, 1e6), 3))
+        result, outcome = await _run_in_budget(node, agent, state, budget)
+        span.set_attribute("deadline.outcome", outcome)
+    return result, outcome
+
+
+async def _run_in_budget(
+    node: str,
+    agent: Callable[[AgentState], Awaitable[AgentState]],
+    state: AgentState,
+    budget: float,
+) -> tuple[AgentState, str]:
+    # Web search is optional; don't start it if it cannot finish in time
+    if node == "search" and budget < settings.search_min_budget_seconds:
+        record_deadline_event(node, "skipped")
+        log.warning("deadline_node_skipped", node=node, budget=round(budget, 2))
+        return _FALLBACKS[node](state), "skipped"
+
+    # The timeout can only fire while the agent awaits; agents run blocking
+    # I/O (embeddings, Chroma) in a thread so it cannot stall the loop
+    try:
+        async with asyncio.timeout(budget if budget != math.inf else None):
+            return await agent(state), "ok"
+    except TimeoutError:
+        record_deadline_event(node, "miss")
+        log.warning("deadline_miss", node=node, budget=round(budget, 2))
+        return _FALLBACKS[node](state), "timeout"
+
+
+def bounded(node: str, agent: Callable[[AgentState], Awaitable[AgentState]]):
+    """Wrap an agent as a graph node that respects its time budget."""
+
+    async def run(state: AgentState) -> AgentState:
+        result, _ = await run_node(node, agent, state)
+        return result
+
+    run.__name__ = f"{node}_node"
+    return run
@@ -1,12 +1,20 @@
 """Explain agent - synthesizes information into helpful responses."""
 
+import time
+
 import structlog
+from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel, Field
+from langchain_core.utils.json import parse_partial_json
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
-from src.agents.llm import get_llm
+from src.agents.context_packer import context_tool_ids, pack_context
+from src.agents.deadline import budget_low
+from src.agents.llm import get_chain
+from src.agents.model_tiers import cheapest_tier, select_tier
 from src.agents.state import AgentState
-from src.metrics import track_query
+from src.metrics import record_deadline_event, record_model_tier_call, track_query
+from src.query_analysis import QueryAnalysis, query_analysis
 
 log = structlog.get_logger()
 
@@ -39,33 +47,6 @@ class StructuredAnswer(BaseModel):
     comparison_table: ComparisonTable | None = None
 
 
-class ConversationalAnswer(BaseModel):
-    """Free-flowing conversational response for educational/definition queries."""
-
-    content: str = Field(description="Natural prose explanation, written conversationally")
-
-
-def _detect_query_type(query: str) -> str:
-    """Detect query type: definition, comparison, or recommendation.
-    
-    - definition: Educational questions like "What is X?" -> conversational prose
-    - comparison: "Compare X vs Y" -> structured with table
-    - recommendation: "Best X for Y?" -> structured with options
-    """
-    lower = query.lower()
-    
-    # Definition/educational queries - respond conversationally
-    if any(w in lower for w in ["what is", "what are", "explain", "how does", "how do", "why do", "why are", "define", "meaning of"]):
-        return "definition"
-    
-    # Comparison queries - use table format
-    if any(w in lower for w in ["compare", "vs", "versus", "difference between", "differences"]):
-        return "comparison"
-    
-    # Default to recommendation for tool-selection queries
-    return "recommendation"
-
-
 CONVERSATIONAL_SYSTEM_PROMPT = """You are a friendly AI expert explaining developer tools and concepts.
 
 Write a natural, conversational response that flows like you're explaining to a colleague. 
@@ -89,7 +70,7 @@ Return a response as JSON that matches the provided schema exactly.
 Rules:
 - Do NOT include internal routing/tooling chatter (no "routing", "retrieving", "thinking").
 - Only include "tldr" if the user explicitly asks for a TL;DR or summary.
-- Only include "comparison_table" if the user explicitly asks for a table.
+- Only include "comparison_table" when Wants Table is true (the user asked for a table, or is comparing tools).
 - Keep text concise and scannable.
 
 Retrieved Context (from our database):
@@ -104,14 +85,15 @@ Wants TL;DR: {wants_tldr}
 Wants Table: {wants_table}
 """
 
+CONVERSATIONAL_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CONVERSATIONAL_SYSTEM_PROMPT),
+    ("human", "Please explain this clearly and conversationally."),
+])
 
-def _wants_tldr(query: str) -> bool:
-    lower = query.lower()
-    return "tl;dr" in lower or "tldr" in lower or "summary" in lower
-
-
-def _wants_table(query: str) -> bool:
-    return "table" in query.lower()
+EXPLAIN_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", EXPLAIN_SYSTEM_PROMPT),
+    ("human", "Please provide a comprehensive answer to the user's query."),
+])
 
 
 def _format_table(table: ComparisonTable) -> str:
@@ -131,109 +113,233 @@ def _format_table(table: ComparisonTable) -> str:
     return "\n".join([header, separator, *body_lines])
 
 
-def _format_markdown(answer: StructuredAnswer, wants_tldr: bool, wants_table: bool) -> str:
+# Order in which structured answer sections are rendered
+_SECTION_ORDER = [
+    "tldr",
+    "recommendation",
+    "why_this_fits",
+    "options",
+    "comparison_table",
+    "tradeoffs",
+    "next_steps",
+]
+
+
+def _format_section(
+    answer: StructuredAnswer, field: str, wants_tldr: bool, wants_table: bool
+) -> list[str]:
+    """Render one field of a structured answer as markdown parts."""
     parts: list[str] = []
 
-    if wants_tldr and answer.tldr:
-        parts.append("## TL;DR")
-        parts.append(answer.tldr.strip())
-
-    parts.append("## Recommendation")
-    parts.append(answer.recommendation.strip())
-
-    if answer.why_this_fits:
-        parts.append("## Why This Fits")
-        parts.extend([f"- {item.strip()}" for item in answer.why_this_fits if item.strip()])
-
-    if answer.options:
-        parts.append("## Options")
-        for option in answer.options:
-            parts.append(f"### {option.name.strip()}")
-            parts.append(f"- What it is: {option.what_it_is.strip()}")
-            parts.append(f"- Best for: {option.best_for.strip()}")
-            if option.pricing:
-                parts.append(f"- Pricing: {option.pricing.strip()}")
-            if option.notes:
-                parts.append(f"- Notes: {option.notes.strip()}")
-
-    if wants_table and answer.comparison_table:
-        table_markdown = _format_table(answer.comparison_table)
-        if table_markdown:
-            parts.append("## Comparison")
-            parts.append(table_markdown)
-
-    if answer.tradeoffs:
-        parts.append("## Trade-offs")
-        parts.extend([f"- {item.strip()}" for item in answer.tradeoffs if item.strip()])
-
-    if answer.next_steps:
-        parts.append("## Next Steps")
-        parts.extend([f"- {item.strip()}" for item in answer.next_steps if item.strip()])
+    if field == "tldr":
+        if wants_tldr and answer.tldr:
+            parts.append("## TL;DR")
+            parts.append(answer.tldr.strip())
+
+    elif field == "recommendation":
+        parts.append("## Recommendation")
+        parts.append(answer.recommendation.strip())
+
+    elif field == "why_this_fits":
+        if answer.why_this_fits:
+            parts.append("## Why This Fits")
+            parts.extend([f"- {item.strip()}" for item in answer.why_this_fits if item.strip()])
+
+    elif field == "options":
+        if answer.options:
+            parts.append("## Options")
+            for option in answer.options:
+                parts.append(f"### {option.name.strip()}")
+                parts.append(f"- What it is: {option.what_it_is.strip()}")
+                parts.append(f"- Best for: {option.best_for.strip()}")
+                if option.pricing:
+                    parts.append(f"- Pricing: {option.pricing.strip()}")
+                if option.notes:
+                    parts.append(f"- Notes: {option.notes.strip()}")
+
+    elif field == "comparison_table":
+        if wants_table and answer.comparison_table:
+            table_markdown = _format_table(answer.comparison_table)
+            if table_markdown:
+                parts.append("## Comparison")
+                parts.append(table_markdown)
+
+    elif field == "tradeoffs":
+        if answer.tradeoffs:
+            parts.append("## Trade-offs")
+            parts.extend([f"- {item.strip()}" for item in answer.tradeoffs if item.strip()])
+
+    elif field == "next_steps":
+        if answer.next_steps:
+            parts.append("## Next Steps")
+            parts.extend([f"- {item.strip()}" for item in answer.next_steps if item.strip()])
+
+    return parts
+
+
+def _format_markdown(answer: StructuredAnswer, wants_tldr: bool, wants_table: bool) -> str:
+    parts: list[str] = []
+    for field in _SECTION_ORDER:
+        parts.extend(_format_section(answer, field, wants_tldr, wants_table))
 
     return "\n\n".join(parts).strip()
 
 
+class AnswerStream:
+    """Turn streamed explain-agent LLM chunks into incremental SSE events.
+
+    Conversational answers are forwarded as text deltas. Structured answers
+    arrive as partial JSON, which is re-parsed on every chunk so each section
+    can be rendered to markdown as soon as the model moves past it.
+
+    If a provider fails mid-stream and the call fails over, the next
+    provider's chunks carry a new message id; the JSON buffer restarts there
+    so it stays parseable, and sections already sent are not repeated.
+    """
+
+    def __init__(self, analysis: QueryAnalysis):
+        self.query_type = analysis.query_type
+        self._wants_tldr = analysis.wants_tldr
+        self._wants_table = analysis.wants_table
+        self._buffer = ""
+        self._message_id: str | None = None
+        self._emitted: set[str] = set()
+
+    def feed(self, chunk: BaseMessage) -> list[dict]:
+        """Consume one streamed message chunk.
+
+        Args:
+            chunk: Message chunk from the explain node's LLM call
+
+        Returns:
+            Events to forward to the client (possibly empty)
+        """
+        text = chunk.content if isinstance(chunk.content, str) else ""
+        for tool_chunk in getattr(chunk, "tool_call_chunks", None) or []:
+            text += tool_chunk.get("args") or ""
+
+        if not text:
+            return []
+
+        if chunk.id != self._message_id:
+            self._message_id = chunk.id
+            self._buffer = ""
+
+        if self.query_type == "definition":
+            return [{"type": "delta", "delta": text}]
+
+        self._buffer += text
+        return self._completed_sections()
+
+    def _completed_sections(self) -> list[dict]:
+        """Render sections whose JSON values are complete."""
+        try:
+            parsed = parse_partial_json(self._buffer)
+        except ValueError:
+            return []
+        if not isinstance(parsed, dict):
+            return []
+
+        # The last key may still be streaming; everything before it is final
+        events = []
+        for field in list(parsed)[:-1]:
+            if field in self._emitted or field not in StructuredAnswer.model_fields:
+                continue
+            self._emitted.add(field)
+
+            annotation = StructuredAnswer.model_fields[field].annotation
+            try:
+                value = TypeAdapter(annotation).validate_python(parsed[field])
+            except ValidationError:
+                continue
+
+            partial = StructuredAnswer.model_construct(**{field: value})
+            parts = _format_section(partial, field, self._wants_tldr, self._wants_table)
+            if parts:
+                events.append({
+                    "type": "section",
+                    "section": field,
+                    "markdown": "\n\n".join(parts),
+                })
+        return events
+
+
 @track_query("explain")
 async def explain_agent(state: AgentState) -> AgentState:
     """Synthesize retrieved context into a helpful response."""
     log.info("explain_agent_start", query=state["query"])
 
     query = state["query"]
-    query_type = _detect_query_type(query)
-    wants_tldr = _wants_tldr(query)
-    wants_table = _wants_table(query) or query_type == "comparison"
+    analysis = query_analysis(state)
+    query_type = analysis.query_type
+    wants_tldr = analysis.wants_tldr
+    wants_table = analysis.wants_table
     
     log.info("explain_agent_routing", query_type=query_type)
+
+    # Definitions don't need code examples; keep the prompt inside budget
+    context = pack_context(
+        retrieved_context=state.get("retrieved_context", "No database results"),
+        retrieved_tool_ids=context_tool_ids(state),
+        search_results=state.get("search_results", "No web results"),
+        agent="explain",
+        include_code=query_type != "definition",
+    )
+    if budget_low(state):
+        # Short on time: the cheapest tier answers fastest
+        tier = cheapest_tier()
+        record_deadline_event("explain", "degraded")
+    else:
+        # Simple queries get a small fast model; big comparisons a stronger one
+        tier = select_tier(
+            query_type,
+            tool_count=len(state.get("retrieved_tool_ids") or []),
+            context_tokens=context.packed_tokens,
+        )
+    start_time = time.perf_counter()
     
     try:
         if query_type == "definition":
-            # Use conversational mode for educational queries
-            llm = get_llm(
+            # Use conversational mode for educational queries. Plain text
+            # output (rather than a JSON schema) lets tokens stream as deltas.
+            chain = get_chain(
+                "explain_conversational",
+                CONVERSATIONAL_PROMPT,
                 model=None,
                 temperature=0.7,
-                structured_output=ConversationalAnswer,
+                tier=tier,
             )
             
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", CONVERSATIONAL_SYSTEM_PROMPT),
-                ("human", "Please explain this clearly and conversationally."),
-            ])
-            
-            chain = prompt | llm
-            
-            response: ConversationalAnswer = await chain.ainvoke({
+            response = await chain.ainvoke({
                 "query": query,
-                "retrieved_context": state.get("retrieved_context", "No database results"),
-                "search_results": state.get("search_results", "No web results"),
+                "retrieved_context": context.retrieved_context,
+                "search_results": context.search_results,
             })
             
             final_response = response.content.strip()
             
         else:
             # Use structured mode for recommendations and comparisons
-            llm = get_llm(
+            chain = get_chain(
+                "explain_structured",
+                EXPLAIN_PROMPT,
                 model=None,
                 temperature=0.7,
                 structured_output=StructuredAnswer,
+                tier=tier,
             )
             
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", EXPLAIN_SYSTEM_PROMPT),
-                ("human", "Please provide a comprehensive answer to the user's query."),
-            ])
-            
-            chain = prompt | llm
-            
             response: StructuredAnswer = await chain.ainvoke({
                 "query": query,
-                "retrieved_context": state.get("retrieved_context", "No database results"),
-                "search_results": state.get("search_results", "No web results"),
+                "retrieved_context": context.retrieved_context,
+                "search_results": context.search_results,
                 "wants_tldr": wants_tldr,
                 "wants_table": wants_table,
             })
             
             final_response = _format_markdown(response, wants_tldr, wants_table)
         
+        record_model_tier_call("explain", tier, time.perf_counter() - start_time, "ok")
         log.info("explain_agent_complete", response_length=len(final_response), query_type=query_type)
         
         return {
@@ -242,6 +348,7 @@ async def explain_agent(state: AgentState) -> AgentState:
         }
         
     except Exception as e:
+        record_model_tier_call("explain", tier, time.perf_counter() - start_time, "error")
         log.error("explain_agent_error", error=str(e))
         return {
             "final_response": f"I encountered an error generating a response: {str(e)}",
@@ -0,0 +1,83 @@
+"""Parallel source fan-out for the agent workflow.
+
+Instead of the supervisor visiting RAG and web search one after another, a
+local planner decides up front which sources a query needs. The chosen
+sources run as parallel graph branches, each within its deadline budget (see
+``src.agents.deadline``), and a join node merges them before the explain
+agent. Wall-clock time becomes the slowest source rather than the sum of all
+of them.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+from src.agents.deadline import run_node
+from src.agents.rag_agent import rag_agent
+from src.agents.search_agent import search_agent
+from src.agents.state import AgentState
+from src.config import settings
+from src.metrics import record_branch_outcome, record_routing_decision
+from src.query_analysis import query_analysis
+
+log = structlog.get_logger()
+
+
+def plan_sources(state: AgentState) -> list[str]:
+    """Decide which source branches to run for a query.
+
+    The catalog is always consulted; web search is added when Tavily is
+    configured and the query asks about recent events.
+
+    Args:
+        state: Current workflow state
+
+    Returns:
+        Branch node names to run in parallel
+    """
+    sources = ["rag"]
+    if settings.tavily_api_key and query_analysis(state).wants_recent:
+        sources.append("search")
+
+    for source in sources:
+        record_routing_decision("plan", source)
+    log.info("sources_planned", sources=sources)
+    return sources
+
+
+async def planner(state: AgentState) -> AgentState:
+    """Entry node; the branch choice itself happens on its outgoing edge."""
+    return {"iteration": state.get("iteration", 0) + 1}
+
+
+async def _run_branch(
+    branch: str,
+    agent: Callable[[AgentState], Awaitable[AgentState]],
+    state: AgentState,
+) -> AgentState:
+    """Run a source agent within its time budget and record how it ended."""
+    start_time = time.perf_counter()
+    result, outcome = await run_node(branch, agent, state)
+    record_branch_outcome(branch, outcome, time.perf_counter() - start_time)
+    return result
+
+
+async def rag_branch(state: AgentState) -> AgentState:
+    """Catalog retrieval branch; a timeout leaves the answer without tools."""
+    return await _run_branch("rag", rag_agent, state)
+
+
+async def search_branch(state: AgentState) -> AgentState:
+    """Web search branch; a timeout answers from the catalog alone."""
+    return await _run_branch("search", search_agent, state)
+
+
+async def join_sources(state: AgentState) -> AgentState:
+    """Merge point for the source branches before the explain agent."""
+    log.info(
+        "sources_joined",
+        tool_count=len(state.get("retrieved_tool_ids") or []),
+        has_search=bool(state.get("search_results")),
+    )
+    return {"next_agent": "explain"}
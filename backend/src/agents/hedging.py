@@ -0,0 +1,178 @@
+"""Hedged LLM requests to trim provider tail latency.
+
+If the primary call has not returned after a high percentile of its recent
+latency, a duplicate request is sent to the secondary provider and the first
+successful response wins; the other call is cancelled. A credit-based budget
+caps hedges at a fixed share of requests so the extra cost stays bounded.
+
+Streamed calls (e.g. the explain node under ``stream_query``) are never
+hedged: the client is already reading the primary's tokens, and an answer
+from the hedge would not match them. Callers that stream tokens mark the run
+with ``STREAMING_CONFIG_KEY`` in its configurable, which every nested call
+inherits.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Hashable
+from typing import Any
+
+import structlog
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from src.metrics import record_hedge
+
+log = structlog.get_logger()
+
+# Configurable flag set on runs whose LLM tokens are streamed to a client
+STREAMING_CONFIG_KEY = "stream_tokens"
+
+
+class HedgePolicy:
+    """Latency tracking and hedge budget shared by all hedged runnables.
+
+    Args:
+        percentile: Latency percentile after which a hedge is sent (0-1)
+        min_delay: Lower bound on the hedge delay in seconds
+        min_samples: Samples needed for a key before hedging starts
+        budget_ratio: Maximum share of requests that may be hedged
+        window_size: Recent latency samples kept per key
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_delay: float = 1.0,
+        min_samples: int = 20,
+        budget_ratio: float = 0.05,
+        window_size: int = 200,
+    ):
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._min_samples = min_samples
+        self._budget_ratio = budget_ratio
+        self._window_size = window_size
+        self._latencies: dict[Hashable, deque[float]] = {}
+        # Each request earns budget_ratio credit; a hedge spends one
+        self._credit = 0.0
+        self._max_credit = 10.0
+
+    def delay(self, key: Hashable) -> float | None:
+        """Seconds to wait before hedging, or None if too few samples."""
+        samples = self._latencies.get(key)
+        if not samples or len(samples) < self._min_samples:
+            return None
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self._percentile * len(ordered)))
+        return max(self._min_delay, ordered[index])
+
+    def observe(self, key: Hashable, latency: float) -> None:
+        """Record the latency of a primary call.
+
+        Primaries abandoned for a winning hedge are recorded with their
+        elapsed time (a lower bound); leaving them out would bias the window
+        towards fast calls and make hedging fire more and more often.
+        """
+        samples = self._latencies.setdefault(key, deque(maxlen=self._window_size))
+        samples.append(latency)
+
+    def on_request(self) -> None:
+        """Accrue hedge budget for one request."""
+        # Rounded so e.g. ten 0.1 credits add up to exactly one hedge
+        credit = min(self._max_credit, self._credit + self._budget_ratio)
+        self._credit = round(credit, 6)
+
+    def try_spend(self) -> bool:
+        """Take budget for one hedge; False when the budget is exhausted."""
+        if self._credit < 1.0:
+            return False
+        self._credit -= 1.0
+        return True
+
+
+def _is_streamed(config: RunnableConfig) -> bool:
+    """Whether the call's tokens are being streamed to a client."""
+    return bool((config.get("configurable") or {}).get(STREAMING_CONFIG_KEY))
+
+
+async def _first_success(tasks: dict[asyncio.Task, str]) -> tuple[Any, str]:
+    """Return the first successful result and its label; raise if all fail."""
+    pending = set(tasks)
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), tasks[task]
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def hedged(
+    key: Hashable,
+    primary: Runnable,
+    secondary: Runnable,
+    policy: HedgePolicy,
+) -> Runnable:
+    """Wrap ``primary`` so slow calls are hedged to ``secondary``.
+
+    A primary that fails before the hedge delay falls over to the secondary,
+    matching the plain failover behaviour.
+
+    Args:
+        key: Latency tracking key (e.g., provider, model and schema)
+        primary: Runnable tried first
+        secondary: Runnable used for the hedge and for failover
+        policy: Shared latency and budget policy
+    """
+
+    async def call(input: Any, config: RunnableConfig) -> Any:
+        policy.on_request()
+        start_time = time.perf_counter()
+        primary_task = asyncio.ensure_future(primary.ainvoke(input, config))
+        delay = None if _is_streamed(config) else policy.delay(key)
+
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        except asyncio.CancelledError:
+            primary_task.cancel()
+            raise
+
+        if not done and policy.try_spend():
+            record_hedge("issued")
+            waited_ms = round((time.perf_counter() - start_time) * 1000)
+            log.info("llm_hedge_issued", waited_ms=waited_ms)
+            hedge_task = asyncio.ensure_future(secondary.ainvoke(input, config))
+            result, winner = await _first_success(
+                {primary_task: "primary", hedge_task: "hedge"}
+            )
+            if winner == "primary":
+                policy.observe(key, time.perf_counter() - start_time)
+            else:
+                record_hedge("won")
+                if not primary_task.done() or primary_task.cancelled():
+                    # Censored sample: the primary took at least this long
+                    policy.observe(key, time.perf_counter() - start_time)
+            return result
+
+        if not done:
+            record_hedge("budget_exhausted")
+
+        try:
+            result = await primary_task
+        except Exception as e:
+            log.warning("llm_primary_failed", error=str(e))
+            return await secondary.ainvoke(input, config)
+
+        policy.observe(key, time.perf_counter() - start_time)
+        return result
+
+    return RunnableLambda(call, name="hedged_llm")
@@ -1,73 +1,396 @@
 """LLM provider helper - supports OpenAI (primary) and Groq (fallback)."""
 
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import httpx
 import structlog
-from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langchain_groq import ChatGroq
-from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+from opentelemetry.trace import Span
 
+from src.agents.callbacks import StreamWatchHandler, UsageCallbackHandler
+from src.agents.context_packer import count_tokens
+from src.agents.hedging import HedgePolicy, hedged
+from src.agents.llm_cache import get_llm_cache, is_cacheable, make_key
+from src.agents.model_tiers import tier_model
+from src.agents.throttle import ProviderThrottledError, create_limiters, retrying
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError
 from src.config import settings
+from src.health import health_state
+from src.metrics import llm_pool_connections, record_llm_registry_lookup
+from src.tracing import tracer
 
 log = structlog.get_logger()
 
+# Providers in failover order, with their default models
+DEFAULT_MODELS = {
+    "openai": "gpt-4o-mini",  # Fast, cheap default
+    "groq": "llama-3.3-70b-versatile",
+}
+
+RegistryKey = tuple[str, str, float, type | None]
+
+
+class LLMRegistry:
+    """Process-wide cache of LLM runnables with pooled HTTP clients.
+
+    Runnables are keyed by (provider, model, temperature, schema) so the
+    client and any ``with_structured_output`` binding are built once. All
+    runnables for a provider share one ``httpx.AsyncClient``, so TCP and TLS
+    connections are reused across agents and requests. Failover and prompt
+    chains assembled on top of them are cached here too.
+    """
+
+    def __init__(self):
+        self._models: dict[RegistryKey, Any] = {}
+        self._chains: dict[tuple, Runnable] = {}
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+        # get_llm is also called from worker threads during warmup
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def http_client(self, provider: str) -> httpx.AsyncClient:
+        """Get the pooled async HTTP client for a provider."""
+        with self._lock:
+            client = self._http_clients.get(provider)
+            if client is None:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.llm_pool_max_connections,
+                        max_keepalive_connections=settings.llm_pool_max_keepalive,
+                        keepalive_expiry=settings.llm_pool_keepalive_expiry_seconds,
+                    ),
+                    timeout=settings.llm_request_timeout_seconds,
+                )
+                self._http_clients[provider] = client
+                log.info("llm_http_client_created", provider=provider)
+            return client
+
+    def get(self, key: RegistryKey, factory: Callable[[], Any]) -> Any:
+        """Return the runnable for ``key``, building it with ``factory`` once."""
+        provider = key[0]
+        with self._lock:
+            runnable = self._models.get(key)
+        if runnable is not None:
+            record_llm_registry_lookup(provider, "hit")
+            return runnable
+
+        record_llm_registry_lookup(provider, "miss")
+        runnable = factory()
+        with self._lock:
+            # Keep the first instance if another thread built one concurrently
+            return self._models.setdefault(key, runnable)
+
+    def chain(self, key: tuple, factory: Callable[[], Runnable]) -> Runnable:
+        """Return the assembled chain for ``key``, building it with ``factory`` once."""
+        with self._lock:
+            chain = self._chains.get(key)
+        if chain is not None:
+            return chain
+
+        chain = factory()
+        with self._lock:
+            return self._chains.setdefault(key, chain)
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Count pooled connections per provider by state (active/idle)."""
+        stats = {}
+        for provider, client in list(self._http_clients.items()):
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = getattr(pool, "connections", [])
+            idle = sum(1 for conn in connections if conn.is_idle())
+            stats[provider] = {"active": len(connections) - idle, "idle": idle}
+        return stats
+
+    def refresh_metrics(self) -> None:
+        """Export current pool usage as Prometheus gauges."""
+        for provider, counts in self.pool_stats().items():
+            for state, count in counts.items():
+                llm_pool_connections.labels(provider=provider, state=state).set(count)
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP clients and drop cached runnables."""
+        with self._lock:
+            clients = list(self._http_clients.values())
+            self._http_clients.clear()
+            self._models.clear()
+            self._chains.clear()
+        for client in clients:
+            await client.aclose()
+
+
+llm_registry = LLMRegistry()
+
+
+def _build(provider: str, model: str, temperature: float, structured_output: type | None):
+    callbacks = [UsageCallbackHandler(provider, model)]
+    if provider == "openai":
+        llm = ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            api_key=settings.openai_api_key,
+            http_async_client=llm_registry.http_client(provider),
+            # Retries are owned by the shared retry policy in _guarded
+            max_retries=0,
+            # Report token usage on streamed calls too
+            stream_usage=True,
+            callbacks=callbacks,
+        )
+    else:
+        llm = ChatGroq(
+            model=model,
+            temperature=temperature,
+            api_key=settings.groq_api_key,
+            http_async_client=llm_registry.http_client(provider),
+            max_retries=0,
+            callbacks=callbacks,
+        )
+
+    if structured_output:
+        llm = llm.with_structured_output(structured_output)
+
+    return llm
+
+
+def _provider_keys() -> dict[str, str | None]:
+    return {
+        "openai": settings.openai_api_key,
+        "groq": settings.groq_api_key,
+    }
+
+
+def create_circuit_breakers() -> dict[str, CircuitBreaker]:
+    """Build one circuit breaker per provider from settings."""
+    return {
+        provider: CircuitBreaker(
+            provider,
+            failure_rate_threshold=settings.circuit_failure_rate_threshold,
+            window_size=settings.circuit_window_size,
+            min_calls=settings.circuit_min_calls,
+            slow_call_seconds=settings.circuit_slow_call_seconds,
+            open_seconds=settings.circuit_open_seconds,
+        )
+        for provider in DEFAULT_MODELS
+    }
+
+
+circuit_breakers = create_circuit_breakers()
+
+provider_limiters = create_limiters()
+
+hedge_policy = HedgePolicy(
+    percentile=settings.llm_hedge_percentile,
+    min_delay=settings.llm_hedge_min_delay_seconds,
+    min_samples=settings.llm_hedge_min_samples,
+    budget_ratio=settings.llm_hedge_budget_ratio,
+)
+
+
+def _estimate_tokens(input: Any) -> int:
+    """Rough prompt plus completion size of a call, for pacing."""
+    text = input.to_string() if hasattr(input, "to_string") else str(input)
+    return count_tokens(text) + settings.llm_estimated_completion_tokens
+
+
+def _with_handler(
+    config: RunnableConfig, handler: BaseCallbackHandler
+) -> RunnableConfig:
+    """Copy of ``config`` with one more callback handler inherited by the call."""
+    callbacks = config.get("callbacks")
+    if callbacks is None:
+        callbacks = [handler]
+    elif isinstance(callbacks, list):
+        callbacks = [*callbacks, handler]
+    else:
+        callbacks = callbacks.copy()
+        callbacks.add_handler(handler, inherit=True)
+    return {**config, "callbacks": callbacks}
+
+
+def _guarded(key: RegistryKey, llm: Runnable) -> Runnable:
+    """Wrap a provider runnable with caching, pacing, retries and a circuit breaker."""
+    provider, model, temperature, structured_output = key
+    cacheable = is_cacheable(temperature)
+
+    async def call(input: Any, config: RunnableConfig) -> Any:
+        with tracer.start_as_current_span(
+            f"llm.{provider}", attributes={"llm.model": model}
+        ) as span:
+            return await _call(input, config, span)
+
+    async def _call(input: Any, config: RunnableConfig, span: Span) -> Any:
+        cache_key = None
+        if cacheable:
+            cache_key = make_key(provider, model, temperature, structured_output, input)
+            cached = await get_llm_cache().aget(cache_key, structured_output)
+            span.set_attribute("llm.cache_hit", cached is not None)
+            if cached is not None:
+                return cached
+
+        # Pace before the breaker so a throttled call fails over without
+        # reserving a half-open probe
+        limiter = provider_limiters[provider]
+        tokens = _estimate_tokens(input)
+        await limiter.acquire(tokens)
+
+        breaker = circuit_breakers[provider]
+        if not breaker.allow():
+            raise CircuitOpenError(provider)
+
+        watch = StreamWatchHandler()
+        config = _with_handler(config, watch)
+        start_time = time.perf_counter()
+        try:
+            async for attempt in retrying(provider, streamed=lambda: watch.streamed):
+                with attempt:
+                    # Retries are paced too, so a burst of 429s cannot turn
+                    # into a retry storm
+                    if attempt.retry_state.attempt_number > 1:
+                        await limiter.acquire(tokens)
+                    result = await llm.ainvoke(input, config)
+        except (asyncio.CancelledError, ProviderThrottledError):
+            # Neither says anything about the provider's health
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            health_state.record_provider_failure(provider, str(e))
+            log.warning("llm_call_failed", provider=provider, error=str(e))
+            raise
+
+        latency = time.perf_counter() - start_time
+        breaker.record_success(latency)
+        health_state.record_provider_success(provider, latency)
+        if cache_key is not None:
+            await get_llm_cache().aset(cache_key, result)
+        return result
+
+    return RunnableLambda(call, name=f"{provider}_llm")
+
+
+def _resolve_keys(
+    model: str | None,
+    temperature: float,
+    structured_output: type | None,
+    tier: str | None,
+) -> tuple[RegistryKey, ...]:
+    """Registry keys of the configured providers, in failover order."""
+    keys = []
+    for provider, api_key in _provider_keys().items():
+        if not api_key:
+            continue
+
+        provider_model = (
+            (model if not keys else None)
+            or tier_model(tier, provider)
+            or DEFAULT_MODELS[provider]
+        )
+        keys.append((provider, provider_model, temperature, structured_output))
+    return tuple(keys)
+
+
+def _assemble(keys: tuple[RegistryKey, ...]) -> Runnable:
+    """Wrap each provider runnable and chain them for failover (or hedging)."""
+    chain = []
+    for key in keys:
+        provider, provider_model, temperature, structured_output = key
+        try:
+            llm = llm_registry.get(
+                key, partial(_build, provider, provider_model, temperature, structured_output)
+            )
+        except Exception as e:
+            log.error("llm_init_failed", provider=provider, error=str(e), exc_info=True)
+            continue
+
+        chain.append(_guarded(key, llm))
+
+    if not chain:
+        # No API keys available
+        raise ValueError(
+            "No LLM API key configured. Set OPENAI_API_KEY or GROQ_API_KEY in .env"
+        )
+
+    if settings.llm_hedging_enabled:
+        # With a single provider the hedge is a duplicate of the primary call
+        secondary = chain[1] if len(chain) > 1 else chain[0]
+        if len(chain) > 2:
+            secondary = secondary.with_fallbacks(chain[2:])
+        return hedged(keys[0], chain[0], secondary, hedge_policy)
+
+    if len(chain) == 1:
+        return chain[0]
+    return chain[0].with_fallbacks(chain[1:])
+
 
 def get_llm(
     model: str | None = None,
     temperature: float = 0.7,
     structured_output: type | None = None,
-) -> BaseChatModel:
+    tier: str | None = None,
+) -> Runnable:
     """
-    Get LLM instance with OpenAI as primary, Groq as fallback.
+    Get LLM runnable with OpenAI as primary, Groq as fallback.
+
+    Calls fail over at call time: if the primary raises (429, 5xx, timeout)
+    or its circuit breaker is open, the next configured provider is tried.
+    With hedging enabled, slow primary calls are also raced against the
+    next provider.
+    Provider runnables and the assembled failover chain come from the shared
+    registry, so repeated calls reuse them and their pooled connections.
     
     Args:
-        model: Model name (defaults based on provider)
+        model: Model name for the primary provider (others use their default)
         temperature: Sampling temperature
         structured_output: Pydantic model for structured output
+        tier: Model tier from the configured ladder, resolved per provider
         
     Returns:
-        Configured LLM instance
+        Configured LLM runnable
     """
-    # Try OpenAI first (if API key is set)
-    if settings.openai_api_key:
-        try:
-            openai_model = model or "gpt-4o-mini"  # Fast, cheap default
-            log.info("using_openai", model=openai_model)
-            
-            llm = ChatOpenAI(
-                model=openai_model,
-                temperature=temperature,
-                api_key=settings.openai_api_key,
-            )
-            
-            if structured_output:
-                llm = llm.with_structured_output(structured_output)
-            
-            return llm
-            
-        except Exception as e:
-            log.error("openai_init_failed", error=str(e), exc_info=True, falling_back="groq")
-            # Don't fall through silently - log the error
-    
-    # Fallback to Groq
-    if settings.groq_api_key:
-        try:
-            groq_model = model or "llama-3.3-70b-versatile"
-            log.info("using_groq", model=groq_model)
-            
-            llm = ChatGroq(
-                model=groq_model,
-                temperature=temperature,
-                api_key=settings.groq_api_key,
-            )
-            
-            if structured_output:
-                llm = llm.with_structured_output(structured_output)
-            
-            return llm
-            
-        except Exception as e:
-            log.error("groq_init_failed", error=str(e))
-    
-    # No API keys available
-    raise ValueError(
-        "No LLM API key configured. Set OPENAI_API_KEY or GROQ_API_KEY in .env"
+    keys = _resolve_keys(model, temperature, structured_output, tier)
+    if not keys:
+        raise ValueError(
+            "No LLM API key configured. Set OPENAI_API_KEY or GROQ_API_KEY in .env"
+        )
+
+    return llm_registry.chain(
+        ("llm", keys, settings.llm_hedging_enabled), lambda: _assemble(keys)
+    )
+
+
+def get_chain(
+    name: str,
+    prompt: ChatPromptTemplate,
+    model: str | None = None,
+    temperature: float = 0.7,
+    structured_output: type | None = None,
+    tier: str | None = None,
+) -> Runnable:
+    """Get ``prompt | get_llm(...)``, built once per prompt and provider models.
+
+    Args:
+        name: Unique name of the prompt (part of the cache key)
+        prompt: Prompt template, normally a module-level constant
+        model: Model name for the primary provider
+        temperature: Sampling temperature
+        structured_output: Pydantic model for structured output
+        tier: Model tier from the configured ladder
+
+    Returns:
+        Prompt chained into the failover LLM runnable
+    """
+    keys = _resolve_keys(model, temperature, structured_output, tier)
+    return llm_registry.chain(
+        (name, keys, settings.llm_hedging_enabled),
+        lambda: prompt | get_llm(model, temperature, structured_output, tier),
     )
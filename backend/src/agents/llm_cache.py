@@ -0,0 +1,259 @@
+"""Exact-match cache for LLM responses.
+
+Responses are keyed by a hash of (provider, model, temperature, schema,
+rendered messages), so a repeated prompt with identical retrieved context is
+answered without a provider call. A bounded in-memory LRU sits in front of
+an optional SQLite file (WAL mode) that survives restarts and is shared
+between worker processes and test or benchmark runs.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+import structlog
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+from pydantic import BaseModel
+
+from src.config import settings
+from src.metrics import record_cache_hit, record_cache_miss
+
+log = structlog.get_logger()
+
+# SQLite waits this long for another writer's lock before giving up
+_BUSY_TIMEOUT_SECONDS = 0.25
+
+
+def _render(input: Any) -> Any:
+    """Serializable form of an LLM input (prompt value, messages or text)."""
+    if hasattr(input, "to_messages"):
+        return messages_to_dict(input.to_messages())
+    if isinstance(input, list) and all(isinstance(m, BaseMessage) for m in input):
+        return messages_to_dict(input)
+    return str(input)
+
+
+def make_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    schema: type[BaseModel] | None,
+    input: Any,
+) -> str:
+    """Hash everything that determines an LLM response."""
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "schema": schema.model_json_schema() if schema else None,
+            "input": _render(input),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _dump(value: Any) -> str:
+    # Messages are pydantic models too, so check for them first
+    if isinstance(value, BaseMessage):
+        return json.dumps(messages_to_dict([value]))
+    return value.model_dump_json()
+
+
+def _load(raw: str, schema: type[BaseModel] | None) -> Any:
+    if schema is not None:
+        return schema.model_validate_json(raw)
+    return messages_from_dict(json.loads(raw))[0]
+
+
+class LLMResponseCache:
+    """Two-tier (memory, then SQLite) cache of LLM responses with a TTL.
+
+    The async ``aget``/``aset`` used on the request path run SQLite I/O in a
+    worker thread, so a write locked by another process never stalls the
+    event loop; a lock held past the short busy timeout counts as a miss or a
+    skipped write. Expired rows are deleted and the table is capped at
+    ``max_rows`` every ``prune_every`` writes.
+
+    Args:
+        ttl: Seconds an entry stays valid
+        max_entries: Size of the in-memory LRU tier
+        path: SQLite file for the disk tier; None keeps the cache in memory only
+        max_rows: Rows kept in the disk tier; those expiring soonest go first
+        prune_every: Disk writes between pruning passes
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        max_entries: int = 1000,
+        path: str | None = None,
+        max_rows: int = 50000,
+        prune_every: int = 100,
+    ):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_rows = max_rows
+        self._prune_every = prune_every
+        self._writes = 0
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+        if path:
+            self._db = sqlite3.connect(
+                path,
+                timeout=_BUSY_TIMEOUT_SECONDS,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._prune(time.time())
+            log.info("llm_cache_opened", path=path)
+
+    def get(self, key: str, schema: type[BaseModel] | None = None) -> Any | None:
+        """Return a cached response, or None on a miss or expiry."""
+        now = time.time()
+        raw = self._memory_get(key, now)
+        if raw is not None:
+            return _load(raw, schema)
+        return self._disk_result(key, self._disk_get(key, now), schema)
+
+    async def aget(self, key: str, schema: type[BaseModel] | None = None) -> Any | None:
+        """``get`` with the SQLite lookup run off the event loop."""
+        now = time.time()
+        raw = self._memory_get(key, now)
+        if raw is not None:
+            return _load(raw, schema)
+        if self._db is None:
+            return self._disk_result(key, None, schema)
+        row = await asyncio.to_thread(self._disk_get, key, now)
+        return self._disk_result(key, row, schema)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response in both tiers."""
+        raw, expires_at = self._memory_set(key, value)
+        self._disk_set(key, raw, expires_at)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """``set`` with the SQLite write run off the event loop."""
+        raw, expires_at = self._memory_set(key, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_set, key, raw, expires_at)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM llm_cache")
+
+    def _memory_get(self, key: str, now: float) -> str | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None or entry[1] <= now:
+                return None
+            self._memory.move_to_end(key)
+        record_cache_hit("llm_memory")
+        return entry[0]
+
+    def _memory_set(self, key: str, value: Any) -> tuple[str, float]:
+        raw = _dump(value)
+        expires_at = time.time() + self._ttl
+        with self._lock:
+            self._remember(key, raw, expires_at)
+        return raw, expires_at
+
+    def _disk_result(
+        self, key: str, row: tuple[str, float] | None, schema: type[BaseModel] | None
+    ) -> Any | None:
+        if row is None:
+            record_cache_miss("llm")
+            return None
+        with self._lock:
+            self._remember(key, row[0], row[1])
+        record_cache_hit("llm_disk")
+        return _load(row[0], schema)
+
+    def _disk_get(self, key: str, now: float) -> tuple[str, float] | None:
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                return self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+        except sqlite3.OperationalError as e:
+            # Locked by another worker past the busy timeout: treat as a miss
+            log.warning("llm_cache_read_failed", error=str(e))
+            return None
+
+    def _disk_set(self, key: str, raw: str, expires_at: float) -> None:
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, raw, expires_at),
+                )
+                self._writes += 1
+                if self._writes % self._prune_every == 0:
+                    self._prune(time.time())
+        except sqlite3.OperationalError as e:
+            log.warning("llm_cache_write_failed", error=str(e))
+
+    def _prune(self, now: float) -> None:
+        """Delete expired rows, then the soonest-expiring rows over the cap."""
+        expired = self._db.execute(
+            "DELETE FROM llm_cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+        overflow = self._db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_rows,),
+        ).rowcount
+        if expired or overflow:
+            log.info("llm_cache_pruned", expired=expired, overflow=overflow)
+
+    def _remember(self, key: str, raw: str, expires_at: float) -> None:
+        self._memory[key] = (raw, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+
+def is_cacheable(temperature: float) -> bool:
+    """Deterministic calls are cached by default; sampled ones are opt-in."""
+    if not settings.llm_cache_enabled:
+        return False
+    return temperature == 0 or settings.llm_cache_all_temperatures
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> LLMResponseCache:
+    """Get the shared LLM response cache (opened on first use)."""
+    return LLMResponseCache(
+        ttl=settings.llm_cache_ttl_seconds,
+        max_entries=settings.llm_cache_max_entries,
+        path=settings.llm_cache_path or None,
+        max_rows=settings.llm_cache_max_rows,
+    )
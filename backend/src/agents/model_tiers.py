@@ -0,0 +1,97 @@
+"""Complexity-based model tiering.
+
+Most queries are simple definitions that a small, fast model answers well;
+multi-tool comparisons benefit from a stronger one. Each query is scored from
+its type, the number of retrieved tools and the packed context size, and the
+score picks a tier from a configurable ladder of per-provider models.
+"""
+
+from functools import lru_cache
+
+import structlog
+
+from src.config import settings
+from src.metrics import model_tier_selections
+
+log = structlog.get_logger()
+
+# Base complexity per query type (see query_analysis.analyze_query)
+_TYPE_SCORES = {
+    "definition": 0,
+    "recommendation": 1,
+    "comparison": 2,
+}
+
+
+@lru_cache(maxsize=8)
+def parse_tier_ladder(raw: str) -> dict[str, dict[str, str]]:
+    """Parse "tier=openai_model|groq_model,..." into tier -> provider -> model.
+
+    Tiers keep their configured order, cheapest first. Parsed ladders are
+    cached per string since every LLM lookup resolves a tier; treat the
+    result as read-only.
+    """
+    ladder = {}
+    for entry in raw.split(","):
+        if "=" not in entry:
+            continue
+        tier, models = entry.split("=", 1)
+        openai_model, _, groq_model = models.partition("|")
+        ladder[tier.strip()] = {
+            "openai": openai_model.strip(),
+            "groq": groq_model.strip(),
+        }
+    return ladder
+
+
+def tier_model(tier: str | None, provider: str) -> str | None:
+    """Model configured for a provider in a tier, or None to use the default."""
+    if tier is None:
+        return None
+    return parse_tier_ladder(settings.model_tiers_str).get(tier, {}).get(provider) or None
+
+
+def score_query(query_type: str, tool_count: int, context_tokens: int) -> int:
+    """Complexity score from query type, tools retrieved and context size."""
+    score = _TYPE_SCORES.get(query_type, 1)
+    if tool_count >= settings.model_tier_many_tools:
+        score += 1
+    if context_tokens >= settings.model_tier_large_context_tokens:
+        score += 1
+    return score
+
+
+def select_tier(query_type: str, tool_count: int, context_tokens: int, agent: str = "explain") -> str:
+    """Pick a tier for a query; higher scores climb the ladder.
+
+    Args:
+        query_type: 'definition', 'recommendation' or 'comparison'
+        tool_count: Number of tools in the packed context
+        context_tokens: Tokens of packed prompt context
+        agent: Calling agent, for metrics
+
+    Returns:
+        Tier name from the configured ladder
+    """
+    tiers = list(parse_tier_ladder(settings.model_tiers_str))
+    if not tiers:
+        return "default"
+
+    score = score_query(query_type, tool_count, context_tokens)
+    # Score 0 -> first tier, 1-2 -> middle, 3+ -> top (for a 3-step ladder)
+    index = min(len(tiers) - 1, (score + 1) // 2)
+    tier = tiers[index]
+
+    model_tier_selections.labels(agent=agent, tier=tier).inc()
+    log.info("model_tier_selected", agent=agent, tier=tier, score=score, query_type=query_type)
+    return tier
+
+
+def cheapest_tier(agent: str = "explain") -> str:
+    """First (cheapest, fastest) tier of the ladder, for calls short on time."""
+    tiers = list(parse_tier_ladder(settings.model_tiers_str))
+    tier = tiers[0] if tiers else "default"
+
+    model_tier_selections.labels(agent=agent, tier=tier).inc()
+    log.info("model_tier_selected", agent=agent, tier=tier, reason="deadline")
+    return tier
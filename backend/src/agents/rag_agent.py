@@ -1,77 +1,112 @@
 """RAG agent - retrieves relevant tools from the vector database."""
 
+import asyncio
+
 import structlog
 
+from src.agents.context_packer import format_tool_block
 from src.agents.state import AgentState
-from src.database.vectorstore import search_tools
 from src.data.seed_tools import get_tool_by_id
+from src.database.vectorstore import search_tools, search_tools_by_vector
 from src.metrics import track_query
+from src.query_analysis import QueryAnalysis, query_analysis
 
 log = structlog.get_logger()
 
+# Similarity hits per query; also the cap on tools carried into a follow-up
+TOP_K = 5
+
+
+def _search(state: AgentState, analysis: QueryAnalysis) -> list[dict]:
+    """Similarity search narrowed by the query's category and pricing wishes.
+
+    A filtered search that finds nothing is retried unfiltered, so a wish the
+    catalog cannot satisfy still yields the closest tools.
+    """
+    # A single category ("best vector database") narrows the search; several
+    # ("an SDK or a CLI") are left to similarity
+    category = analysis.categories[0] if len(analysis.categories) == 1 else None
+    pricing = "free" if analysis.wants_free else None
+
+    def run(category: str | None, pricing: str | None) -> list[dict]:
+        # Reuse a session's embedding if provided
+        if state.get("query_embedding"):
+            return search_tools_by_vector(
+                state["query_embedding"], category=category, pricing=pricing, k=TOP_K
+            )
+        return search_tools(
+            query=state["query"], category=category, pricing=pricing, k=TOP_K
+        )
+
+    results = run(category, pricing)
+    if not results and (category or pricing):
+        log.info("rag_agent_filter_relaxed", category=category, pricing=pricing)
+        results = run(None, None)
+    return results
+
 
 @track_query("rag")
 async def rag_agent(state: AgentState) -> AgentState:
     """Retrieve relevant AI tools from the vector database."""
     log.info("rag_agent_start", query=state["query"])
     
+    analysis = query_analysis(state)
+
     try:
-        # Search the vector store
-        results = search_tools(
-            query=state["query"],
-            k=5,
-        )
+        # Embedding and Chroma calls block; keep them off the event loop so
+        # the node's deadline can fire and parallel branches keep running
+        results = await asyncio.to_thread(_search, state, analysis)
         
-        if not results:
+        if not results and not analysis.tool_ids:
             log.info("rag_agent_no_results")
             return {
                 "retrieved_context": "No relevant tools found in the database.",
+                "retrieved_tool_ids": [],
                 "messages": ["[RAG] No matching tools found"],
             }
         
-        # Format detailed context for the explain agent
+        # Tools named in the query come first, even if similarity missed them
+        hit_ids = list(analysis.tool_ids)
+        for tool_id in [result.get("id") for result in results]:
+            if tool_id not in hit_ids:
+                hit_ids.append(tool_id)
+
+        # The previous chat turn's top tools stay in context so follow-ups
+        # ("which of those is cheaper?") can refer to them. They are kept
+        # apart from the retrieved ids, so a session never carries more than
+        # one turn's worth of tools forward.
+        carried_ids = [
+            tool_id
+            for tool_id in (state.get("previous_tool_ids") or [])[:TOP_K]
+            if tool_id not in hit_ids
+        ]
+
+        # Format detailed context; agents pack it to their token budget
         context_parts = []
+        tool_ids = []
+        carried_tool_ids = []
         
-        for result in results:
-            tool_id = result.get("id")
+        for tool_id in hit_ids + carried_ids:
             tool = get_tool_by_id(tool_id)
             
             if tool:
-                context_parts.append(f"""
-## {tool.name}
-**Provider:** {tool.provider}
-**Category:** {tool.category} / {tool.subcategory}
-**Pricing:** {tool.pricing}
-**Languages:** {', '.join(tool.languages)}
-
-{tool.description}
-
-**Use Cases:** {', '.join(tool.use_cases)}
-
-**Pros:**
-{chr(10).join(f'- {p}' for p in tool.pros)}
-
-**Cons:**
-{chr(10).join(f'- {c}' for c in tool.cons)}
-
-**Alternatives:** {', '.join(tool.alternatives)}
-
-**Documentation:** {tool.documentation_url}
-
-**Code Example:**
-```
-{tool.code_example}
-```
----
-""")
+                if tool_id in hit_ids:
+                    tool_ids.append(tool.id)
+                else:
+                    carried_tool_ids.append(tool.id)
+                context_parts.append(format_tool_block(tool))
         
         formatted_context = "\n".join(context_parts)
         
-        log.info("rag_agent_complete", result_count=len(results))
+        log.info(
+            "rag_agent_complete", result_count=len(tool_ids), carried=len(carried_ids)
+        )
         
         return {
             "retrieved_context": formatted_context,
-            "messages": [f"[RAG] Retrieved {len(results)} relevant tools"],
+            "retrieved_tool_ids": tool_ids,
+            "carried_tool_ids": carried_tool_ids,
+            "messages": [f"[RAG] Retrieved {len(tool_ids)} relevant tools"],
         }
         
     except Exception as e:
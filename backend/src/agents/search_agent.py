@@ -1,15 +1,26 @@
 """Search agent - performs web search for latest information."""
 
+import time
+from functools import lru_cache
+
 import structlog
 from tavily import AsyncTavilyClient
 
+from src.agents.search_cache import search_cache
 from src.agents.state import AgentState
 from src.config import settings
-from src.metrics import track_query
+from src.metrics import record_tavily_call, track_query
+from src.tracing import tracer
 
 log = structlog.get_logger()
 
 
+@lru_cache(maxsize=1)
+def get_tavily_client() -> AsyncTavilyClient:
+    """Get the shared Tavily client."""
+    return AsyncTavilyClient(api_key=settings.tavily_api_key)
+
+
 @track_query("search")
 async def search_agent(state: AgentState) -> AgentState:
     """Search the web for fresh information about AI tools."""
@@ -19,21 +30,35 @@ async def search_agent(state: AgentState) -> AgentState:
         log.warning("search_agent_no_api_key")
         return {
             "search_results": "",
+            "searched": True,
             "messages": ["[Search] Skipped - no Tavily API key"],
         }
     
     try:
-        client = AsyncTavilyClient(api_key=settings.tavily_api_key)
+        client = get_tavily_client()
         
         # Perform search with AI tool focus
         search_query = f"AI tools {state['query']}"
         
-        response = await client.search(
-            query=search_query,
-            search_depth="advanced",
-            max_results=5,
-            include_answer=True,
-        )
+        async def fetch() -> dict:
+            with tracer.start_as_current_span("search.tavily"):
+                return await client.search(
+                    query=search_query,
+                    search_depth="advanced",
+                    max_results=5,
+                    include_answer=True,
+                )
+
+        if settings.search_cache_enabled:
+            response = await search_cache.get_or_fetch(search_query, fetch)
+        else:
+            start_time = time.perf_counter()
+            try:
+                response = await fetch()
+            except Exception:
+                record_tavily_call("inline", "error", time.perf_counter() - start_time)
+                raise
+            record_tavily_call("inline", "ok", time.perf_counter() - start_time)
         
         # Format results
         results = []
@@ -55,6 +80,7 @@ async def search_agent(state: AgentState) -> AgentState:
         
         return {
             "search_results": formatted_results,
+            "searched": True,
             "messages": [f"[Search] Found {len(response.get('results', []))} results"],
         }
         
@@ -62,5 +88,6 @@ async def search_agent(state: AgentState) -> AgentState:
         log.error("search_agent_error", error=str(e))
         return {
             "search_results": f"Search error: {str(e)}",
+            "searched": True,
             "messages": [f"[Search] Error: {str(e)}"],
         }
@@ -0,0 +1,117 @@
+"""TTL cache of Tavily search responses with stale-while-revalidate.
+
+Web search is the slowest workflow node, and its results hardly change from
+minute to minute. Responses are keyed by the normalized search query. Fresh
+entries are served directly; entries past their TTL but inside the stale
+window are served immediately while a single background task refreshes them.
+
+Concurrent misses for the same query share one Tavily call. That call is
+shielded from its callers, so a request that hits its deadline still leaves
+the result cached for the next one.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+
+from src.config import settings
+from src.metrics import record_cache_hit, record_cache_miss, record_tavily_call
+from src.utils import normalize_query
+
+log = structlog.get_logger()
+
+SearchFetch = Callable[[], Awaitable[dict[str, Any]]]
+
+
+class SearchCache:
+    """Bounded LRU of search responses with a TTL and a stale window.
+
+    Args:
+        ttl: Seconds an entry is served as fresh
+        stale_ttl: Further seconds an expired entry is served while it refreshes
+        max_entries: Entries kept; the least recently used is evicted first
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int):
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def get_or_fetch(self, query: str, fetch: SearchFetch) -> dict[str, Any]:
+        """Return the cached response for a query, fetching it when needed.
+
+        Args:
+            query: Search query sent to Tavily
+            fetch: Performs the Tavily call for ``query``
+
+        Returns:
+            The Tavily response
+        """
+        key = normalize_query(query)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            response, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self._ttl:
+                self._entries.move_to_end(key)
+                record_cache_hit("tavily")
+                return response
+            if age < self._ttl + self._stale_ttl:
+                self._entries.move_to_end(key)
+                record_cache_hit("tavily_stale")
+                self._start_fetch(key, fetch, mode="refresh")
+                log.info("search_cache_stale", query=key, age=round(age, 1))
+                return response
+
+        record_cache_miss("tavily")
+        return await asyncio.shield(self._start_fetch(key, fetch, mode="inline"))
+
+    def clear(self) -> None:
+        """Drop every cached response and forget in-flight fetches."""
+        self._entries.clear()
+        self._inflight.clear()
+
+    def _start_fetch(self, key: str, fetch: SearchFetch, mode: str) -> asyncio.Task:
+        """Start a fetch for ``key``, or join the one already running."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch, mode))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return task
+
+    def _fetch_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the error so unawaited background refreshes don't warn
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("search_cache_fetch_failed", query=key, error=str(task.exception()))
+
+    async def _fetch(self, key: str, fetch: SearchFetch, mode: str) -> dict[str, Any]:
+        start_time = time.perf_counter()
+        try:
+            response = await fetch()
+        except Exception:
+            record_tavily_call(mode, "error", time.perf_counter() - start_time)
+            raise
+        record_tavily_call(mode, "ok", time.perf_counter() - start_time)
+
+        self._entries[key] = (response, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return response
+
+
+search_cache = SearchCache(
+    ttl=settings.search_cache_ttl_seconds,
+    stale_ttl=settings.search_cache_stale_seconds,
+    max_entries=settings.search_cache_max_entries,
+)
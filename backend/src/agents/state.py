@@ -1,11 +1,13 @@
 """Shared state and types for the multi-agent workflow."""
 
-from typing import Annotated, Literal
 import operator
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field, field_validator
 from typing_extensions import TypedDict
 
+from src.query_analysis import QueryAnalysis
+
 
 class AgentState(TypedDict):
     """Shared state across all agents in the workflow."""
@@ -22,9 +24,18 @@ class AgentState(TypedDict):
     # Context retrieved from RAG
     retrieved_context: str
 
+    # IDs of the tools RAG retrieved
+    retrieved_tool_ids: list[str]
+
+    # Previous-turn tools kept in the prompt but not reported as retrieved
+    carried_tool_ids: list[str]
+
     # Web search results
     search_results: str
 
+    # Whether web search has been attempted, even if it found nothing
+    searched: Annotated[bool, operator.or_]
+
     # Final synthesized response
     final_response: str
 
@@ -34,6 +45,22 @@ class AgentState(TypedDict):
     # Conversation history from frontend
     conversation_history: list[dict]
 
+    # Tools retrieved on the previous turn of a chat session
+    previous_tool_ids: list[str]
+
+    # Precomputed query embedding (reused from a chat session)
+    query_embedding: list[float] | None
+
+    # Absolute request deadline on the monotonic clock (None = unbounded)
+    deadline: float | None
+
+    # Set by nodes that cut corners to meet the deadline; such answers
+    # are not cached (or-ed, since parallel branches may both set it)
+    degraded: Annotated[bool, operator.or_]
+
+    # Intent signals parsed once from the query and shared by every node
+    query_analysis: QueryAnalysis | None
+
 
 class RouterDecision(BaseModel):
     """Structured output for supervisor routing decisions."""
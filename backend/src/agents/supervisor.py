@@ -1,11 +1,22 @@
 """Supervisor agent - orchestrates the workflow by routing to specialists."""
 
+import time
+
 import structlog
 from langchain_core.prompts import ChatPromptTemplate
 
-from src.agents.llm import get_llm
+from src.agents.context_packer import context_tool_ids, pack_context
+from src.agents.deadline import budget_low
+from src.agents.llm import get_chain
 from src.agents.state import AgentState, RouterDecision
-from src.metrics import track_query
+from src.config import settings
+from src.metrics import (
+    record_deadline_event,
+    record_model_tier_call,
+    record_routing_decision,
+    track_query,
+)
+from src.query_analysis import query_analysis
 
 log = structlog.get_logger()
 
@@ -40,6 +51,41 @@ Current state:
 
 Based on the current state, decide which agent to call next."""
 
+SUPERVISOR_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SUPERVISOR_SYSTEM_PROMPT),
+    ("human", "Decide the next agent to call."),
+])
+
+
+def route_by_rules(state: AgentState) -> tuple[str, str] | None:
+    """Resolve the deterministic transitions of the fixed flow locally.
+
+    Returns:
+        (next_agent, reason), or None when the choice between search and
+        explaining from what we have is genuinely ambiguous
+    """
+    # An empty, failed or timed-out search still counts; searching again
+    # would only loop until the iteration cap
+    if state.get("searched") or state.get("search_results"):
+        return "explain", "search complete"
+
+    if state.get("retrieved_tool_ids"):
+        # Questions about recent events need web search even with RAG context
+        if settings.tavily_api_key and query_analysis(state).wants_recent:
+            return "search", "query asks for recent information"
+        return "explain", "RAG found relevant tools"
+
+    if not settings.tavily_api_key:
+        return "explain", "no web search configured"
+
+    # RAG came back empty or failed: search may or may not help
+    return None
+
+
+def _record_route(path: str, next_agent: str) -> None:
+    record_routing_decision(path, next_agent)
+    log.info("supervisor_route", path=path, next_agent=next_agent)
+
 
 @track_query("supervisor")
 async def supervisor(state: AgentState) -> AgentState:
@@ -63,36 +109,72 @@ async def supervisor(state: AgentState) -> AgentState:
         # For tool questions, start with RAG
         # For news/recent queries, start with SEARCH
         # Default to RAG for most queries
+        _record_route("rule", "rag")
         return {
             "next_agent": "rag",
             "messages": ["[Supervisor] Starting with RAG agent"],
             "iteration": state["iteration"] + 1,
         }
     
-    # Create the LLM with structured output (OpenAI preferred, Groq fallback)
-    llm = get_llm(
-        model=None,  # Uses default based on provider
+    # Running out of time: answer from what has been gathered so far
+    if budget_low(state):
+        _record_route("deadline", "explain")
+        record_deadline_event("supervisor", "degraded")
+        return {
+            "next_agent": "explain",
+            "messages": ["[Supervisor] Routing to explain: deadline budget low"],
+            "degraded": True,
+            "iteration": state["iteration"] + 1,
+        }
+
+    # Fixed transitions (RAG -> explain, search -> explain) skip the LLM call
+    if settings.router_mode == "rules":
+        route = route_by_rules(state)
+        if route is not None:
+            next_agent, reason = route
+            _record_route("rule", next_agent)
+            return {
+                "next_agent": next_agent,
+                "messages": [f"[Supervisor] Routing to {next_agent}: {reason}"],
+                "iteration": state["iteration"] + 1,
+            }
+
+    # Prompt chained into the LLM with structured output (OpenAI preferred,
+    # Groq fallback). Routing is a small classification task; use the
+    # configured (fast) tier
+    chain = get_chain(
+        "supervisor",
+        SUPERVISOR_PROMPT,
+        model=None,  # Uses the tier's model for each provider
         temperature=0,
         structured_output=RouterDecision,
+        tier=settings.supervisor_model_tier,
+    )
+
+    # Routing only needs to know what context exists, not every detail
+    context = pack_context(
+        retrieved_context=state.get("retrieved_context", "None"),
+        retrieved_tool_ids=context_tool_ids(state),
+        search_results=state.get("search_results", "None"),
+        agent="supervisor",
+        include_code=False,
     )
     
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", SUPERVISOR_SYSTEM_PROMPT),
-        ("human", "Decide the next agent to call."),
-    ])
-    
-    chain = prompt | llm
-    
+    start_time = time.perf_counter()
     try:
         decision: RouterDecision = await chain.ainvoke({
             "query": state["query"],
-            "retrieved_context": state.get("retrieved_context", "None"),
-            "search_results": state.get("search_results", "None"),
+            "retrieved_context": context.retrieved_context,
+            "search_results": context.search_results,
             "has_final_response": bool(state.get("final_response")),
             "messages": "\n".join(state.get("messages", [])) or "None",
             "iteration": state["iteration"],
         })
         
+        record_model_tier_call(
+            "supervisor", settings.supervisor_model_tier, time.perf_counter() - start_time, "ok"
+        )
+        _record_route("llm", decision.next_agent)
         log.info(
             "supervisor_decision",
             next_agent=decision.next_agent,
@@ -106,7 +188,11 @@ async def supervisor(state: AgentState) -> AgentState:
         }
         
     except Exception as e:
+        record_model_tier_call(
+            "supervisor", settings.supervisor_model_tier, time.perf_counter() - start_time, "error"
+        )
         log.error("supervisor_error", error=str(e))
+        _record_route("llm_error", "rag")
         # Fallback to RAG for most queries
         return {
             "next_agent": "rag",
@@ -0,0 +1,246 @@
+"""Client-side pacing and retry policy for LLM provider calls.
+
+Each provider gets a token bucket for requests per minute and one for tokens
+per minute, so bursts are smoothed before they reach the provider instead of
+turning into 429s. Retries honour ``Retry-After`` and draw from a global
+retry budget, so a provider incident cannot multiply our own traffic.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+
+import httpx
+import structlog
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+)
+
+from src.config import settings
+from src.metrics import llm_throttle_wait_seconds, record_llm_retry
+
+log = structlog.get_logger()
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class ProviderThrottledError(Exception):
+    """Raised when pacing a call would exceed the maximum wait."""
+
+    def __init__(self, provider: str, wait: float):
+        super().__init__(f"{provider} throttled: would wait {wait:.1f}s")
+        self.provider = provider
+        self.wait = wait
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously.
+
+    Args:
+        rate_per_minute: Tokens added per minute (0 disables the bucket)
+        capacity: Maximum burst; defaults to one minute of tokens
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self._rate = rate_per_minute / 60
+        self._capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self._rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return seconds to wait until they exist.
+
+        The bucket may go negative; later callers then queue behind this one.
+        """
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        amount = min(amount, self._capacity)
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self._rate)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens taken by a reservation that was abandoned."""
+        if self.enabled:
+            self._tokens = min(self._capacity, self._tokens + min(amount, self._capacity))
+
+
+class ProviderLimiter:
+    """Request and token pacing for one provider.
+
+    Args:
+        provider: Provider name, used for metrics and errors
+        requests_per_minute: Request budget (0 = unlimited)
+        tokens_per_minute: Estimated token budget (0 = unlimited)
+        max_wait: Longest a call may be delayed before ProviderThrottledError
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_wait: float,
+    ):
+        self.provider = provider
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._max_wait = max_wait
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait until a call of ``estimated_tokens`` fits both budgets.
+
+        Raises:
+            ProviderThrottledError: If the wait would exceed ``max_wait``
+        """
+        wait = max(self._requests.reserve(1), self._tokens.reserve(estimated_tokens))
+        if wait > self._max_wait:
+            self._requests.refund(1)
+            self._tokens.refund(estimated_tokens)
+            raise ProviderThrottledError(self.provider, wait)
+
+        llm_throttle_wait_seconds.labels(provider=self.provider).observe(wait)
+        if wait > 0:
+            log.info("llm_call_paced", provider=self.provider, wait_ms=round(wait * 1000))
+            await asyncio.sleep(wait)
+
+
+class RetryBudget:
+    """Global cap on retries as a share of requests.
+
+    Args:
+        ratio: Retries allowed per request (e.g. 0.1 = one retry per ten calls)
+        max_credit: Upper bound on banked retries
+    """
+
+    def __init__(self, ratio: float, max_credit: float = 10.0):
+        self._ratio = ratio
+        self._max_credit = max_credit
+        self._credit = max_credit
+
+    def on_request(self) -> None:
+        """Accrue retry budget for one request."""
+        self._credit = round(min(self._max_credit, self._credit + self._ratio), 6)
+
+    def try_spend(self) -> bool:
+        """Take budget for one retry; False when exhausted."""
+        if self._credit < 1.0:
+            return False
+        self._credit -= 1.0
+        return True
+
+
+def _status_code(error: BaseException) -> int | None:
+    return getattr(error, "status_code", None)
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds from a provider's Retry-After header, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient provider errors: rate limits, 5xx, timeouts, connection drops."""
+    status = _status_code(error)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    if isinstance(error, (httpx.TransportError, TimeoutError)):
+        return True
+    # SDK wrappers such as openai.APIConnectionError / APITimeoutError
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def retry_wait(retry_state: RetryCallState) -> float:
+    """Honour Retry-After, else exponential backoff with jitter, capped."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    suggested = retry_after(error) if error is not None else None
+    if suggested is None:
+        base = settings.llm_retry_backoff_seconds * 2 ** (retry_state.attempt_number - 1)
+        suggested = random.uniform(0, base)
+    return min(suggested, settings.llm_retry_max_wait_seconds)
+
+
+def create_limiters() -> dict[str, ProviderLimiter]:
+    """Build one limiter per provider from settings."""
+    return {
+        "openai": ProviderLimiter(
+            "openai",
+            settings.openai_requests_per_minute,
+            settings.openai_tokens_per_minute,
+            settings.llm_throttle_max_wait_seconds,
+        ),
+        "groq": ProviderLimiter(
+            "groq",
+            settings.groq_requests_per_minute,
+            settings.groq_tokens_per_minute,
+            settings.llm_throttle_max_wait_seconds,
+        ),
+    }
+
+
+retry_budget = RetryBudget(settings.llm_retry_budget_ratio)
+
+
+def budget_stop(provider: str):
+    """Tenacity stop condition that ends retries once the budget is spent."""
+
+    def stop(retry_state: RetryCallState) -> bool:
+        if retry_budget.try_spend():
+            record_llm_retry(provider, "retried")
+            return False
+        record_llm_retry(provider, "budget_exhausted")
+        return True
+
+    return stop
+
+
+def retrying(
+    provider: str, streamed: Callable[[], bool] = lambda: False
+) -> AsyncRetrying:
+    """Retry policy for one provider call; also accrues retry budget.
+
+    Args:
+        provider: Provider name, for retry budget metrics
+        streamed: Whether the call has already streamed output; such calls
+            are not retried, since listeners would receive it twice
+    """
+    retry_budget.on_request()
+    return AsyncRetrying(
+        stop=stop_after_attempt(settings.llm_max_attempts) | budget_stop(provider),
+        wait=retry_wait,
+        retry=(
+            retry_if_exception(is_retryable)
+            & retry_if_exception(lambda _: not streamed())
+        ),
+        reraise=True,
+    )
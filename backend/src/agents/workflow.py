@@ -1,13 +1,36 @@
 """LangGraph workflow wiring all agents together."""
 
+import hashlib
+import json
+import time
+from functools import lru_cache
+
 import structlog
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
+from src.agents.deadline import bounded, request_deadline
+from src.agents.explain_agent import AnswerStream, explain_agent
+from src.agents.fanout import (
+    join_sources,
+    plan_sources,
+    planner,
+    rag_branch,
+    search_branch,
+)
+from src.agents.hedging import STREAMING_CONFIG_KEY
+from src.agents.rag_agent import rag_agent
+from src.agents.search_agent import search_agent
 from src.agents.state import AgentState
 from src.agents.supervisor import supervisor
-from src.agents.search_agent import search_agent
-from src.agents.rag_agent import rag_agent
-from src.agents.explain_agent import explain_agent
+from src.api.admission import admission
+from src.cache import cache
+from src.coalesce import SingleFlight
+from src.config import settings
+from src.data.seed_tools import get_catalog_version
+from src.metrics import record_cache_hit, record_cache_miss, stream_first_token
+from src.query_analysis import analyze_query
+from src.utils import normalize_query
 
 log = structlog.get_logger()
 
@@ -28,11 +51,11 @@ def create_workflow() -> StateGraph:
     # Create the graph with AgentState
     graph = StateGraph(AgentState)
     
-    # Add nodes for each agent
-    graph.add_node("supervisor", supervisor)
-    graph.add_node("search", search_agent)
-    graph.add_node("rag", rag_agent)
-    graph.add_node("explain", explain_agent)
+    # Add nodes for each agent, each bounded by the request deadline
+    graph.add_node("supervisor", bounded("supervisor", supervisor))
+    graph.add_node("search", bounded("search", search_agent))
+    graph.add_node("rag", bounded("rag", rag_agent))
+    graph.add_node("explain", bounded("explain", explain_agent))
     
     # Set entry point
     graph.set_entry_point("supervisor")
@@ -57,58 +80,333 @@ def create_workflow() -> StateGraph:
     return graph
 
 
-# Compile the workflow
-workflow = create_workflow().compile()
+def create_parallel_workflow() -> StateGraph:
+    """Create the fan-out workflow: plan sources, run them in parallel, explain."""
+    graph = StateGraph(AgentState)
+
+    graph.add_node("planner", planner)
+    graph.add_node("rag", rag_branch)
+    graph.add_node("search", search_branch)
+    graph.add_node("join", join_sources)
+    graph.add_node("explain", bounded("explain", explain_agent))
+
+    graph.set_entry_point("planner")
+
+    # The planner's edge returns every branch to run in the next step
+    graph.add_conditional_edges("planner", plan_sources, ["rag", "search"])
+
+    # Branches that ran together converge on a single join step
+    graph.add_edge("rag", "join")
+    graph.add_edge("search", "join")
+    graph.add_edge("join", "explain")
+    graph.add_edge("explain", END)
+
+    return graph
+
+
+@lru_cache(maxsize=1)
+def get_workflow() -> CompiledStateGraph:
+    """Compile the workflow for the configured mode on first use (or warmup)."""
+    graph = (
+        create_parallel_workflow() if settings.workflow_mode == "parallel" else create_workflow()
+    )
+    compiled = graph.compile()
+    log.info("workflow_compiled", mode=settings.workflow_mode)
+    return compiled
+
 
+def __getattr__(name: str):
+    # ``workflow`` is compiled lazily rather than at import time
+    if name == "workflow":
+        return get_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-async def run_query(query: str) -> dict:
-    """Run a query through the agent workflow."""
+
+# Concurrent identical queries share a single workflow execution
+_query_flight = SingleFlight("query")
+
+
+def _stream_key(
+    query: str,
+    conversation_history: list[dict] | None,
+    previous_tool_ids: list[str] | None = None,
+) -> str:
+    """Build the coalescing key for a streamed query and its context."""
+    if not conversation_history and not previous_tool_ids:
+        return normalize_query(query)
+    context = json.dumps(
+        [conversation_history or [], previous_tool_ids or []], sort_keys=True, default=str
+    )
+    digest = hashlib.md5(context.encode()).hexdigest()
+    return f"{normalize_query(query)}:{digest}"
+
+
+def _response_cache_key(query: str) -> str:
+    """Key cached responses on the normalized query and catalog version."""
+    return cache._generate_key(
+        "workflow_response", normalize_query(query), get_catalog_version()
+    )
+
+
+def _get_cached_response(query: str) -> dict | None:
+    """Look up a previously generated response for this query."""
+    entry = cache.get(_response_cache_key(query))
+    if entry is None:
+        record_cache_miss("workflow_response")
+        return None
+
+    record_cache_hit("workflow_response")
+    log.info("workflow_cache_hit", query=query)
+    return entry
+
+
+def _store_response(
+    query: str,
+    final_response: str,
+    messages: list[str],
+    retrieved_tool_ids: list[str],
+    search_results: str,
+    degraded: bool = False,
+) -> None:
+    """Cache a successful workflow response.
+
+    Responses that used web search expire sooner since they reflect live data.
+    Answers degraded by the request deadline are not cached.
+    """
+    if (
+        not final_response
+        or degraded
+        or any(m.startswith("[Explain] Error") for m in messages)
+    ):
+        return
+
+    used_search = bool(search_results) and not search_results.startswith("Search error")
+    ttl = settings.response_cache_search_ttl if used_search else settings.response_cache_ttl
+    cache.set(
+        _response_cache_key(query),
+        {
+            "final_response": final_response,
+            "messages": list(messages),
+            "retrieved_tool_ids": list(retrieved_tool_ids),
+            "used_search": used_search,
+        },
+        ttl,
+    )
+
+
+async def run_query(query: str, endpoint: str = "workflow") -> dict:
+    """Run a query through the agent workflow.
+
+    Cached responses are returned without running the workflow, and
+    identical concurrent queries are coalesced onto one execution. Only that
+    execution takes an admission slot.
+
+    Args:
+        query: User query
+        endpoint: Calling endpoint, used for admission metrics
+
+    Raises:
+        AdmissionRejectedError: If the workflow could not get a slot
+    """
+    cached = _get_cached_response(query)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    return await _query_flight.do(
+        normalize_query(query), lambda: _run_workflow(query, endpoint)
+    )
+
+
+async def _run_workflow(query: str, endpoint: str) -> dict:
+    """Execute the workflow for a single query under an admission slot."""
     log.info("workflow_start", query=query)
+    analysis = analyze_query(query)
     
     initial_state: AgentState = {
         "query": query,
         "messages": [],
         "next_agent": None,
         "retrieved_context": "",
+        "retrieved_tool_ids": [],
+        "carried_tool_ids": [],
         "search_results": "",
+        "searched": False,
         "final_response": "",
         "iteration": 0,
+        "conversation_history": [],
+        "previous_tool_ids": [],
+        "query_embedding": None,
+        "deadline": request_deadline(),
+        "degraded": False,
+        "query_analysis": analysis,
     }
     
-    result = await workflow.ainvoke(initial_state)
+    async with admission.slot(endpoint):
+        result = await get_workflow().ainvoke(initial_state)
     
     log.info("workflow_complete", final_response_length=len(result.get("final_response", "")))
+
+    _store_response(
+        query,
+        result.get("final_response", ""),
+        result.get("messages", []),
+        result.get("retrieved_tool_ids", []),
+        result.get("search_results", ""),
+        result.get("degraded", False),
+    )
     
     return result
 
 
-async def stream_query(query: str, conversation_history: list[dict] | None = None):
-    """Stream query results for real-time updates."""
+async def stream_query(
+    query: str,
+    conversation_history: list[dict] | None = None,
+    previous_tool_ids: list[str] | None = None,
+    query_embedding: list[float] | None = None,
+    endpoint: str = "workflow",
+):
+    """Stream query results for real-time updates.
+
+    Cached responses are replayed as a short synthetic event sequence, and
+    identical concurrent streams fan out from one upstream ``workflow.astream``.
+    Only that upstream takes an admission slot; a rejection is raised before
+    the first event.
+
+    Args:
+        query: User query
+        conversation_history: Prior messages in the conversation
+        previous_tool_ids: Tools retrieved on the previous chat turn
+        query_embedding: Precomputed embedding of ``query``
+        endpoint: Calling endpoint, used for admission metrics
+
+    Raises:
+        AdmissionRejectedError: If the workflow could not get a slot
+    """
+    if not conversation_history and not previous_tool_ids:
+        cached = _get_cached_response(query)
+        if cached is not None:
+            for event in _replay_cached(cached):
+                yield event
+            return
+
+    key = _stream_key(query, conversation_history, previous_tool_ids)
+    async for event in _query_flight.stream(
+        key,
+        lambda: _stream_workflow(
+            query, conversation_history, previous_tool_ids, query_embedding, endpoint
+        ),
+    ):
+        yield event
+
+
+def _replay_cached(cached: dict) -> list[dict]:
+    """Build the SSE event sequence for a cached response."""
+    return [
+        {
+            "node": "cache",
+            "messages": ["[Cache] Serving cached response"],
+            "final_response": None,
+            "cached": True,
+        },
+        {
+            "node": "explain",
+            "messages": cached["messages"],
+            "final_response": cached["final_response"],
+            "retrieved_tool_ids": cached["retrieved_tool_ids"],
+            "cached": True,
+        },
+    ]
+
+
+async def _stream_workflow(
+    query: str,
+    conversation_history: list[dict] | None = None,
+    previous_tool_ids: list[str] | None = None,
+    query_embedding: list[float] | None = None,
+    endpoint: str = "workflow",
+):
+    """Drive ``workflow.astream`` and translate node outputs into events.
+
+    Besides one event per node, tokens from the explain agent's LLM call are
+    forwarded as ``delta`` (conversational) or ``section`` (structured) events.
+    """
     log.info("workflow_stream_start", query=query, has_history=bool(conversation_history))
+    analysis = analyze_query(query)
 
     initial_state: AgentState = {
         "query": query,
         "messages": [],
         "next_agent": None,
         "retrieved_context": "",
+        "retrieved_tool_ids": [],
+        "carried_tool_ids": [],
         "search_results": "",
+        "searched": False,
         "final_response": "",
         "iteration": 0,
         "conversation_history": conversation_history or [],
+        "previous_tool_ids": previous_tool_ids or [],
+        "query_embedding": query_embedding,
+        "deadline": request_deadline(),
+        "degraded": False,
+        "query_analysis": analysis,
     }
     
+    # Accumulate node outputs so the finished answer can be cached
+    final_response = ""
+    messages: list[str] = []
+    retrieved_tool_ids: list[str] = []
+    search_results = ""
+    degraded = False
+
+    answer_stream = AnswerStream(analysis)
+    started_at = time.time()
+    first_token_seen = False
+
+    await admission.acquire(endpoint)
     try:
-        async for event in workflow.astream(initial_state):
-            # Each event is a dict with the node name and its output
+        # Flag the run so its LLM calls (whose tokens we forward) aren't hedged
+        async for mode, event in get_workflow().astream(
+            initial_state,
+            {"configurable": {STREAMING_CONFIG_KEY: True}},
+            stream_mode=["updates", "messages"],
+        ):
+            if mode == "messages":
+                chunk, metadata = event
+                if metadata.get("langgraph_node") != "explain":
+                    continue
+                for partial in answer_stream.feed(chunk):
+                    if not first_token_seen:
+                        first_token_seen = True
+                        stream_first_token.labels(mode=answer_stream.query_type).observe(
+                            time.time() - started_at
+                        )
+                    yield {"node": "explain", **partial}
+                continue
+
+            # Each update is a dict with the node name and its output
             for node_name, node_output in event.items():
+                messages.extend(node_output.get("messages", []))
+                final_response = node_output.get("final_response") or final_response
+                retrieved_tool_ids = node_output.get("retrieved_tool_ids", retrieved_tool_ids)
+                search_results = node_output.get("search_results", search_results)
+                degraded = degraded or node_output.get("degraded", False)
                 log.info("workflow_event", node=node_name, has_response=bool(node_output.get("final_response")))
-                yield {
+                update = {
                     "node": node_name,
                     "messages": node_output.get("messages", []),
                     "final_response": node_output.get("final_response"),
                 }
+                if "retrieved_tool_ids" in node_output:
+                    update["retrieved_tool_ids"] = node_output["retrieved_tool_ids"]
+                yield update
         
         log.info("workflow_stream_complete")
+
+        if not conversation_history and not previous_tool_ids:
+            _store_response(
+                query, final_response, messages, retrieved_tool_ids, search_results, degraded
+            )
     except Exception as e:
         log.error("workflow_stream_error", error=str(e), exc_info=True)
         # Yield error so frontend can see it
@@ -118,3 +416,5 @@ async def stream_query(query: str, conversation_history: list[dict] | None = Non
             "final_response": f"I encountered an error processing your query: {str(e)}",
         }
         raise
+    finally:
+        admission.release()
@@ -0,0 +1,129 @@
+"""Admission control for LLM-backed endpoints.
+
+Caps the number of workflows running at once across all clients. Requests
+beyond the cap wait in a bounded queue; when the queue is full or the wait
+times out, the request is rejected with 503 so clients can back off.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import structlog
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from src.config import settings
+from src.metrics import (
+    admission_inflight,
+    admission_queue_depth,
+    admission_wait_seconds,
+    record_admission_rejected,
+)
+
+log = structlog.get_logger()
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be admitted to run a workflow."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server busy: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Global limit on in-flight workflows with a bounded wait queue.
+
+    Args:
+        max_inflight: Maximum workflows allowed to run concurrently
+        max_queue: Maximum requests allowed to wait for a slot
+        queue_timeout: Seconds a request may wait before being rejected
+    """
+
+    def __init__(self, max_inflight: int, max_queue: int, queue_timeout: float):
+        self._semaphore = asyncio.Semaphore(max_inflight)
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests currently queued for a slot."""
+        return self._waiting
+
+    async def acquire(self, endpoint: str) -> None:
+        """Wait for a workflow slot.
+
+        Args:
+            endpoint: Endpoint path, used for metrics and logs
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait timed out
+        """
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            admission_wait_seconds.labels(endpoint=endpoint).observe(0)
+            admission_inflight.inc()
+            return
+
+        if self._waiting >= self._max_queue:
+            self._reject(endpoint, "queue_full")
+
+        self._waiting += 1
+        admission_queue_depth.inc()
+        start_time = time.monotonic()
+        try:
+            async with asyncio.timeout(self._queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self._reject(endpoint, "queue_timeout")
+        finally:
+            self._waiting -= 1
+            admission_queue_depth.dec()
+            admission_wait_seconds.labels(endpoint=endpoint).observe(
+                time.monotonic() - start_time
+            )
+
+        admission_inflight.inc()
+
+    def release(self) -> None:
+        """Return a workflow slot."""
+        admission_inflight.dec()
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str):
+        """Hold a workflow slot for the duration of the block."""
+        await self.acquire(endpoint)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _reject(self, endpoint: str, reason: str) -> None:
+        record_admission_rejected(endpoint, reason)
+        log.warning("admission_rejected", endpoint=endpoint, reason=reason, waiting=self._waiting)
+        raise AdmissionRejectedError(reason, retry_after=max(1, int(self._queue_timeout)))
+
+
+async def admission_rejected_handler(request: Request, exc: AdmissionRejectedError) -> JSONResponse:
+    """Return 503 with Retry-After when the server is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": "server_busy",
+            "message": "Too many queries in progress. Please retry shortly.",
+            "retry_after": f"{exc.retry_after} seconds",
+        },
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# Shared controller for all LLM-backed endpoints
+admission = AdmissionController(
+    max_inflight=settings.max_inflight_workflows,
+    max_queue=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout_seconds,
+)
@@ -1,35 +1,57 @@
 """FastAPI application for ToolChain backend."""
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-import structlog
 import sentry_sdk
+import structlog
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
 from slowapi.errors import RateLimitExceeded
 
+from src.agents.llm import llm_registry
+from src.agents.workflow import run_query, stream_query
+from src.api.admission import AdmissionRejectedError, admission_rejected_handler
 from src.api.middleware import (
     limiter,
-    rate_limit_exceeded_handler,
     query_limit,
-    tools_limit,
+    rate_limit_exceeded_handler,
     subscribe_limit,
+    tools_limit,
 )
-
-from src.agents.workflow import run_query, stream_query
 from src.config import settings
-from src.metrics import get_metrics
 from src.data.seed_tools import (
     get_all_tools,
     get_categories_with_counts,
     get_tool_by_id,
 )
-from src.database.vectorstore import ensure_indexed
-from src.models.tool import ChatQuery, CompareRequest, SubscribeRequest
+from src.database.vectorstore import embed_query, ensure_indexed
+from src.health import health_state, run_health_refresher
+from src.jobs import JobManager, create_job_backend
+from src.metrics import get_metrics, record_stream_cancellation
+from src.models.tool import (
+    BatchQueryRequest,
+    ChatQuery,
+    CompareRequest,
+    JobRequest,
+    SubscribeRequest,
+)
+from src.sessions import ChatSession, session_store
+from src.tracing import TracingMiddleware, trace_store, trace_tree
+from src.utils import normalize_query
+from src.warmup import run_warmup
 
 # Configure structured logging
 structlog.configure(
@@ -68,12 +90,74 @@ async def lifespan(app: FastAPI):
             "Set it in .env file. Get key at: https://platform.openai.com/api-keys"
         )
     
-    ensure_indexed()
+    health_state.index_count = ensure_indexed()
+    health_state.embeddings_validated = True
+    health_state.index_loaded = health_state.index_count > 0
+
+    # Build clients and fill hot caches off the accept path; /readyz stays
+    # 503 until this finishes so traffic only arrives once the process is warm
+    warmup = None
+    if settings.warmup_enabled:
+        warmup = asyncio.create_task(_warm_up())
+    else:
+        health_state.warmed_up = True
+
+    # Keep readiness state fresh off the request path
+    refresher = None
+    if settings.health_refresh_interval_seconds > 0:
+        refresher = asyncio.create_task(
+            run_health_refresher(settings.health_refresh_interval_seconds)
+        )
+
+    job_manager.start()
+
     log.info("startup_complete")
     yield
+
+    await job_manager.stop()
+    background = [task for task in (warmup, refresher) if task is not None]
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await llm_registry.aclose()
     log.info("shutdown")
 
 
+async def _warm_up() -> None:
+    """Run the startup warmup, then mark the process ready."""
+    await run_warmup()
+    health_state.warmed_up = True
+
+
+async def _run_job_query(query: str) -> dict:
+    """Run a job's query and shape the result like /api/query.
+
+    Jobs go through admission control like interactive requests, so the
+    workers count toward the in-flight cap. When the server is saturated the
+    job stays running and retries instead of failing.
+    """
+    while True:
+        try:
+            result = await run_query(query, endpoint="/api/jobs")
+            break
+        except AdmissionRejectedError as e:
+            await asyncio.sleep(e.retry_after)
+    return {
+        "response": result.get("final_response", "No response generated"),
+        "messages": result.get("messages", []),
+        "cached": result.get("cached", False),
+    }
+
+
+# Background workers for /api/jobs
+job_manager = JobManager(
+    create_job_backend(),
+    runner=_run_job_query,
+    workers=settings.job_workers,
+    result_ttl=settings.job_result_ttl_seconds,
+)
+
+
 app = FastAPI(
     title="ToolChain API",
     description="AI Tool Discovery Platform - Multi-Agent Backend",
@@ -87,6 +171,9 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
+# Admission control (global cap on in-flight workflows)
+app.add_exception_handler(AdmissionRejectedError, admission_rejected_handler)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -94,38 +181,72 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Request-ID"],
 )
 
+# Request tracing (outermost, so the root span covers every other layer)
+app.add_middleware(TracingMiddleware)
+
 
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint for monitoring."""
     from fastapi.responses import Response
+    llm_registry.refresh_metrics()
     return Response(
         content=get_metrics(),
         media_type="text/plain; charset=utf-8"
     )
 
 
+@app.get("/debug/traces/{request_id}")
+@tools_limit
+async def get_trace(request: Request, request_id: str):
+    """Span waterfall of a recent request, from the in-process trace buffer."""
+    # Disabled looks the same as unknown, so the endpoint's presence isn't leaked
+    spans = trace_store.find(request_id) if settings.trace_endpoint_enabled else None
+
+    if spans is None:
+        raise HTTPException(status_code=404, detail=f"Trace not found: {request_id}")
+
+    return {"request_id": request_id, "spans": trace_tree(spans)}
+
+
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe - succeeds whenever the process can serve requests."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness_check():
+    """Readiness probe - reports cached dependency state without doing work."""
+    snapshot = health_state.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    from src.agents.llm import get_llm
-    from src.config import settings
-    
-    # Test LLM availability
-    llm_status = "unknown"
-    try:
-        test_llm = get_llm(temperature=0)
+    """Health check endpoint (served from cached dependency state)."""
+    providers = health_state.providers
+
+    # Report LLM status from the last background probe
+    errors = [p.last_error for p in providers.values() if p.last_error]
+    if any(p.last_success_at is not None for p in providers.values()):
         llm_status = "available"
-    except Exception as e:
-        llm_status = f"error: {str(e)}"
+    elif errors:
+        llm_status = f"error: {errors[0]}"
+    elif any(p.configured for p in providers.values()):
+        llm_status = "unknown"
+    else:
+        llm_status = "unconfigured"
     
     return {
         "status": "healthy",
         "version": "0.1.0",
-        "openai_configured": bool(settings.openai_api_key),
-        "groq_configured": bool(settings.groq_api_key),
+        "ready": health_state.ready,
+        "openai_configured": providers["openai"].configured,
+        "groq_configured": providers["groq"].configured,
         "llm_status": llm_status,
     }
 
@@ -222,15 +343,126 @@ async def query_tools(request: Request, query: ChatQuery):
     """Query the AI agent for tool recommendations."""
     log.info("query_start", query=query.query)
     
-    result = await run_query(query.query)
+    result = await run_query(query.query, endpoint=request.url.path)
     
     return {
         "query": query.query,
         "response": result.get("final_response", "No response generated"),
         "messages": result.get("messages", []),
+        "cached": result.get("cached", False),
     }
 
 
+@app.post("/api/query/batch")
+@query_limit
+async def batch_query_tools(request: Request, batch: BatchQueryRequest):
+    """Run many queries concurrently, streaming NDJSON results as each completes."""
+    log.info("batch_query_start", count=len(batch.queries))
+
+    async def result_lines():
+        async for result in _run_batch(batch.queries, request.url.path):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+
+async def _run_batch(queries: list[str], endpoint: str) -> AsyncIterator[dict]:
+    """Run deduplicated queries under a concurrency limit.
+
+    Identical queries (after normalization) run once and fan out to every
+    index that asked for them. Results are yielded in completion order.
+    """
+    semaphore = asyncio.Semaphore(settings.batch_query_concurrency)
+    groups: dict[str, list[int]] = {}
+    for index, text in enumerate(queries):
+        groups.setdefault(normalize_query(text), []).append(index)
+
+    async def run_one(indices: list[int]) -> tuple[list[int], dict]:
+        async with semaphore:
+            try:
+                result = await run_query(queries[indices[0]], endpoint=endpoint)
+                return indices, {
+                    "response": result.get("final_response", "No response generated"),
+                    "messages": result.get("messages", []),
+                    "cached": result.get("cached", False),
+                }
+            except Exception as e:
+                log.error("batch_query_error", error=str(e))
+                return indices, {"error": str(e)}
+
+    tasks = [asyncio.create_task(run_one(indices)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, outcome = await next_done
+            for index in indices:
+                yield {"index": index, "query": queries[index], **outcome}
+    finally:
+        # Client went away or the stream failed; stop outstanding work
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    log.info("batch_query_complete", count=len(queries), unique=len(groups))
+
+
+async def _prepend(first: dict, events: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    """Yield an already-received event, then the rest of the stream."""
+    try:
+        yield first
+        async for event in events:
+            yield event
+    finally:
+        await events.aclose()
+
+
+async def _guard_disconnect(
+    request: Request, events: AsyncIterator[dict]
+) -> AsyncIterator[dict | None]:
+    """Relay workflow events, cancelling the workflow if the client goes away.
+
+    Yields ``None`` whenever no event arrived within the heartbeat interval.
+    Cancelling the pending step propagates into the workflow task and any
+    outstanding provider HTTP calls.
+    """
+    iterator = aiter(events)
+    pending: asyncio.Future | None = None
+    completed = False
+
+    try:
+        while True:
+            if await request.is_disconnected():
+                log.info("stream_client_disconnected", path=request.url.path)
+                record_stream_cancellation("client_disconnect")
+                return
+
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+
+            done, _ = await asyncio.wait({pending}, timeout=settings.sse_heartbeat_seconds)
+            if not done:
+                yield None
+                continue
+
+            try:
+                event = pending.result()
+            except StopAsyncIteration:
+                completed = True
+                return
+            finally:
+                pending = None
+
+            yield event
+    except asyncio.CancelledError:
+        record_stream_cancellation("server_cancelled")
+        raise
+    finally:
+        if not completed:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+            await iterator.aclose()
+
+
 @app.post("/api/query/stream")
 @query_limit
 async def stream_query_tools(request: Request, query: ChatQuery):
@@ -243,12 +475,25 @@ async def stream_query_tools(request: Request, query: ChatQuery):
         for msg in query.messages
     ] if query.messages else []
 
+    events = stream_query(query.query, conversation_history, endpoint=request.url.path)
+    # The workflow takes its admission slot before the first event; wait for
+    # it here so saturation surfaces as a 503 rather than inside the stream
+    first_event = await anext(events)
+
     async def event_generator():
         try:
-            async for event in stream_query(query.query, conversation_history):
-                # Format as SSE
+            async for event in _guard_disconnect(request, _prepend(first_event, events)):
+                if event is None:
+                    # SSE comment keeps proxies from timing out idle streams
+                    yield ": heartbeat\n\n"
+                    continue
+
+                # Format as SSE; incremental answer events get a named type
                 data = json.dumps(event)
-                yield f"data: {data}\n\n"
+                if "type" in event:
+                    yield f"event: {event['type']}\ndata: {data}\n\n"
+                else:
+                    yield f"data: {data}\n\n"
             
             # Send done event
             yield "data: {\"done\": true}\n\n"
@@ -274,6 +519,106 @@ async def stream_query_tools(request: Request, query: ChatQuery):
     )
 
 
+@app.post("/api/jobs", status_code=202)
+@query_limit
+async def create_job(request: Request, data: JobRequest):
+    """Enqueue a query and return its job id immediately."""
+    job = await job_manager.submit(data.query)
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/api/jobs/{job_id}")
+@tools_limit
+async def get_job(request: Request, job_id: str):
+    """Get a job's status and, once finished, its result."""
+    job = await job_manager.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    return job.to_dict()
+
+
+@app.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket, session_id: str | None = None):
+    """Multi-turn chat over a WebSocket.
+
+    Each connection is bound to a server-side session holding history, the
+    previous turn's tools and cached query embeddings, so clients send only
+    the new message per turn. Pass ``session_id`` to resume a session.
+    """
+    await websocket.accept()
+    session = session_store.get_or_create(session_id)
+    log.info("ws_session_open", session_id=session.id, turns=len(session.history) // 2)
+    await websocket.send_json({"type": "session", "session_id": session.id})
+
+    try:
+        while True:
+            try:
+                payload = await websocket.receive_json()
+            except (json.JSONDecodeError, KeyError):
+                await websocket.send_json({"type": "error", "error": "Invalid JSON message"})
+                continue
+
+            message = payload.get("message") if isinstance(payload, dict) else None
+            if not isinstance(message, str) or not 1 <= len(message.strip()) <= 1000:
+                await websocket.send_json(
+                    {"type": "error", "error": "message must be 1-1000 characters"}
+                )
+                continue
+
+            session_store.touch(session)
+            await _run_chat_turn(websocket, session, message.strip())
+    except WebSocketDisconnect:
+        log.info("ws_session_closed", session_id=session.id)
+
+
+async def _run_chat_turn(websocket: WebSocket, session: ChatSession, message: str) -> None:
+    """Stream one chat turn to the socket and record it on the session."""
+    embedding = session.cached_embedding(message)
+    if embedding is None:
+        try:
+            embedding = await asyncio.to_thread(embed_query, message)
+            session.remember_embedding(message, embedding)
+        except Exception as e:
+            # Retrieval falls back to embedding the query itself
+            log.warning("ws_embedding_failed", session_id=session.id, error=str(e))
+
+    final_response = ""
+    tool_ids = session.last_tool_ids
+    try:
+        events = stream_query(
+            message,
+            conversation_history=list(session.history),
+            previous_tool_ids=session.last_tool_ids,
+            query_embedding=embedding,
+            endpoint="/ws/chat",
+        )
+        async for event in events:
+            await websocket.send_json(event)
+            if event.get("retrieved_tool_ids"):
+                tool_ids = event["retrieved_tool_ids"]
+            if event.get("final_response"):
+                final_response = event["final_response"]
+    except AdmissionRejectedError as e:
+        await websocket.send_json(
+            {"type": "error", "error": str(e), "retry_after": e.retry_after}
+        )
+        return
+    except WebSocketDisconnect:
+        raise
+    except Exception as e:
+        log.error("ws_turn_error", session_id=session.id, error=str(e))
+        await websocket.send_json(
+            {"node": "error", "error": str(e), "messages": [f"Error: {str(e)}"]}
+        )
+        await websocket.send_json({"done": True})
+        return
+
+    session.record_turn(message, final_response, tool_ids)
+    await websocket.send_json({"done": True})
+
+
 @app.post("/api/subscribe")
 @subscribe_limit
 async def subscribe(request: Request, data: SubscribeRequest):
@@ -2,12 +2,12 @@
 
 import time
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import structlog
 from fastapi import Request
 from fastapi.responses import JSONResponse
-import structlog
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
 
 from src.config import settings
 from src.metrics import record_rate_limit
@@ -3,30 +3,35 @@
 import hashlib
 import json
 import time
+from collections import OrderedDict
+from collections.abc import Callable
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any
 
 import structlog
 
+from src.config import settings
 from src.metrics import record_cache_hit, record_cache_miss
 
 log = structlog.get_logger()
 
 
 class SimpleCache:
-    """Simple in-memory cache with TTL support.
+    """Simple in-memory LRU cache with TTL support.
     
     For production with multiple workers, upgrade to Redis.
     """
 
-    def __init__(self, default_ttl: int = 3600):
+    def __init__(self, default_ttl: int = 3600, max_entries: int = 1000):
         """Initialize cache.
         
         Args:
             default_ttl: Default time-to-live in seconds (1 hour)
+            max_entries: Entries kept; the least recently used is evicted first
         """
-        self._cache: dict[str, tuple[Any, float]] = {}
+        self._cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
         self._default_ttl = default_ttl
+        self._max_entries = max_entries
 
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate a cache key from arguments."""
@@ -34,7 +39,7 @@ class SimpleCache:
         hash_digest = hashlib.md5(key_data.encode()).hexdigest()
         return f"{prefix}:{hash_digest}"
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str) -> Any | None:
         """Get value from cache if not expired."""
         if key not in self._cache:
             return None
@@ -47,14 +52,19 @@ class SimpleCache:
             log.debug("cache_expired", key=key[:50])
             return None
         
+        self._cache.move_to_end(key)
         log.debug("cache_hit", key=key[:50])
         return value
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Set value in cache with TTL."""
         ttl = ttl or self._default_ttl
         expires_at = time.time() + ttl
         self._cache[key] = (value, expires_at)
+        self._cache.move_to_end(key)
+        # Entries nobody reads (expired or not) reach the front and go first
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
         log.debug("cache_set", key=key[:50], ttl=ttl)
 
     def delete(self, key: str) -> bool:
@@ -86,10 +96,10 @@ class SimpleCache:
 
 
 # Global cache instance
-cache = SimpleCache()
+cache = SimpleCache(max_entries=settings.response_cache_max_entries)
 
 
-def cached(prefix: str, ttl: Optional[int] = None):
+def cached(prefix: str, ttl: int | None = None):
     """Decorator to cache function results.
     
     Args:
@@ -123,7 +133,7 @@ def cached(prefix: str, ttl: Optional[int] = None):
     return decorator
 
 
-def async_cached(prefix: str, ttl: Optional[int] = None):
+def async_cached(prefix: str, ttl: int | None = None):
     """Decorator to cache async function results.
     
     Args:
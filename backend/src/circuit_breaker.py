@@ -0,0 +1,133 @@
+"""Circuit breakers for outbound provider calls.
+
+A breaker watches a rolling window of call outcomes. When the share of
+failed or slow calls crosses a threshold it opens and rejects calls outright,
+so callers fail over to another provider immediately instead of waiting on
+one that is down. After a cooldown a single half-open probe decides whether
+to close again.
+"""
+
+import time
+from collections import deque
+from typing import Literal
+
+import structlog
+
+from src.metrics import llm_circuit_state, record_llm_call
+
+log = structlog.get_logger()
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit open for {name}")
+        self.name = name
+
+
+class CircuitBreaker:
+    """Error-rate and latency driven circuit breaker.
+
+    Args:
+        name: Provider name, used for metrics and logs
+        failure_rate_threshold: Share of bad calls in the window that opens the circuit
+        window_size: Number of recent calls considered
+        min_calls: Calls required in the window before the circuit can open
+        slow_call_seconds: Calls slower than this count as bad
+        open_seconds: Cooldown before a half-open probe is allowed
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        slow_call_seconds: float = 20.0,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self._failure_rate_threshold = failure_rate_threshold
+        self._min_calls = min_calls
+        self._slow_call_seconds = slow_call_seconds
+        self._open_seconds = open_seconds
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        llm_circuit_state.labels(provider=name).set(_STATE_VALUES["closed"])
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the cooldown ends."""
+        if self._state == "open" and time.monotonic() - self._opened_at >= self._open_seconds:
+            self._transition("half_open")
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may proceed. Reserves the probe when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        record_llm_call(self.name, "rejected")
+        return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call and its latency in seconds."""
+        slow = latency >= self._slow_call_seconds
+        record_llm_call(self.name, "slow" if slow else "success")
+
+        if self._state == "half_open":
+            self._probe_in_flight = False
+            if slow:
+                self._transition("open")
+            else:
+                self._outcomes.clear()
+                self._transition("closed")
+            return
+
+        self._outcomes.append(not slow)
+        self._evaluate()
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        record_llm_call(self.name, "error")
+
+        if self._state == "half_open":
+            self._probe_in_flight = False
+            self._transition("open")
+            return
+
+        self._outcomes.append(False)
+        self._evaluate()
+
+    def release(self) -> None:
+        """Release a reserved probe without an outcome (e.g. on cancellation)."""
+        self._probe_in_flight = False
+
+    def _evaluate(self) -> None:
+        if self._state != "closed" or len(self._outcomes) < self._min_calls:
+            return
+
+        failure_rate = self._outcomes.count(False) / len(self._outcomes)
+        if failure_rate >= self._failure_rate_threshold:
+            self._transition("open", failure_rate=round(failure_rate, 2))
+
+    def _transition(self, state: CircuitState, **context) -> None:
+        if state == self._state:
+            return
+
+        log.warning("circuit_state_change", provider=self.name, old=self._state, new=state, **context)
+        self._state = state
+        if state == "open":
+            self._opened_at = time.monotonic()
+        llm_circuit_state.labels(provider=self.name).set(_STATE_VALUES[state])
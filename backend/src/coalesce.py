@@ -0,0 +1,156 @@
+"""Single-flight request coalescing for the agent workflow.
+
+When many clients ask the same question at the same moment, only the first
+caller runs the workflow. Concurrent duplicates await the same task (for
+``run_query``) or subscribe to the same event stream (for ``stream_query``).
+The shared execution is cancelled once every caller has gone away.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import structlog
+
+from src.metrics import inflight_flights, record_coalesced_request
+
+log = structlog.get_logger()
+
+
+class _Broadcast:
+    """Fan out events from one upstream async iterator to many subscribers.
+
+    Events are buffered for the lifetime of the upstream so that late
+    subscribers replay the full sequence from the start.
+    """
+
+    def __init__(self, source: AsyncIterator[Any]):
+        self._events: list[Any] = []
+        self._finished = False
+        self._error: BaseException | None = None
+        self._changed = asyncio.Event()
+        self.subscribers = 0
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[Any]) -> None:
+        try:
+            async for event in source:
+                self._events.append(event)
+                self._notify()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._finished = True
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        """Yield every upstream event, including those already emitted."""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self._events):
+                yield self._events[index]
+                index += 1
+            if self._finished:
+                if self._error is not None:
+                    raise self._error
+                return
+            await changed.wait()
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    Args:
+        name: Label used for metrics and logs (e.g., 'query')
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._calls: dict[str, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self._streams: dict[str, _Broadcast] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` once per key; concurrent callers share its result.
+
+        Args:
+            key: Dedupe key (e.g., a normalized query)
+            func: Zero-argument coroutine factory executed by the first caller
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            inflight_flights.labels(mode=self._name).inc()
+            task.add_done_callback(lambda t: self._release(self._calls, key, t))
+        else:
+            record_coalesced_request(self._name)
+            log.info("request_coalesced", flight=self._name, key=key[:50])
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Only abandon the shared call once no caller is left waiting
+            if self._waiters[task] == 1 and not task.done():
+                log.info("flight_cancelled", flight=self._name, key=key[:50])
+                self._release(self._calls, key, task)
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def stream(
+        self,
+        key: str,
+        factory: Callable[[], AsyncIterator[Any]],
+    ) -> AsyncIterator[Any]:
+        """Iterate a shared upstream stream, starting it if none is in flight.
+
+        Args:
+            key: Dedupe key (e.g., a normalized query)
+            factory: Zero-argument callable returning the upstream async iterator
+
+        Yields:
+            Every event produced by the shared upstream
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            broadcast = _Broadcast(factory())
+            self._streams[key] = broadcast
+            inflight_flights.labels(mode=f"{self._name}_stream").inc()
+            broadcast.task.add_done_callback(
+                lambda t: self._release(self._streams, key, broadcast)
+            )
+        else:
+            record_coalesced_request(f"{self._name}_stream")
+            log.info("stream_coalesced", flight=self._name, key=key[:50])
+
+        broadcast.subscribers += 1
+        try:
+            async for event in broadcast.subscribe():
+                yield event
+        finally:
+            broadcast.subscribers -= 1
+            # Stop the upstream workflow once every subscriber has gone away
+            if not broadcast.subscribers and not broadcast.task.done():
+                log.info("stream_flight_cancelled", flight=self._name, key=key[:50])
+                self._release(self._streams, key, broadcast)
+                broadcast.task.cancel()
+
+    def _release(self, registry: dict, key: str, entry: Any) -> None:
+        """Drop a finished flight so the next caller starts a fresh one."""
+        if registry.get(key) is entry:
+            del registry[key]
+            mode = self._name if registry is self._calls else f"{self._name}_stream"
+            inflight_flights.labels(mode=mode).dec()
@@ -1,6 +1,5 @@
 """Pydantic settings for ToolChain backend."""
 
-from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -31,12 +30,142 @@ class Settings(BaseSettings):
     # API Config - store as string to avoid JSON parsing issues
     cors_origins_str: str = "http://localhost:3000,https://toolchain.vercel.app"
     rate_limit_per_minute: int = 60
+    sse_heartbeat_seconds: float = 15.0
+
+    # Admission control for LLM-backed endpoints
+    max_inflight_workflows: int = 16
+    admission_queue_size: int = 32
+    admission_queue_timeout_seconds: float = 10.0
+
+    # Batch queries
+    batch_query_concurrency: int = 8
+
+    # WebSocket chat sessions
+    ws_max_sessions: int = 1000
+    ws_session_idle_seconds: float = 1800.0
+    ws_session_history_messages: int = 20
+    ws_session_embedding_cache: int = 16
+
+    # Async jobs ("memory" or "redis"; redis uses REDIS_URL)
+    job_backend: str = "memory"
+    job_workers: int = 4
+    job_result_ttl_seconds: int = 3600
+
+    # Pooled HTTP clients for LLM providers
+    llm_pool_max_connections: int = 100
+    llm_pool_max_keepalive: int = 20
+    llm_pool_keepalive_expiry_seconds: float = 30.0
+    llm_request_timeout_seconds: float = 60.0
+
+    # Provider circuit breakers (slow calls count as failures)
+    circuit_failure_rate_threshold: float = 0.5
+    circuit_window_size: int = 20
+    circuit_min_calls: int = 5
+    circuit_slow_call_seconds: float = 20.0
+    circuit_open_seconds: float = 30.0
+
+    # Client-side provider pacing (0 = unlimited) and retry policy
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200_000
+    groq_requests_per_minute: int = 1000
+    groq_tokens_per_minute: int = 300_000
+    llm_throttle_max_wait_seconds: float = 5.0
+    llm_estimated_completion_tokens: int = 600
+    llm_max_attempts: int = 3
+    llm_retry_budget_ratio: float = 0.1
+    llm_retry_backoff_seconds: float = 0.5
+    llm_retry_max_wait_seconds: float = 10.0
+
+    # Hedged LLM requests (off by default; duplicates cost money)
+    llm_hedging_enabled: bool = False
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_delay_seconds: float = 1.0
+    llm_hedge_min_samples: int = 20
+    llm_hedge_budget_ratio: float = 0.05
+
+    # Exact-match LLM response cache; empty path keeps it in memory only.
+    # Sampled (temperature > 0) calls are only cached when opted in.
+    llm_cache_enabled: bool = True
+    llm_cache_all_temperatures: bool = False
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 1000
+    llm_cache_max_rows: int = 50000
+    llm_cache_path: str = "./llm_cache.db"
+
+    # Tavily result cache: fresh for the TTL, then served stale (while a
+    # background refresh runs) for up to the stale window
+    search_cache_enabled: bool = True
+    search_cache_ttl_seconds: int = 900
+    search_cache_stale_seconds: int = 3600
+    search_cache_max_entries: int = 1000
+
+    # Prompt context token budgets (tiktoken encoding name)
+    context_encoding: str = "o200k_base"
+    context_budget_explain: int = 3000
+    context_budget_supervisor: int = 1000
+    context_search_share: float = 0.3
+
+    # Supervisor routing: "rules" handles fixed transitions locally and only
+    # asks the LLM when ambiguous; "llm" asks the LLM on every step
+    router_mode: str = "rules"
+
+    # Workflow shape: "sequential" lets the supervisor visit sources one at a
+    # time; "parallel" plans sources up front and runs them concurrently
+    workflow_mode: str = "sequential"
+
+    # End-to-end request deadline and per-node timeouts (each node gets the
+    # smaller of its timeout and the time left on the request)
+    request_timeout_seconds: float = 45.0
+    supervisor_timeout_seconds: float = 10.0
+    rag_timeout_seconds: float = 5.0
+    search_timeout_seconds: float = 8.0
+    explain_timeout_seconds: float = 30.0
+    # Below this, search is not started at all
+    search_min_budget_seconds: float = 3.0
+    # Below this, skip further sources and answer with the cheapest model tier
+    deadline_low_budget_seconds: float = 15.0
+
+    # Model tier ladder, cheapest first: "tier=openai_model|groq_model,..."
+    model_tiers_str: str = (
+        "fast=gpt-4o-mini|llama-3.1-8b-instant,"
+        "standard=gpt-4o-mini|llama-3.3-70b-versatile,"
+        "strong=gpt-4o|llama-3.3-70b-versatile"
+    )
+    model_tier_many_tools: int = 4
+    model_tier_large_context_tokens: int = 2000
+    supervisor_model_tier: str = "fast"
+
+    # LLM prices in USD per 1M tokens: "model=input:output,..."
+    llm_prices_str: str = (
+        "gpt-4o-mini=0.15:0.60,gpt-4o=2.50:10.00,"
+        "llama-3.3-70b-versatile=0.59:0.79,llama-3.1-8b-instant=0.05:0.08"
+    )
+
+    # Startup warmup; replaying queries calls the LLMs, so it is opt-in
+    warmup_enabled: bool = True
+    warmup_replay_top_n: int = 0
+    warmup_queries_path: str = "src/data/warmup_queries.txt"
+    warmup_timeout_seconds: float = 60.0
+
+    # Request tracing: spans kept in memory for /debug/traces/{request_id}
+    tracing_enabled: bool = True
+    trace_buffer_size: int = 500
+    # The debug endpoint exposes span attributes; enable outside production only
+    trace_endpoint_enabled: bool = False
+
+    # Health probes
+    health_refresh_interval_seconds: float = 60.0
+    health_probe_timeout_seconds: float = 5.0
 
     # Error Tracking
     sentry_dsn: str | None = None
 
     # Caching
     redis_url: str = "memory://"
+    response_cache_ttl: int = 3600
+    response_cache_search_ttl: int = 300
+    # In-memory cache size; least recently used entries are evicted first
+    response_cache_max_entries: int = 1000
 
     # Embeddings
     allow_fake_embeddings: bool = False
@@ -46,5 +175,17 @@ class Settings(BaseSettings):
         """Parse comma-separated CORS origins."""
         return [origin.strip() for origin in self.cors_origins_str.split(",") if origin.strip()]
 
+    @property
+    def llm_prices(self) -> dict[str, tuple[float, float]]:
+        """Parse the price table into model -> (input, output) USD per 1M tokens."""
+        prices = {}
+        for entry in self.llm_prices_str.split(","):
+            if "=" not in entry:
+                continue
+            model, rates = entry.split("=", 1)
+            input_rate, output_rate = rates.split(":")
+            prices[model.strip()] = (float(input_rate), float(output_rate))
+        return prices
+
 
 settings = Settings()
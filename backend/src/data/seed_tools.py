@@ -1,5 +1,9 @@
 """Seed data for AI tools database - 50+ real tools with accurate metadata."""
 
+import hashlib
+import json
+from functools import lru_cache
+
 from src.models.tool import AITool
 
 SEED_TOOLS: list[AITool] = [
@@ -2642,3 +2646,13 @@ def get_categories_with_counts() -> dict[str, int]:
     for tool in SEED_TOOLS:
         counts[tool.category] = counts.get(tool.category, 0) + 1
     return counts
+
+
+@lru_cache(maxsize=1)
+def get_catalog_version() -> str:
+    """Get a short content hash of the tool catalog.
+
+    Used to key caches so that answers are invalidated when the catalog changes.
+    """
+    payload = json.dumps([t.model_dump() for t in SEED_TOOLS], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
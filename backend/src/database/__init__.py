@@ -1,17 +1,21 @@
 """Database package."""
 
 from src.database.vectorstore import (
+    embed_query,
     ensure_indexed,
     get_retriever,
     get_vectorstore,
     index_all_tools,
     search_tools,
+    search_tools_by_vector,
 )
 
 __all__ = [
+    "embed_query",
     "ensure_indexed",
     "get_retriever",
     "get_vectorstore",
     "index_all_tools",
     "search_tools",
+    "search_tools_by_vector",
 ]
@@ -4,14 +4,15 @@ from functools import lru_cache
 
 import structlog
 from langchain_chroma import Chroma
+from langchain_community.embeddings import FakeEmbeddings
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.embeddings import FakeEmbeddings
 
 from src.cache import cached
 from src.config import settings
 from src.data.seed_tools import get_all_tools
 from src.models.tool import AITool
+from src.tracing import tracer
 
 log = structlog.get_logger()
 
@@ -155,23 +156,50 @@ def search_tools(
     k: int = 5,
 ) -> list[dict]:
     """Search for tools by semantic similarity with optional filters."""
+    # Embed and query as separate steps so each shows up in request traces
+    embedding = embed_query(query)
+    return search_tools_by_vector(embedding, category=category, pricing=pricing, k=k)
+
+
+def search_tools_by_vector(
+    embedding: list[float],
+    category: str | None = None,
+    pricing: str | None = None,
+    k: int = 5,
+) -> list[dict]:
+    """Search for tools using a precomputed query embedding."""
     vectorstore = get_vectorstore()
-    
-    # Build filter dict
-    filter_dict = {}
-    if category:
-        filter_dict["category"] = category
-    if pricing:
-        filter_dict["pricing"] = pricing
-    
-    # Perform search
-    results = vectorstore.similarity_search_with_score(
-        query,
-        k=k,
-        filter=filter_dict if filter_dict else None,
-    )
-    
-    # Format results
+    with tracer.start_as_current_span("rag.vector_query"):
+        results = vectorstore.similarity_search_by_vector_with_relevance_scores(
+            embedding,
+            k=k,
+            filter=_build_filter(category, pricing),
+        )
+    return _format_results(results)
+
+
+def _build_filter(category: str | None, pricing: str | None) -> dict | None:
+    """Chroma metadata filter; several conditions must be combined with $and."""
+    conditions = [
+        {key: value}
+        for key, value in (("category", category), ("pricing", pricing))
+        if value
+    ]
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def embed_query(query: str) -> list[float]:
+    """Embed a query with the configured embeddings model."""
+    with tracer.start_as_current_span("rag.embed"):
+        return get_embeddings().embed_query(query)
+
+
+def _format_results(results: list[tuple[Document, float]]) -> list[dict]:
+    """Format (document, distance) pairs into search result dicts."""
     formatted = []
     for doc, score in results:
         formatted.append({
@@ -194,8 +222,12 @@ def get_retriever(k: int = 5):
 
 
 # Initialize on import if needed
-def ensure_indexed():
-    """Ensure the vector store is indexed."""
+def ensure_indexed() -> int:
+    """Ensure the vector store is indexed.
+
+    Returns:
+        Number of indexed tools
+    """
     validate_embeddings()
     vectorstore = get_vectorstore()
     collection = vectorstore._collection
@@ -205,3 +237,5 @@ def ensure_indexed():
         index_all_tools()
     else:
         log.info("vectorstore_ready", count=collection.count())
+
+    return collection.count()
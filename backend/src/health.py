@@ -0,0 +1,137 @@
+"""Cached dependency state for liveness and readiness probes.
+
+Probes read a snapshot kept in memory; they never construct clients or touch
+the network. A background task refreshes provider reachability and the index
+size on an interval.
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+
+import httpx
+import structlog
+
+from src.config import settings
+
+log = structlog.get_logger()
+
+# Lightweight authenticated endpoints used to check provider reachability
+PROVIDER_PROBE_URLS = {
+    "openai": "https://api.openai.com/v1/models",
+    "groq": "https://api.groq.com/openai/v1/models",
+}
+
+
+@dataclass
+class ProviderStatus:
+    """Last known state of an LLM provider."""
+
+    configured: bool = False
+    last_success_at: float | None = None
+    last_latency_ms: float | None = None
+    last_error: str | None = None
+    last_checked_at: float | None = None
+
+
+@dataclass
+class HealthState:
+    """Process-wide dependency state reported by /readyz."""
+
+    embeddings_validated: bool = False
+    index_loaded: bool = False
+    index_count: int = 0
+    warmed_up: bool = False
+    providers: dict[str, ProviderStatus] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the process can serve queries."""
+        return (
+            self.embeddings_validated
+            and self.index_loaded
+            and self.warmed_up
+            and any(p.configured for p in self.providers.values())
+        )
+
+    def record_provider_success(self, provider: str, latency: float) -> None:
+        """Record a successful provider call and its latency in seconds."""
+        status = self.providers.setdefault(provider, ProviderStatus(configured=True))
+        now = time.time()
+        status.last_success_at = now
+        status.last_checked_at = now
+        status.last_latency_ms = round(latency * 1000, 1)
+        status.last_error = None
+
+    def record_provider_failure(self, provider: str, error: str) -> None:
+        """Record a failed provider call."""
+        status = self.providers.setdefault(provider, ProviderStatus(configured=True))
+        status.last_checked_at = time.time()
+        status.last_error = error
+
+    def snapshot(self) -> dict:
+        """Serializable view of the current state."""
+        return {
+            "ready": self.ready,
+            "embeddings_validated": self.embeddings_validated,
+            "index_loaded": self.index_loaded,
+            "index_count": self.index_count,
+            "warmed_up": self.warmed_up,
+            "providers": {name: asdict(p) for name, p in self.providers.items()},
+        }
+
+
+health_state = HealthState(
+    providers={
+        "openai": ProviderStatus(configured=bool(settings.openai_api_key)),
+        "groq": ProviderStatus(configured=bool(settings.groq_api_key)),
+    }
+)
+
+
+def _provider_keys() -> dict[str, str | None]:
+    return {
+        "openai": settings.openai_api_key,
+        "groq": settings.groq_api_key,
+    }
+
+
+async def refresh_provider_health(client: httpx.AsyncClient) -> None:
+    """Probe each configured provider and record the result."""
+    for provider, api_key in _provider_keys().items():
+        if not api_key:
+            continue
+
+        start_time = time.perf_counter()
+        try:
+            response = await client.get(
+                PROVIDER_PROBE_URLS[provider],
+                headers={"Authorization": f"Bearer {api_key}"},
+            )
+            response.raise_for_status()
+            health_state.record_provider_success(provider, time.perf_counter() - start_time)
+        except Exception as e:
+            health_state.record_provider_failure(provider, str(e))
+            log.warning("provider_health_check_failed", provider=provider, error=str(e))
+
+
+async def refresh_index_health() -> None:
+    """Refresh the indexed tool count from the vector store."""
+    from src.database.vectorstore import get_vectorstore
+
+    try:
+        count = await asyncio.to_thread(lambda: get_vectorstore()._collection.count())
+        health_state.index_count = count
+        health_state.index_loaded = count > 0
+    except Exception as e:
+        health_state.index_loaded = False
+        log.warning("index_health_check_failed", error=str(e))
+
+
+async def run_health_refresher(interval: float) -> None:
+    """Refresh dependency state every ``interval`` seconds until cancelled."""
+    async with httpx.AsyncClient(timeout=settings.health_probe_timeout_seconds) as client:
+        while True:
+            await refresh_provider_health(client)
+            await refresh_index_health()
+            await asyncio.sleep(interval)
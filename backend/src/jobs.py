@@ -0,0 +1,231 @@
+"""Asynchronous job execution for long-running agent queries.
+
+``POST /api/jobs`` enqueues a query and returns immediately; a pool of
+in-process workers drains the queue and stores results with a TTL. The queue
+and result store are pluggable: memory (default, single process) or Redis
+(shared across workers and restarts).
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Literal
+
+import structlog
+
+from src.config import settings
+
+log = structlog.get_logger()
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+@dataclass
+class Job:
+    """A query submitted for asynchronous execution."""
+
+    id: str
+    query: str
+    status: JobStatus = "queued"
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializable view of the job."""
+        return asdict(self)
+
+
+class JobBackend(ABC):
+    """Queue and result store used by the job workers."""
+
+    @abstractmethod
+    async def enqueue(self, job_id: str) -> None:
+        """Add a job id to the work queue."""
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> str | None:
+        """Pop the next job id, or return None after ``timeout`` seconds."""
+
+    @abstractmethod
+    async def save(self, job: Job, ttl: int) -> None:
+        """Store a job record for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def load(self, job_id: str) -> Job | None:
+        """Fetch a job record, or None if unknown or expired."""
+
+
+class MemoryJobBackend(JobBackend):
+    """In-process backend; jobs are lost on restart and not shared."""
+
+    def __init__(self):
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._jobs: dict[str, tuple[Job, float]] = {}
+
+    async def enqueue(self, job_id: str) -> None:
+        self._queue.put_nowait(job_id)
+
+    async def dequeue(self, timeout: float) -> str | None:
+        try:
+            async with asyncio.timeout(timeout):
+                return await self._queue.get()
+        except TimeoutError:
+            return None
+
+    async def save(self, job: Job, ttl: int) -> None:
+        now = time.time()
+        expired = [job_id for job_id, (_, expires_at) in self._jobs.items() if now > expires_at]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+        self._jobs[job.id] = (job, now + ttl)
+
+    async def load(self, job_id: str) -> Job | None:
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+
+        job, expires_at = entry
+        if time.time() > expires_at:
+            del self._jobs[job_id]
+            return None
+        return job
+
+
+class RedisJobBackend(JobBackend):
+    """Redis backend; the queue is a list and each job a string key with TTL.
+
+    Args:
+        client: ``redis.asyncio`` client (or a compatible stand-in)
+        prefix: Key prefix for queue and job records
+    """
+
+    def __init__(self, client: Any, prefix: str = "toolchain:jobs"):
+        self._client = client
+        self._queue_key = f"{prefix}:queue"
+        self._prefix = prefix
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self._prefix}:{job_id}"
+
+    async def enqueue(self, job_id: str) -> None:
+        await self._client.lpush(self._queue_key, job_id)
+
+    async def dequeue(self, timeout: float) -> str | None:
+        item = await self._client.brpop(self._queue_key, timeout=timeout)
+        if item is None:
+            return None
+
+        _, job_id = item
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+    async def save(self, job: Job, ttl: int) -> None:
+        await self._client.set(self._job_key(job.id), json.dumps(job.to_dict()), ex=ttl)
+
+    async def load(self, job_id: str) -> Job | None:
+        raw = await self._client.get(self._job_key(job_id))
+        if raw is None:
+            return None
+        return Job(**json.loads(raw))
+
+
+class JobManager:
+    """Submit jobs and run them on a pool of in-process workers.
+
+    Args:
+        backend: Queue and result store
+        runner: Coroutine function executing a query and returning a result dict
+        workers: Number of concurrent worker tasks
+        result_ttl: Seconds to keep job records after they are written
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        runner: Callable[[str], Awaitable[dict[str, Any]]],
+        workers: int = 4,
+        result_ttl: int = 3600,
+    ):
+        self._backend = backend
+        self._runner = runner
+        self._workers = workers
+        self._result_ttl = result_ttl
+        self._tasks: list[asyncio.Task] = []
+
+    async def submit(self, query: str) -> Job:
+        """Enqueue a query and return its job record."""
+        job = Job(id=uuid.uuid4().hex, query=query)
+        await self._backend.save(job, self._result_ttl)
+        await self._backend.enqueue(job.id)
+        log.info("job_submitted", job_id=job.id)
+        return job
+
+    async def get(self, job_id: str) -> Job | None:
+        """Look up a job by id."""
+        return await self._backend.load(job_id)
+
+    def start(self) -> None:
+        """Start the worker pool."""
+        self._tasks = [
+            asyncio.create_task(self._work(worker_id)) for worker_id in range(self._workers)
+        ]
+        log.info("job_workers_started", workers=self._workers)
+
+    async def stop(self) -> None:
+        """Cancel the worker pool and wait for it to exit."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, worker_id: int) -> None:
+        while True:
+            try:
+                job_id = await self._backend.dequeue(timeout=1.0)
+                if job_id is not None:
+                    await self.run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Backend hiccup (e.g. Redis unavailable); back off and retry
+                log.error("job_worker_error", worker=worker_id, error=str(e))
+                await asyncio.sleep(1.0)
+
+    async def run_job(self, job_id: str) -> None:
+        """Execute one queued job and store its outcome."""
+        job = await self._backend.load(job_id)
+        if job is None:
+            log.warning("job_expired_before_run", job_id=job_id)
+            return
+
+        job.status = "running"
+        job.updated_at = time.time()
+        await self._backend.save(job, self._result_ttl)
+
+        try:
+            job.result = await self._runner(job.query)
+            job.status = "succeeded"
+        except Exception as e:
+            log.error("job_failed", job_id=job_id, error=str(e))
+            job.error = str(e)
+            job.status = "failed"
+
+        job.updated_at = time.time()
+        await self._backend.save(job, self._result_ttl)
+        log.info("job_complete", job_id=job_id, status=job.status)
+
+
+def create_job_backend() -> JobBackend:
+    """Build the job backend selected by ``JOB_BACKEND``."""
+    if settings.job_backend == "redis":
+        from redis.asyncio import Redis
+
+        return RedisJobBackend(Redis.from_url(settings.redis_url))
+
+    return MemoryJobBackend()
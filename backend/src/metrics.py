@@ -1,12 +1,11 @@
 """Prometheus metrics for ToolChain observability."""
 
-from prometheus_client import Counter, Histogram, Gauge, Info, REGISTRY, generate_latest
-from prometheus_client.core import CollectorRegistry
 import time
+from collections.abc import Callable
 from functools import wraps
-from typing import Callable
 
 import structlog
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, Info, generate_latest
 
 log = structlog.get_logger()
 
@@ -36,6 +35,19 @@ query_duration = Histogram(
     buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
 )
 
+stream_first_token = Histogram(
+    'toolchain_stream_first_token_seconds',
+    'Time from stream start to the first streamed answer token',
+    ['mode'],
+    buckets=[0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0]
+)
+
+stream_cancellations = Counter(
+    'toolchain_stream_cancellations_total',
+    'Streaming workflows cancelled before completion',
+    ['reason']
+)
+
 # Active queries gauge
 active_queries = Gauge(
     'toolchain_active_queries',
@@ -55,6 +67,180 @@ cache_misses = Counter(
     ['cache_type']
 )
 
+# Request coalescing metrics
+coalesced_requests = Counter(
+    'toolchain_coalesced_requests_total',
+    'Requests served by joining an identical in-flight workflow',
+    ['mode']
+)
+
+inflight_flights = Gauge(
+    'toolchain_inflight_flights',
+    'Number of distinct workflows currently executing behind the coalescer',
+    ['mode']
+)
+
+# Admission control metrics
+admission_inflight = Gauge(
+    'toolchain_admission_inflight',
+    'Workflows currently holding an admission slot'
+)
+
+admission_queue_depth = Gauge(
+    'toolchain_admission_queue_depth',
+    'Requests waiting for an admission slot'
+)
+
+admission_wait_seconds = Histogram(
+    'toolchain_admission_wait_seconds',
+    'Time spent waiting for an admission slot',
+    ['endpoint'],
+    buckets=[0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+admission_rejected = Counter(
+    'toolchain_admission_rejected_total',
+    'Requests rejected by admission control',
+    ['endpoint', 'reason']
+)
+
+# Startup warmup metrics
+warmup_step_seconds = Gauge(
+    'toolchain_warmup_step_seconds',
+    'Duration of each startup warmup step',
+    ['step', 'status']
+)
+
+# LLM client pool metrics
+llm_pool_connections = Gauge(
+    'toolchain_llm_pool_connections',
+    'Pooled HTTP connections to LLM providers',
+    ['provider', 'state']
+)
+
+llm_registry_lookups = Counter(
+    'toolchain_llm_registry_lookups_total',
+    'LLM client registry lookups',
+    ['provider', 'result']
+)
+
+# Provider failover metrics
+llm_circuit_state = Gauge(
+    'toolchain_llm_circuit_state',
+    'Circuit breaker state per provider (0=closed, 1=half_open, 2=open)',
+    ['provider']
+)
+
+llm_calls = Counter(
+    'toolchain_llm_calls_total',
+    'LLM provider calls by outcome (success, slow, error, rejected)',
+    ['provider', 'outcome']
+)
+
+llm_hedges = Counter(
+    'toolchain_llm_hedges_total',
+    'Hedged LLM requests (issued, won, budget_exhausted)',
+    ['outcome']
+)
+
+# LLM usage metrics
+llm_tokens = Counter(
+    'toolchain_llm_tokens_total',
+    'LLM tokens consumed',
+    ['agent', 'provider', 'model', 'kind']
+)
+
+llm_cost_dollars = Counter(
+    'toolchain_llm_cost_dollars_total',
+    'Estimated LLM spend in USD from the configured price table',
+    ['agent', 'provider', 'model']
+)
+
+llm_time_to_first_token = Histogram(
+    'toolchain_llm_time_to_first_token_seconds',
+    'Provider time to first streamed token',
+    ['agent', 'provider', 'model'],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0]
+)
+
+llm_latency = Histogram(
+    'toolchain_llm_latency_seconds',
+    'Total provider call latency',
+    ['agent', 'provider', 'model'],
+    buckets=[0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0]
+)
+
+# Provider pacing and retry metrics
+llm_throttle_wait_seconds = Histogram(
+    'toolchain_llm_throttle_wait_seconds',
+    'Time calls were delayed by client-side provider pacing',
+    ['provider'],
+    buckets=[0.0, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+llm_retries = Counter(
+    'toolchain_llm_retries_total',
+    'LLM call retries (retried, budget_exhausted)',
+    ['provider', 'outcome']
+)
+
+# Supervisor routing metrics
+routing_decisions = Counter(
+    'toolchain_routing_decisions_total',
+    'Routing decisions by path (rule, llm, llm_error, plan, deadline)',
+    ['path', 'next_agent']
+)
+
+# Parallel workflow branch metrics
+workflow_branch_duration = Histogram(
+    'toolchain_workflow_branch_duration_seconds',
+    'Source branch duration in the parallel workflow by outcome (ok, timeout)',
+    ['branch', 'outcome'],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+# Request deadline metrics
+deadline_events = Counter(
+    'toolchain_deadline_events_total',
+    'Workflow nodes affected by the request deadline (miss, skipped, degraded)',
+    ['node', 'outcome']
+)
+
+# Web search metrics
+tavily_latency = Histogram(
+    'toolchain_tavily_latency_seconds',
+    'Tavily search latency by mode (inline, refresh) and outcome (ok, error)',
+    ['mode', 'outcome'],
+    buckets=[0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0]
+)
+
+# Model tiering metrics
+model_tier_selections = Counter(
+    'toolchain_model_tier_selections_total',
+    'Model tier chosen per call',
+    ['agent', 'tier']
+)
+
+model_tier_latency = Histogram(
+    'toolchain_model_tier_latency_seconds',
+    'Agent LLM call latency by model tier',
+    ['agent', 'tier'],
+    buckets=[0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0]
+)
+
+model_tier_outcomes = Counter(
+    'toolchain_model_tier_outcomes_total',
+    'Agent LLM call outcomes by model tier (ok, error)',
+    ['agent', 'tier', 'outcome']
+)
+
+# Prompt context packing metrics
+context_tokens = Counter(
+    'toolchain_context_tokens_total',
+    'Prompt context tokens packed into or dropped from LLM calls',
+    ['agent', 'outcome']
+)
+
 # Rate limit metrics
 rate_limit_exceeded = Counter(
     'toolchain_rate_limit_exceeded_total',
@@ -126,3 +312,70 @@ def record_cache_miss(cache_type: str = "default"):
 def record_rate_limit(endpoint: str):
     """Record a rate limit exceeded event."""
     rate_limit_exceeded.labels(endpoint=endpoint).inc()
+
+
+def record_coalesced_request(mode: str):
+    """Record a request that joined an in-flight workflow."""
+    coalesced_requests.labels(mode=mode).inc()
+
+
+def record_stream_cancellation(reason: str):
+    """Record a streaming workflow cancelled before completion."""
+    stream_cancellations.labels(reason=reason).inc()
+
+
+def record_admission_rejected(endpoint: str, reason: str):
+    """Record a request rejected by admission control."""
+    admission_rejected.labels(endpoint=endpoint, reason=reason).inc()
+
+
+def record_llm_registry_lookup(provider: str, result: str):
+    """Record an LLM registry lookup ('hit' or 'miss')."""
+    llm_registry_lookups.labels(provider=provider, result=result).inc()
+
+
+def record_llm_call(provider: str, outcome: str):
+    """Record an LLM provider call outcome."""
+    llm_calls.labels(provider=provider, outcome=outcome).inc()
+
+
+def record_hedge(outcome: str):
+    """Record a hedging decision or result."""
+    llm_hedges.labels(outcome=outcome).inc()
+
+
+def record_context_tokens(agent: str, packed: int, dropped: int):
+    """Record packed and dropped prompt context tokens for an agent."""
+    context_tokens.labels(agent=agent, outcome="packed").inc(packed)
+    context_tokens.labels(agent=agent, outcome="dropped").inc(dropped)
+
+
+def record_llm_retry(provider: str, outcome: str):
+    """Record an LLM retry decision."""
+    llm_retries.labels(provider=provider, outcome=outcome).inc()
+
+
+def record_model_tier_call(agent: str, tier: str, duration: float, outcome: str):
+    """Record latency and outcome of an agent LLM call for its tier."""
+    model_tier_latency.labels(agent=agent, tier=tier).observe(duration)
+    model_tier_outcomes.labels(agent=agent, tier=tier, outcome=outcome).inc()
+
+
+def record_routing_decision(path: str, next_agent: str):
+    """Record how the supervisor chose the next agent."""
+    routing_decisions.labels(path=path, next_agent=next_agent).inc()
+
+
+def record_deadline_event(node: str, outcome: str):
+    """Record a node that ran out of time, was skipped or took a cheaper path."""
+    deadline_events.labels(node=node, outcome=outcome).inc()
+
+
+def record_branch_outcome(branch: str, outcome: str, duration: float):
+    """Record how long a parallel source branch ran and how it ended."""
+    workflow_branch_duration.labels(branch=branch, outcome=outcome).observe(duration)
+
+
+def record_tavily_call(mode: str, outcome: str, duration: float):
+    """Record a Tavily search made for a request (inline) or in the background (refresh)."""
+    tavily_latency.labels(mode=mode, outcome=outcome).observe(duration)
@@ -2,16 +2,20 @@
 
 from src.models.tool import (
     AITool,
+    BatchQueryRequest,
     ChatQuery,
     CompareRequest,
+    JobRequest,
     SubscribeRequest,
     ToolQuery,
 )
 
 __all__ = [
     "AITool",
+    "BatchQueryRequest",
     "ChatQuery",
     "CompareRequest",
+    "JobRequest",
     "SubscribeRequest",
     "ToolQuery",
 ]
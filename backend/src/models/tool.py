@@ -1,6 +1,6 @@
 """AITool data model and schema definitions."""
 
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
@@ -62,6 +62,20 @@ class ChatQuery(BaseModel):
     )
 
 
+class BatchQueryRequest(BaseModel):
+    """Many queries to run through the agent workflow at once."""
+
+    queries: list[Annotated[str, Field(min_length=1, max_length=1000)]] = Field(
+        ..., min_length=1, max_length=500
+    )
+
+
+class JobRequest(BaseModel):
+    """Query to run as an asynchronous job."""
+
+    query: str = Field(..., min_length=1, max_length=1000)
+
+
 class CompareRequest(BaseModel):
     """Request to compare multiple tools."""
 
@@ -0,0 +1,160 @@
+"""Single-pass query analysis shared by every workflow node.
+
+A query is scanned once by a compiled multi-pattern matcher covering intent
+keywords, output-format wishes, pricing and licensing constraints, category
+phrases and catalog tool names. The resulting ``QueryAnalysis`` is stored in
+``AgentState`` so routing, retrieval and answer formatting all read the same
+result instead of re-scanning the query with their own keyword lists.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+from src.data.seed_tools import get_all_tools, get_catalog_version
+
+QueryType = Literal["definition", "comparison", "recommendation"]
+
+# Keyword phrases -> label. Matching is case-insensitive on whole words;
+# category labels use the catalog's category values.
+_PHRASES: dict[str, str] = {
+    # Educational questions -> conversational prose
+    **dict.fromkeys(
+        ["what is", "what are", "explain", "how does", "how do", "why do", "why are",
+         "define", "meaning of"],
+        "type:definition",
+    ),
+    # Comparisons -> structured answer with a table
+    **dict.fromkeys(
+        ["compare", "comparison", "vs", "vs.", "versus", "difference", "differences",
+         "difference between"],
+        "type:comparison",
+    ),
+    **dict.fromkeys(["tl;dr", "tldr", "summary", "summarize"], "format:tldr"),
+    **dict.fromkeys(["table", "tabular"], "format:table"),
+    # Questions about recent events need web search. A bare "new" is left
+    # out: "my new project" is not asking for news
+    **dict.fromkeys(
+        ["latest", "recent", "recently", "news", "what's new", "whats new", "today",
+         "this week", "this month", "announced", "released", "just launched"],
+        "recent",
+    ),
+    **dict.fromkeys(["free", "no cost"], "free"),
+    **dict.fromkeys(["open source", "open-source", "opensource", "oss"], "open_source"),
+    **dict.fromkeys(
+        ["vector database", "vector databases", "vector db", "vector dbs", "vector store",
+         "vector stores"],
+        "category:vector_db",
+    ),
+    **dict.fromkeys(["mcp", "mcp server", "mcp servers"], "category:mcp"),
+    **dict.fromkeys(["sdk", "sdks"], "category:sdk"),
+    **dict.fromkeys(["cli", "clis", "command line", "command-line"], "category:cli"),
+    **dict.fromkeys(["api", "apis"], "category:api"),
+    **dict.fromkeys(
+        ["agent framework", "agent frameworks", "agents framework", "multi-agent"],
+        "category:agent_framework",
+    ),
+}
+
+# Tool names that are also everyday words; too ambiguous to count as mentions
+_AMBIGUOUS_TOOL_NAMES = {"continue", "cursor", "instructor", "outlines", "prisma"}
+
+# Suffixes dropped to also match the bare product name ("Tavily API" -> "tavily")
+_NAME_SUFFIXES = (" api", " sdk", " mcp", " cli")
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """What a query asks for, computed once per request."""
+
+    query_type: QueryType = "recommendation"
+    wants_tldr: bool = False
+    # Asked for explicitly, or implied by a comparison
+    wants_table: bool = False
+    wants_recent: bool = False
+    wants_free: bool = False
+    wants_open_source: bool = False
+    tool_ids: tuple[str, ...] = ()
+    categories: tuple[str, ...] = ()
+
+
+def _tool_phrases() -> dict[str, str]:
+    """Lowercased tool names (and unique bare names) -> 'tool:<id>' labels."""
+    tools = get_all_tools()
+    names = {tool.name.lower(): tool.id for tool in tools}
+    phrases = {name: f"tool:{tool_id}" for name, tool_id in names.items()}
+
+    for name, tool_id in names.items():
+        for suffix in _NAME_SUFFIXES:
+            if not name.endswith(suffix):
+                continue
+            stem = name[: -len(suffix)]
+            # "openai" or "supabase" alone could mean several tools
+            owners = [other for other in names if other == stem or other.startswith(stem + " ")]
+            if owners == [name]:
+                phrases[stem] = f"tool:{tool_id}"
+
+    for name in _AMBIGUOUS_TOOL_NAMES:
+        phrases.pop(name, None)
+    return phrases
+
+
+@lru_cache(maxsize=1)
+def _matcher(catalog_version: str) -> tuple[re.Pattern, dict[str, str]]:
+    """Compile one alternation over every phrase, rebuilt when the catalog changes."""
+    labels = {**_tool_phrases(), **_PHRASES}
+    # Longest first so "difference between" wins over "difference"
+    alternatives = sorted(labels, key=len, reverse=True)
+    pattern = re.compile(
+        r"(?<![\w])(?:" + "|".join(re.escape(phrase) for phrase in alternatives) + r")(?![\w])"
+    )
+    return pattern, labels
+
+
+def analyze_query(query: str) -> QueryAnalysis:
+    """Scan a query once and collect its intent signals.
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        The query's analysis
+    """
+    pattern, labels = _matcher(get_catalog_version())
+    found: set[str] = set()
+    tool_ids: list[str] = []
+    categories: list[str] = []
+
+    for match in pattern.finditer(query.lower()):
+        label = labels[match.group(0)]
+        kind, _, value = label.partition(":")
+        if kind == "tool" and value not in tool_ids:
+            tool_ids.append(value)
+        elif kind == "category" and value not in categories:
+            categories.append(value)
+        found.add(label)
+
+    # Definitions take precedence ("what is the difference..." is educational)
+    if "type:definition" in found:
+        query_type: QueryType = "definition"
+    elif "type:comparison" in found:
+        query_type = "comparison"
+    else:
+        query_type = "recommendation"
+
+    return QueryAnalysis(
+        query_type=query_type,
+        wants_tldr="format:tldr" in found,
+        wants_table="format:table" in found or query_type == "comparison",
+        wants_recent="recent" in found,
+        wants_free="free" in found,
+        wants_open_source="open_source" in found,
+        tool_ids=tuple(tool_ids),
+        categories=tuple(categories),
+    )
+
+
+def query_analysis(state: dict) -> QueryAnalysis:
+    """The analysis stored in workflow state, computed on demand if missing."""
+    return state.get("query_analysis") or analyze_query(state["query"])
@@ -0,0 +1,112 @@
+"""Per-connection chat sessions for the WebSocket endpoint.
+
+A session carries conversation history, the tools retrieved on the previous
+turn and recently computed query embeddings, so follow-up turns only send the
+new message. Sessions live in a bounded LRU and are evicted when idle.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import structlog
+
+from src.config import settings
+from src.utils import normalize_query
+
+log = structlog.get_logger()
+
+
+@dataclass
+class ChatSession:
+    """State carried between turns of one chat conversation."""
+
+    id: str
+    history: list[dict] = field(default_factory=list)
+    last_tool_ids: list[str] = field(default_factory=list)
+    embeddings: OrderedDict[str, list[float]] = field(default_factory=OrderedDict)
+    last_active: float = field(default_factory=time.monotonic)
+
+    def cached_embedding(self, query: str) -> list[float] | None:
+        """Return a previously computed embedding for this query, if any."""
+        key = normalize_query(query)
+        embedding = self.embeddings.get(key)
+        if embedding is not None:
+            self.embeddings.move_to_end(key)
+        return embedding
+
+    def remember_embedding(self, query: str, embedding: list[float]) -> None:
+        """Cache a query embedding, evicting the oldest beyond the limit."""
+        self.embeddings[normalize_query(query)] = embedding
+        while len(self.embeddings) > settings.ws_session_embedding_cache:
+            self.embeddings.popitem(last=False)
+
+    def record_turn(self, message: str, response: str, tool_ids: list[str]) -> None:
+        """Append a completed turn, keeping only the most recent history."""
+        now = int(time.time() * 1000)
+        self.history.append({"role": "user", "content": message, "timestamp": now})
+        if response:
+            self.history.append({"role": "assistant", "content": response, "timestamp": now})
+        self.history = self.history[-settings.ws_session_history_messages:]
+        self.last_tool_ids = tool_ids
+
+
+class SessionStore:
+    """LRU of chat sessions with idle eviction.
+
+    Args:
+        max_sessions: Maximum sessions kept in memory
+        idle_ttl: Seconds of inactivity after which a session is dropped
+    """
+
+    def __init__(self, max_sessions: int, idle_ttl: float):
+        self._sessions: OrderedDict[str, ChatSession] = OrderedDict()
+        self._max_sessions = max_sessions
+        self._idle_ttl = idle_ttl
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_or_create(self, session_id: str | None = None) -> ChatSession:
+        """Resume a live session or start a new one."""
+        self.evict_idle()
+
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            session = ChatSession(id=session_id or uuid.uuid4().hex)
+            self._sessions[session.id] = session
+            while len(self._sessions) > self._max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                log.info("session_evicted", session_id=evicted, reason="capacity")
+
+        self.touch(session)
+        return session
+
+    def touch(self, session: ChatSession) -> None:
+        """Mark a session as recently used."""
+        session.last_active = time.monotonic()
+        if session.id in self._sessions:
+            self._sessions.move_to_end(session.id)
+
+    def evict_idle(self) -> int:
+        """Drop sessions idle longer than the TTL. Returns count removed."""
+        cutoff = time.monotonic() - self._idle_ttl
+        removed = 0
+        # Sessions are ordered by recency, so stop at the first live one
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_active > cutoff:
+                break
+            del self._sessions[session_id]
+            removed += 1
+
+        if removed:
+            log.info("session_evicted", count=removed, reason="idle")
+        return removed
+
+
+session_store = SessionStore(
+    max_sessions=settings.ws_max_sessions,
+    idle_ttl=settings.ws_session_idle_seconds,
+)
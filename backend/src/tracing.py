@@ -0,0 +1,194 @@
+"""Per-request latency tracing with an in-process trace store.
+
+Spans for each workflow node and its sub-steps (embedding, vector query, web
+search, LLM calls) are recorded with OpenTelemetry and exported to a bounded
+ring buffer in memory. A request's waterfall is served at
+``/debug/traces/{request_id}`` and summarized in its ``Server-Timing`` header,
+so slow requests can be diagnosed without an external collector.
+
+The tracer provider is private to this module rather than installed as the
+global provider, so spans from libraries that use OpenTelemetry themselves
+(e.g. Chroma) do not end up in the buffer.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import structlog
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from src.config import settings
+
+log = structlog.get_logger()
+
+# Root span attribute linking a trace to the request that produced it
+REQUEST_ID_ATTRIBUTE = "request.id"
+# Caller-supplied correlation id, recorded but never used for lookup
+CLIENT_REQUEST_ID_ATTRIBUTE = "request.client_id"
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class TraceStore(SpanExporter):
+    """Ring buffer of recent traces, keyed by trace id and request id.
+
+    Args:
+        max_traces: Number of traces kept; the oldest is evicted first
+    """
+
+    def __init__(self, max_traces: int):
+        self._max_traces = max_traces
+        self._traces: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+        self._request_ids: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        with self._lock:
+            for span in spans:
+                trace_id = span.context.trace_id
+                self._traces.setdefault(trace_id, []).append(span)
+                self._traces.move_to_end(trace_id)
+
+                request_id = (span.attributes or {}).get(REQUEST_ID_ATTRIBUTE)
+                if request_id:
+                    self._request_ids[request_id] = trace_id
+
+            while len(self._traces) > self._max_traces:
+                evicted, evicted_spans = self._traces.popitem(last=False)
+                for span in evicted_spans:
+                    request_id = (span.attributes or {}).get(REQUEST_ID_ATTRIBUTE)
+                    if request_id and self._request_ids.get(request_id) == evicted:
+                        del self._request_ids[request_id]
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every stored trace."""
+        with self._lock:
+            self._traces.clear()
+            self._request_ids.clear()
+
+    def spans(self, trace_id: int) -> list[ReadableSpan]:
+        """Finished spans of a trace, in start order."""
+        with self._lock:
+            spans = list(self._traces.get(trace_id, []))
+        return sorted(spans, key=lambda span: span.start_time or 0)
+
+    def find(self, request_id: str) -> list[ReadableSpan] | None:
+        """Finished spans of the request's trace, or None if unknown or evicted."""
+        with self._lock:
+            trace_id = self._request_ids.get(request_id)
+        if trace_id is None:
+            return None
+        return self.spans(trace_id)
+
+
+trace_store = TraceStore(max_traces=settings.trace_buffer_size)
+
+_provider = TracerProvider(resource=Resource.create({"service.name": "toolchain-backend"}))
+_provider.add_span_processor(SimpleSpanProcessor(trace_store))
+
+tracer = _provider.get_tracer("toolchain")
+
+
+def trace_tree(spans: list[ReadableSpan]) -> list[dict]:
+    """Serialize spans as a flat waterfall relative to the earliest start."""
+    if not spans:
+        return []
+
+    origin = min(span.start_time or 0 for span in spans)
+    return [
+        {
+            "name": span.name,
+            "span_id": format(span.context.span_id, "016x"),
+            "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+            "start_ms": round(((span.start_time or 0) - origin) / 1e6, 2),
+            "duration_ms": round(((span.end_time or 0) - (span.start_time or 0)) / 1e6, 2),
+            "status": span.status.status_code.name.lower(),
+            "attributes": dict(span.attributes or {}),
+        }
+        for span in spans
+    ]
+
+
+def server_timing(spans: list[ReadableSpan], total_seconds: float) -> str:
+    """Summarize finished spans as a ``Server-Timing`` header value.
+
+    Spans with the same name (e.g. repeated supervisor visits) are summed.
+    """
+    durations: dict[str, float] = {}
+    for span in spans:
+        if span.parent is None or span.end_time is None or span.start_time is None:
+            continue
+        duration_ms = (span.end_time - span.start_time) / 1e6
+        durations[span.name] = durations.get(span.name, 0.0) + duration_ms
+
+    entries = [f"{name};dur={duration:.1f}" for name, duration in durations.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per HTTP request.
+
+    Each request gets a freshly generated id, returned in ``X-Request-ID``
+    and recorded on the root span. An incoming ``X-Request-ID`` is only kept
+    as a correlation attribute: ids used for trace lookup are never chosen by
+    the client, so one caller cannot overwrite or guess another's trace. ``Server-Timing`` lists the
+    spans finished by the time headers are sent: the full waterfall for
+    regular responses, only what ran before the first byte for streams.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.tracing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        client_request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode(
+            errors="ignore"
+        )[:64]
+        request_id = uuid.uuid4().hex
+        start_time = time.perf_counter()
+
+        attributes = {
+            REQUEST_ID_ATTRIBUTE: request_id,
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        }
+        if client_request_id:
+            attributes[CLIENT_REQUEST_ID_ATTRIBUTE] = client_request_id
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}", attributes=attributes
+        ) as root:
+            trace_id = root.get_span_context().trace_id
+
+            async def send_with_headers(message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    timing = server_timing(
+                        trace_store.spans(trace_id), time.perf_counter() - start_time
+                    )
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (REQUEST_ID_HEADER.encode(), request_id.encode()),
+                        (b"server-timing", timing.encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
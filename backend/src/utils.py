@@ -47,6 +47,23 @@ def truncate(text: str, max_length: int = 100, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)].rsplit(' ', 1)[0] + suffix
 
 
+def normalize_query(query: str) -> str:
+    """Normalize a user query for use as a dedupe or cache key.
+    
+    Args:
+        query: Raw user query string
+        
+    Returns:
+        Lowercased query with collapsed whitespace and no trailing punctuation
+        
+    Example:
+        >>> normalize_query("  Best  Vector DB? ")
+        'best vector db'
+    """
+    text = re.sub(r'\s+', ' ', query.lower()).strip()
+    return text.rstrip('?!. ')
+
+
 def safe_get(data: dict[str, Any], key: str, default: Any = None) -> Any:
     """Safely get nested dictionary value.
     
@@ -92,28 +109,6 @@ Pricing: {pricing}
 """.strip()
 
 
-def parse_query_intent(query: str) -> dict[str, Any]:
-    """Parse user query to extract intent signals.
-    
-    Args:
-        query: Raw user query string
-        
-    Returns:
-        Dict with detected intents
-    """
-    query_lower = query.lower()
-    
-    intent = {
-        'is_comparison': any(w in query_lower for w in ['vs', 'versus', 'compare', 'difference']),
-        'is_recommendation': any(w in query_lower for w in ['best', 'recommend', 'should i use', 'which']),
-        'is_definition': any(w in query_lower for w in ['what is', 'what are', 'explain', 'how does']),
-        'wants_free': 'free' in query_lower,
-        'wants_open_source': 'open source' in query_lower or 'opensource' in query_lower,
-    }
-    
-    return intent
-
-
 def validate_tool_data(tool: dict[str, Any]) -> list[str]:
     """Validate tool data structure.
     
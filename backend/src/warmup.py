@@ -0,0 +1,147 @@
+"""Startup warmup for clients, chains, embeddings and hot caches.
+
+Everything the request path builds lazily (the compiled workflow graph, LLM
+prompt chains and clients, the Chroma connection, the Tavily client, the
+first embedding call) is constructed here before the process reports ready,
+so the first request after a deploy does not pay for it. Optionally, the most frequent queries are replayed to fill
+the response cache.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import structlog
+
+from src.config import settings
+from src.metrics import warmup_step_seconds
+
+log = structlog.get_logger()
+
+
+def load_warmup_queries(path: str | None = None) -> list[str]:
+    """Read warmup queries, most popular first, skipping comments and blanks."""
+    file = Path(path or settings.warmup_queries_path)
+    if not file.exists():
+        log.warning("warmup_queries_missing", path=str(file))
+        return []
+
+    lines = (line.strip() for line in file.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _warm_vectorstore() -> None:
+    from src.database.vectorstore import embed_query, get_vectorstore
+
+    get_vectorstore()
+    # The first embedding call opens the provider connection
+    embed_query("warmup")
+
+
+def _warm_workflow() -> None:
+    from src.agents.workflow import get_workflow
+
+    get_workflow()
+
+
+def _warm_llms() -> None:
+    from src.agents.explain_agent import (
+        CONVERSATIONAL_PROMPT,
+        EXPLAIN_PROMPT,
+        StructuredAnswer,
+    )
+    from src.agents.llm import get_chain
+    from src.agents.model_tiers import parse_tier_ladder
+    from src.agents.supervisor import SUPERVISOR_PROMPT, RouterDecision
+
+    # Same argument sets the agents use, so they hit the chain registry
+    get_chain(
+        "supervisor",
+        SUPERVISOR_PROMPT,
+        model=None,
+        temperature=0,
+        structured_output=RouterDecision,
+        tier=settings.supervisor_model_tier,
+    )
+    for tier in parse_tier_ladder(settings.model_tiers_str):
+        get_chain(
+            "explain_structured",
+            EXPLAIN_PROMPT,
+            model=None,
+            temperature=0.7,
+            structured_output=StructuredAnswer,
+            tier=tier,
+        )
+        get_chain(
+            "explain_conversational", CONVERSATIONAL_PROMPT, model=None, temperature=0.7, tier=tier
+        )
+
+
+def _warm_tokenizer() -> None:
+    from src.agents.context_packer import load_encoding
+
+    # Loads (and on first run downloads) the tiktoken encoding
+    load_encoding()
+
+
+def _warm_search() -> None:
+    from src.agents.search_agent import get_tavily_client
+
+    if settings.tavily_api_key:
+        get_tavily_client()
+
+
+async def _replay_queries(queries: list[str]) -> None:
+    from src.agents.workflow import run_query
+
+    results = await asyncio.gather(
+        *(run_query(query) for query in queries), return_exceptions=True
+    )
+    failures = sum(isinstance(result, Exception) for result in results)
+    log.info("warmup_replay_complete", queries=len(queries), failures=failures)
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    start_time = time.perf_counter()
+    try:
+        await step()
+        status = "ok"
+    except Exception as e:
+        # A failed step only means that piece stays lazy
+        log.warning("warmup_step_failed", step=name, error=str(e))
+        status = "error"
+
+    duration = time.perf_counter() - start_time
+    warmup_step_seconds.labels(step=name, status=status).set(duration)
+    log.info("warmup_step", step=name, status=status, duration_ms=round(duration * 1000, 1))
+
+
+async def run_warmup() -> None:
+    """Build shared clients and fill hot caches.
+
+    Steps are best-effort: failures are logged and the process still becomes
+    ready, since every warmed object is also built on demand.
+    """
+    steps: list[tuple[str, Callable[[], Awaitable[None]]]] = [
+        ("workflow", lambda: asyncio.to_thread(_warm_workflow)),
+        ("vectorstore", lambda: asyncio.to_thread(_warm_vectorstore)),
+        ("llm_clients", lambda: asyncio.to_thread(_warm_llms)),
+        ("tokenizer", lambda: asyncio.to_thread(_warm_tokenizer)),
+        ("search_client", lambda: asyncio.to_thread(_warm_search)),
+    ]
+
+    if settings.warmup_replay_top_n > 0:
+        queries = load_warmup_queries()[: settings.warmup_replay_top_n]
+        if queries:
+            steps.append(("replay_queries", lambda: _replay_queries(queries)))
+
+    start_time = time.perf_counter()
+    try:
+        async with asyncio.timeout(settings.warmup_timeout_seconds):
+            for name, step in steps:
+                await _run_step(name, step)
+    except TimeoutError:
+        log.warning("warmup_timeout", timeout=settings.warmup_timeout_seconds)
+
+    log.info("warmup_complete", duration_ms=round((time.perf_counter() - start_time) * 1000, 1))
@@ -1,15 +1,39 @@
 """Pytest configuration and shared fixtures for ToolChain tests."""
 
+import asyncio
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
 
 os.environ.setdefault("ALLOW_FAKE_EMBEDDINGS", "true")
+# Keep the LLM response cache in memory so tests never share a disk file
+os.environ.setdefault("LLM_CACHE_PATH", "")
 
-from src.api.main import app
+from src.agents.llm_cache import get_llm_cache
+from src.agents.search_agent import get_tavily_client
+from src.agents.search_cache import search_cache
 from src.agents.state import AgentState
+from src.api.main import app
+from src.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached search results, responses and clients from leaking between tests."""
+    cache.clear()
+    search_cache.clear()
+    get_tavily_client.cache_clear()
+    get_llm_cache.cache_clear()
+    yield
+    cache.clear()
+    search_cache.clear()
+    get_tavily_client.cache_clear()
+    get_llm_cache.cache_clear()
 
 
 @pytest.fixture
@@ -24,7 +48,7 @@ def client():
 @pytest.fixture
 def async_client():
     """Async test client for async endpoints."""
-    from httpx import AsyncClient, ASGITransport
+    from httpx import ASGITransport, AsyncClient
     
     async def _get_client():
         async with AsyncClient(
@@ -48,6 +72,57 @@ def mock_llm():
     return mock
 
 
+class FakeProvider(BaseChatModel):
+    """Local stand-in for an LLM provider with scriptable failures and latency."""
+
+    provider: str = "fake"
+    reply: str = "This is a fake provider response."
+    error: Exception | None = None
+    fail_times: int | None = None  # Raise ``error`` only on the first N calls
+    delay: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-provider"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        if self.error is not None and (self.fail_times is None or self.calls <= self.fail_times):
+            raise self.error
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._generate(messages, stop=stop, **kwargs)
+
+
+@pytest.fixture
+def fake_providers():
+    """Route get_llm to fake OpenAI and Groq providers with fresh breakers.
+
+    Yields a dict of provider name to FakeProvider; set ``error`` or ``delay``
+    on an entry to simulate an outage or a slow provider.
+    """
+    from src.agents.llm import LLMRegistry, create_circuit_breakers
+    from src.agents.throttle import RetryBudget, create_limiters
+
+    providers = {
+        name: FakeProvider(provider=name, reply=f"answer from {name}")
+        for name in ("openai", "groq")
+    }
+
+    with patch("src.agents.llm.llm_registry", LLMRegistry()), \
+         patch("src.agents.llm.circuit_breakers", create_circuit_breakers()), \
+         patch("src.agents.llm.provider_limiters", create_limiters()), \
+         patch("src.agents.throttle.retry_budget", RetryBudget(0.1)), \
+         patch("src.agents.throttle.settings.llm_retry_backoff_seconds", 0), \
+         patch("src.agents.llm._build", lambda provider, *args: providers[provider]), \
+         patch("src.agents.llm.settings.openai_api_key", "sk-test"), \
+         patch("src.agents.llm.settings.groq_api_key", "gsk-test"):
+        yield providers
+
+
 @pytest.fixture
 def mock_vectorstore():
     """Mock vectorstore for RAG testing."""
@@ -73,6 +148,7 @@ def sample_agent_state() -> AgentState:
         "messages": [],
         "next_agent": None,
         "retrieved_context": "",
+        "retrieved_tool_ids": [],
         "search_results": "",
         "final_response": "",
         "iteration": 0,
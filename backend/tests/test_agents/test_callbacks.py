@@ -0,0 +1,72 @@
+"""Tests for the LLM usage callback handler."""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from prometheus_client import REGISTRY
+
+from src.agents.callbacks import UsageCallbackHandler, estimate_cost
+
+LABELS = {"agent": "explain", "provider": "openai", "model": "gpt-4o-mini"}
+CONFIG = {"metadata": {"langgraph_node": "explain"}}
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, {**LABELS, **labels}) or 0.0
+
+
+def fake_model(message: AIMessage) -> GenericFakeChatModel:
+    return GenericFakeChatModel(
+        messages=iter([message]),
+        callbacks=[UsageCallbackHandler("openai", "gpt-4o-mini")],
+    )
+
+
+class TestEstimateCost:
+    """Test cost estimation from the price table."""
+
+    def test_uses_per_million_rates(self):
+        """Cost should apply input and output rates per 1M tokens."""
+        with patch("src.agents.callbacks.settings.llm_prices_str", "m=1.0:2.0"):
+            assert estimate_cost("m", 1_000_000, 500_000) == 2.0
+
+    def test_unknown_model_costs_nothing(self):
+        """Models missing from the table should not raise."""
+        assert estimate_cost("unknown-model", 100, 100) == 0.0
+
+
+class TestUsageCallbackHandler:
+    """Test metrics recorded for model calls."""
+
+    @pytest.mark.asyncio
+    async def test_records_tokens_cost_and_latency(self):
+        """Usage from the response should be recorded under the calling node."""
+        prompt_before = sample("toolchain_llm_tokens_total", kind="prompt")
+        completion_before = sample("toolchain_llm_tokens_total", kind="completion")
+        cost_before = sample("toolchain_llm_cost_dollars_total")
+        calls_before = sample("toolchain_llm_latency_seconds_count")
+
+        message = AIMessage(
+            content="answer",
+            usage_metadata={"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200},
+        )
+        await fake_model(message).ainvoke("hi", config=CONFIG)
+
+        assert sample("toolchain_llm_tokens_total", kind="prompt") - prompt_before == 1000
+        assert sample("toolchain_llm_tokens_total", kind="completion") - completion_before == 200
+        assert sample("toolchain_llm_cost_dollars_total") > cost_before
+        assert sample("toolchain_llm_latency_seconds_count") - calls_before == 1
+
+    @pytest.mark.asyncio
+    async def test_records_time_to_first_token_when_streaming(self):
+        """Streamed calls should observe time to first token."""
+        before = sample("toolchain_llm_time_to_first_token_seconds_count")
+
+        async for _ in fake_model(AIMessage(content="streamed answer")).astream(
+            "hi", config=CONFIG
+        ):
+            pass
+
+        assert sample("toolchain_llm_time_to_first_token_seconds_count") - before == 1
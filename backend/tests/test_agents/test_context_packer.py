@@ -0,0 +1,128 @@
+"""Tests for token-budgeted prompt context packing."""
+
+from unittest.mock import patch
+
+from src.agents.context_packer import (
+    count_tokens,
+    format_tool_block,
+    format_tool_summary,
+    pack_context,
+    truncate_tokens,
+)
+from src.data.seed_tools import get_all_tools
+
+TOOLS = get_all_tools()[:3]
+TOOL_IDS = [tool.id for tool in TOOLS]
+
+
+def pack(budget: int, search_results: str = "", include_code: bool = True):
+    with patch("src.agents.context_packer.settings.context_budget_explain", budget):
+        return pack_context(
+            retrieved_context="",
+            retrieved_tool_ids=TOOL_IDS,
+            search_results=search_results,
+            agent="explain",
+            include_code=include_code,
+        )
+
+
+class TestTokenHelpers:
+    """Test counting and truncation."""
+
+    def test_truncate_respects_limit(self):
+        """Truncated text should fit within the token limit."""
+        text = "vector databases store embeddings " * 50
+
+        assert count_tokens(truncate_tokens(text, 20)) <= 20
+        assert truncate_tokens("short", 20) == "short"
+
+
+class TestPackContext:
+    """Test budget-driven packing."""
+
+    def test_everything_fits_in_large_budget(self):
+        """A generous budget should keep every full tool block."""
+        packed = pack(budget=100_000)
+
+        assert packed.dropped_tokens == 0
+        assert all(f"## {tool.name}" in packed.retrieved_context for tool in TOOLS)
+        assert "**Code Example:**" in packed.retrieved_context
+
+    def test_lower_ranked_tools_degrade_first(self):
+        """When space runs out, later tools drop to summaries before earlier ones."""
+        first_full = count_tokens(format_tool_block(TOOLS[0]))
+        summaries = sum(count_tokens(format_tool_summary(tool)) for tool in TOOLS[1:])
+
+        packed = pack(budget=first_full + summaries)
+
+        assert format_tool_block(TOOLS[0]) in packed.retrieved_context
+        assert format_tool_summary(TOOLS[1]) in packed.retrieved_context
+        assert packed.dropped_tokens > 0
+        assert packed.packed_tokens <= first_full + summaries
+
+    def test_definition_queries_omit_code(self):
+        """Code examples should be excluded when not requested."""
+        packed = pack(budget=100_000, include_code=False)
+
+        assert "**Code Example:**" not in packed.retrieved_context
+
+    def test_search_results_keep_reserved_share(self):
+        """Search results should survive even when tools fill the budget."""
+        search = "Summary: new release " * 200
+        packed = pack(budget=400, search_results=search)
+
+        assert packed.search_results
+        assert packed.packed_tokens <= 400
+
+    def test_falls_back_to_raw_context_without_ids(self):
+        """Raw context should be truncated when tool ids are unavailable."""
+        raw = "Pinecone and Chroma are vector databases. " * 200
+        with patch("src.agents.context_packer.settings.context_budget_supervisor", 50):
+            packed = pack_context(raw, [], "", agent="supervisor")
+
+        assert count_tokens(packed.retrieved_context) <= 50
+        assert packed.dropped_tokens > 0
+
+
+class TestEncodingLoad:
+    """Test that the tokenizer never blocks requests or caches a failure."""
+
+    def test_failed_load_is_retried(self, monkeypatch):
+        """A failed download should not leave the process on estimates for good."""
+        from src.agents import context_packer
+
+        encoding = object()
+        monkeypatch.setattr(context_packer, "_encoding_loaded", None)
+        with patch(
+            "src.agents.context_packer.tiktoken.get_encoding",
+            side_effect=[OSError("offline"), encoding],
+        ):
+            assert context_packer.load_encoding() is None
+            assert context_packer.load_encoding() is encoding
+
+    def test_request_path_does_not_wait_for_download(self, monkeypatch):
+        """Counting before the tokenizer is loaded should estimate immediately."""
+        import threading
+        import time
+
+        from src.agents import context_packer
+
+        release = threading.Event()
+
+        def slow_download(name):
+            release.wait(5)
+            raise OSError("offline")
+
+        monkeypatch.setattr(context_packer, "_encoding_loaded", None)
+        monkeypatch.setattr(context_packer, "_next_load_attempt", 0.0)
+        with patch(
+            "src.agents.context_packer.tiktoken.get_encoding", side_effect=slow_download
+        ) as get_encoding:
+            started = time.perf_counter()
+            assert count_tokens("x" * 40) == 10
+            assert count_tokens("x" * 40) == 10
+            elapsed = time.perf_counter() - started
+            release.set()
+
+        assert elapsed < 1.0
+        assert get_encoding.call_count <= 1
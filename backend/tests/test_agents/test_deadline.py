@@ -0,0 +1,197 @@
+"""Tests for request deadlines and per-node time budgets."""
+
+import asyncio
+import math
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.agents.state import AgentState
+
+
+def _state(deadline_in: float | None = None, **overrides) -> AgentState:
+    state: AgentState = {
+        "query": "Best vector database?",
+        "messages": [],
+        "next_agent": None,
+        "retrieved_context": "",
+        "retrieved_tool_ids": [],
+        "search_results": "",
+        "final_response": "",
+        "iteration": 1,
+        "deadline": None if deadline_in is None else time.monotonic() + deadline_in,
+    }
+    state.update(overrides)
+    return state
+
+
+class TestBudgets:
+    """Test remaining and per-node budgets."""
+
+    def test_no_deadline_is_unbounded(self):
+        """Without a deadline the remaining budget should be infinite."""
+        from src.agents.deadline import remaining_budget
+
+        assert remaining_budget(_state()) == math.inf
+
+    def test_node_budget_capped_by_deadline(self):
+        """A node should never be given more time than the request has left."""
+        from src.agents.deadline import node_budget
+
+        with patch("src.agents.deadline.settings.explain_timeout_seconds", 30):
+            assert node_budget(_state(deadline_in=2), "explain") <= 2
+            assert node_budget(_state(deadline_in=100), "explain") == 30
+
+    def test_expired_deadline_has_zero_budget(self):
+        """A passed deadline should leave no budget rather than a negative one."""
+        from src.agents.deadline import remaining_budget
+
+        assert remaining_budget(_state(deadline_in=-5)) == 0
+
+
+class TestRunNode:
+    """Test node execution under a budget."""
+
+    @pytest.mark.asyncio
+    async def test_fast_node_returns_its_output(self):
+        """A node finishing in time should pass its output through."""
+        from src.agents.deadline import run_node
+
+        output = {"retrieved_tool_ids": ["qdrant"], "messages": []}
+        result, outcome = await run_node("rag", AsyncMock(return_value=output), _state(5))
+
+        assert outcome == "ok"
+        assert result == output
+
+    @pytest.mark.asyncio
+    async def test_slow_explain_falls_back_to_tool_list(self):
+        """An explain call past the deadline should list the retrieved tools."""
+        from src.agents.deadline import run_node
+
+        async def slow_explain(state):
+            await asyncio.sleep(1)
+            return {"final_response": "late"}
+
+        tool = MagicMock()
+        tool.name = "Qdrant"
+        tool.description = "Vector search engine"
+        state = _state(0.01, retrieved_tool_ids=["qdrant"])
+
+        with patch("src.agents.deadline.get_tool_by_id", return_value=tool):
+            result, outcome = await run_node("explain", slow_explain, state)
+
+        assert outcome == "timeout"
+        assert "**Qdrant**" in result["final_response"]
+        assert "deadline" in result["messages"][0]
+
+    @pytest.mark.asyncio
+    async def test_blocking_retrieval_falls_back(self):
+        """Synchronous vector store I/O should not outlast the RAG budget."""
+        from src.agents.deadline import run_node
+        from src.agents.rag_agent import rag_agent
+
+        def blocking_search(**kwargs):
+            time.sleep(0.5)
+            return [{"id": "qdrant"}]
+
+        start_time = time.perf_counter()
+        with patch("src.agents.rag_agent.search_tools", side_effect=blocking_search), \
+             patch("src.agents.deadline.settings.rag_timeout_seconds", 0.05):
+            result, outcome = await run_node("rag", rag_agent, _state(10))
+        elapsed = time.perf_counter() - start_time
+
+        assert outcome == "timeout"
+        assert result["degraded"] is True
+        assert elapsed < 0.4
+
+    @pytest.mark.asyncio
+    async def test_search_skipped_when_budget_low(self):
+        """Search should not start when it cannot finish in time."""
+        from src.agents.deadline import run_node
+
+        search = AsyncMock()
+        with patch("src.agents.deadline.settings.search_min_budget_seconds", 3):
+            result, outcome = await run_node("search", search, _state(1))
+
+        assert outcome == "skipped"
+        assert result["search_results"] == ""
+        search.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_slow_supervisor_routes_to_explain(self):
+        """A supervisor that times out should hand over to explain."""
+        from src.agents.deadline import bounded
+
+        async def slow_supervisor(state):
+            await asyncio.sleep(1)
+            return {"next_agent": "search"}
+
+        with patch("src.agents.deadline.settings.supervisor_timeout_seconds", 0.01):
+            result = await bounded("supervisor", slow_supervisor)(_state(10))
+
+        assert result["next_agent"] == "explain"
+        assert result["degraded"] is True
+
+
+class TestDegradedPaths:
+    """Test agents taking cheaper paths when short on time."""
+
+    @pytest.mark.asyncio
+    async def test_supervisor_skips_sources_when_budget_low(self):
+        """With little time left the supervisor should go straight to explain."""
+        from src.agents.supervisor import supervisor
+
+        state = _state(2, retrieved_tool_ids=["qdrant"], query="Latest vector databases")
+        with patch("src.agents.supervisor.settings.tavily_api_key", "tvly-test"), \
+             patch("src.agents.deadline.settings.deadline_low_budget_seconds", 15):
+            result = await supervisor(state)
+
+        assert result["next_agent"] == "explain"
+
+    @pytest.mark.asyncio
+    async def test_degraded_answers_not_cached(self):
+        """Answers produced after a deadline miss should not be cached."""
+        from src.agents.workflow import run_query
+
+        with patch("src.agents.workflow.workflow.ainvoke", new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.return_value = {
+                "final_response": "I ran out of time answering this query.",
+                "messages": ["[Explain] Timed out (deadline)"],
+                "degraded": True,
+            }
+
+            await run_query("Best vector database?")
+            await run_query("Best vector database?")
+
+            assert mock_invoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_answers_mentioning_deadlines_are_cached(self):
+        """The word 'deadline' in a normal answer should not block caching."""
+        from src.agents.workflow import run_query
+
+        with patch("src.agents.workflow.workflow.ainvoke", new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.return_value = {
+                "final_response": "Linear tracks deadlines well.",
+                "messages": ["[Supervisor] Routing to rag: deadline tracking tools"],
+                "degraded": False,
+            }
+
+            await run_query("Best tool for project deadlines?")
+            await run_query("Best tool for project deadlines?")
+
+            assert mock_invoke.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_workflow_state_carries_deadline(self):
+        """Each run should start with a deadline on the request budget."""
+        from src.agents.workflow import run_query
+
+        with patch("src.agents.workflow.workflow.ainvoke", new_callable=AsyncMock) as mock_invoke, \
+             patch("src.agents.deadline.settings.request_timeout_seconds", 45):
+            mock_invoke.return_value = {"final_response": "", "messages": []}
+            await run_query("What is MCP?")
+
+        deadline = mock_invoke.await_args.args[0]["deadline"]
+        assert 44 < deadline - time.monotonic() <= 45
@@ -1,8 +1,9 @@
 """Tests for the explain agent response generation."""
 
-import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from src.agents.state import AgentState
 
 
@@ -30,15 +31,10 @@ class TestExplainAgent:
         mock_response = MagicMock()
         mock_response.content = "Here are the best vector databases for your needs..."
 
-        with patch("src.agents.explain_agent.get_llm") as mock_get_llm, \
-             patch("src.agents.explain_agent.ChatPromptTemplate.from_messages") as mock_prompt_factory:
-            mock_llm = MagicMock()
+        with patch("src.agents.explain_agent.get_chain") as mock_get_chain:
             mock_chain = MagicMock()
             mock_chain.ainvoke = AsyncMock(return_value=mock_response)
-            mock_prompt = MagicMock()
-            mock_prompt.__or__ = MagicMock(return_value=mock_chain)
-            mock_get_llm.return_value = mock_llm
-            mock_prompt_factory.return_value = mock_prompt
+            mock_get_chain.return_value = mock_chain
 
             result = await explain_agent(explain_state)
 
@@ -51,15 +47,10 @@ class TestExplainAgent:
         """Explain agent should handle LLM errors gracefully."""
         from src.agents.explain_agent import explain_agent
 
-        with patch("src.agents.explain_agent.get_llm") as mock_get_llm, \
-             patch("src.agents.explain_agent.ChatPromptTemplate.from_messages") as mock_prompt_factory:
-            mock_llm = MagicMock()
+        with patch("src.agents.explain_agent.get_chain") as mock_get_chain:
             mock_chain = MagicMock()
             mock_chain.ainvoke = AsyncMock(side_effect=Exception("LLM API error"))
-            mock_prompt = MagicMock()
-            mock_prompt.__or__ = MagicMock(return_value=mock_chain)
-            mock_get_llm.return_value = mock_llm
-            mock_prompt_factory.return_value = mock_prompt
+            mock_get_chain.return_value = mock_chain
 
             result = await explain_agent(explain_state)
 
@@ -76,15 +67,10 @@ class TestExplainAgent:
         mock_response = MagicMock()
         mock_response.content = "Generated response"
 
-        with patch("src.agents.explain_agent.get_llm") as mock_get_llm, \
-             patch("src.agents.explain_agent.ChatPromptTemplate.from_messages") as mock_prompt_factory:
-            mock_llm = MagicMock()
+        with patch("src.agents.explain_agent.get_chain") as mock_get_chain:
             mock_chain = MagicMock()
             mock_chain.ainvoke = AsyncMock(return_value=mock_response)
-            mock_prompt = MagicMock()
-            mock_prompt.__or__ = MagicMock(return_value=mock_chain)
-            mock_get_llm.return_value = mock_llm
-            mock_prompt_factory.return_value = mock_prompt
+            mock_get_chain.return_value = mock_chain
 
             result = await explain_agent(explain_state)
 
@@ -92,38 +78,98 @@ class TestExplainAgent:
             assert "[Explain]" in result["messages"][0]
 
 
-class TestQueryTypeDetection:
-    """Test query type detection for response routing."""
-
-    def test_detect_definition_what_is(self):
-        """'What is' questions should be detected as definition."""
-        from src.agents.explain_agent import _detect_query_type
-        assert _detect_query_type("What is a vector database?") == "definition"
-        assert _detect_query_type("what is an MCP server?") == "definition"
-
-    def test_detect_definition_explain(self):
-        """'Explain' questions should be detected as definition."""
-        from src.agents.explain_agent import _detect_query_type
-        assert _detect_query_type("Explain how RAG works") == "definition"
-
-    def test_detect_definition_how_does(self):
-        """'How does' questions should be detected as definition."""
-        from src.agents.explain_agent import _detect_query_type
-        assert _detect_query_type("How does LangGraph work?") == "definition"
-
-    def test_detect_comparison_vs(self):
-        """'vs' questions should be detected as comparison."""
-        from src.agents.explain_agent import _detect_query_type
-        assert _detect_query_type("Pinecone vs Weaviate") == "comparison"
-        assert _detect_query_type("Compare Pinecone vs Weaviate") == "comparison"
-
-    def test_detect_comparison_difference(self):
-        """'difference' questions should be detected as comparison."""
-        from src.agents.explain_agent import _detect_query_type
-        assert _detect_query_type("What's the difference between Chroma and Qdrant?") == "comparison"
-
-    def test_detect_recommendation_default(self):
-        """Tool selection questions should be detected as recommendation."""
-        from src.agents.explain_agent import _detect_query_type
-        assert _detect_query_type("Best MCP server for PostgreSQL?") == "recommendation"
-        assert _detect_query_type("Which vector database should I use for RAG?") == "recommendation"
+    @pytest.mark.asyncio
+    async def test_carried_tools_reach_the_prompt(self, explain_state):
+        """Tools carried from the previous chat turn should be in the prompt."""
+        from src.agents.explain_agent import explain_agent
+        from src.agents.rag_agent import rag_agent
+
+        state = {**explain_state, "previous_tool_ids": ["pinecone-db"]}
+        with patch("src.agents.rag_agent.search_tools", return_value=[{"id": "qdrant-db"}]):
+            state.update(await rag_agent(state))
+
+        with patch("src.agents.explain_agent.get_chain") as mock_get_chain:
+            mock_chain = MagicMock()
+            mock_chain.ainvoke = AsyncMock(side_effect=RuntimeError("stop"))
+            mock_get_chain.return_value = mock_chain
+
+            await explain_agent(state)
+
+        prompt = mock_chain.ainvoke.call_args.args[0]["retrieved_context"]
+        assert state["retrieved_tool_ids"] == ["qdrant-db"]
+        assert "## Qdrant" in prompt
+        assert "## Pinecone" in prompt
+
+
+class TestAnswerStream:
+    """Test incremental rendering of streamed explain-agent output."""
+
+    def test_definition_forwards_text_deltas(self):
+        """Conversational answers should stream as raw text deltas."""
+        from langchain_core.messages import AIMessageChunk
+
+        from src.agents.explain_agent import AnswerStream
+        from src.query_analysis import analyze_query
+
+        stream = AnswerStream(analyze_query("What is MCP?"))
+        events = stream.feed(AIMessageChunk(content="MCP is"))
+
+        assert events == [{"type": "delta", "delta": "MCP is"}]
+
+    def test_structured_emits_completed_sections(self):
+        """Sections should be emitted once the model moves past them."""
+        from langchain_core.messages import AIMessageChunk
+
+        from src.agents.explain_agent import AnswerStream
+        from src.query_analysis import analyze_query
+
+        stream = AnswerStream(analyze_query("Best vector database for RAG?"))
+
+        assert stream.feed(AIMessageChunk(content='{"recommendation": "Use Qd')) == []
+
+        events = stream.feed(AIMessageChunk(content='rant", "why_this_fits": ["fa'))
+
+        assert len(events) == 1
+        assert events[0]["section"] == "recommendation"
+        assert events[0]["markdown"] == "## Recommendation\n\nUse Qdrant"
+
+    def test_structured_restarts_buffer_on_failover(self):
+        """Chunks from a new message (failover) should not corrupt the JSON."""
+        from langchain_core.messages import AIMessageChunk
+
+        from src.agents.explain_agent import AnswerStream
+        from src.query_analysis import analyze_query
+
+        stream = AnswerStream(analyze_query("Best vector database for RAG?"))
+        stream.feed(AIMessageChunk(id="run-1", content='{"recommendation": "Use Qd'))
+
+        assert stream.feed(
+            AIMessageChunk(id="run-2", content='{"recommendation": "Use Chroma", ')
+        ) == []
+        events = stream.feed(AIMessageChunk(id="run-2", content='"tradeoffs": ['))
+
+        assert [event["markdown"] for event in events] == [
+            "## Recommendation\n\nUse Chroma"
+        ]
+
+    def test_structured_reads_tool_call_chunks(self):
+        """Function-calling providers stream JSON through tool call chunks."""
+        from langchain_core.messages import AIMessageChunk
+
+        from src.agents.explain_agent import AnswerStream
+        from src.query_analysis import analyze_query
+
+        stream = AnswerStream(analyze_query("Best vector database for RAG?"))
+        chunk = AIMessageChunk(
+            content="",
+            tool_call_chunks=[{
+                "name": "StructuredAnswer",
+                "args": '{"recommendation": "Use Chroma", "options": [',
+                "id": "1",
+                "index": 0,
+            }],
+        )
+
+        events = stream.feed(chunk)
+
+        assert [e["section"] for e in events] == ["recommendation"]
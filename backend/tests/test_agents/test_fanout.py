@@ -0,0 +1,173 @@
+"""Tests for the parallel source fan-out workflow."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.agents.state import AgentState
+
+
+def _state(query: str) -> AgentState:
+    return {
+        "query": query,
+        "messages": [],
+        "next_agent": None,
+        "retrieved_context": "",
+        "retrieved_tool_ids": [],
+        "search_results": "",
+        "final_response": "",
+        "iteration": 0,
+        "conversation_history": [],
+        "previous_tool_ids": [],
+        "query_embedding": None,
+    }
+
+
+class TestPlanSources:
+    """Test the up-front source planner."""
+
+    def test_catalog_only_for_general_query(self):
+        """Evergreen questions should only consult the catalog."""
+        from src.agents.fanout import plan_sources
+
+        with patch("src.agents.fanout.settings.tavily_api_key", "tvly-test"):
+            assert plan_sources(_state("What is a vector database?")) == ["rag"]
+
+    def test_adds_search_for_recent_query(self):
+        """Questions about recent events should also search the web."""
+        from src.agents.fanout import plan_sources
+
+        with patch("src.agents.fanout.settings.tavily_api_key", "tvly-test"):
+            assert plan_sources(_state("Latest vector database releases")) == ["rag", "search"]
+
+    def test_no_search_without_tavily_key(self):
+        """Web search should not be planned when Tavily is not configured."""
+        from src.agents.fanout import plan_sources
+
+        with patch("src.agents.fanout.settings.tavily_api_key", None):
+            assert plan_sources(_state("Latest vector database releases")) == ["rag"]
+
+
+class TestBranchTimeouts:
+    """Test that slow branches degrade instead of blocking."""
+
+    @pytest.mark.asyncio
+    async def test_slow_search_degrades_to_empty_results(self):
+        """A search that exceeds its timeout should return no results."""
+        from src.agents.fanout import search_branch
+
+        async def slow_search(state):
+            await asyncio.sleep(1)
+            return {"search_results": "late", "messages": []}
+
+        with patch("src.agents.fanout.search_agent", slow_search), \
+             patch("src.agents.deadline.settings.search_timeout_seconds", 0.01), \
+             patch("src.agents.deadline.settings.search_min_budget_seconds", 0):
+            result = await search_branch(_state("Latest tools"))
+
+        assert result["search_results"] == ""
+        assert "deadline" in result["messages"][0]
+
+    @pytest.mark.asyncio
+    async def test_slow_rag_degrades_to_no_tools(self):
+        """A retrieval that exceeds its timeout should return no tools."""
+        from src.agents.fanout import rag_branch
+
+        async def slow_rag(state):
+            await asyncio.sleep(1)
+            return {"retrieved_context": "late", "retrieved_tool_ids": ["x"], "messages": []}
+
+        with patch("src.agents.fanout.rag_agent", slow_rag), \
+             patch("src.agents.deadline.settings.rag_timeout_seconds", 0.01):
+            result = await rag_branch(_state("Vector databases"))
+
+        assert result["retrieved_tool_ids"] == []
+        assert "Timed out" in result["messages"][0]
+
+    @pytest.mark.asyncio
+    async def test_fast_branch_passes_result_through(self):
+        """A branch that finishes in time should return the agent's output."""
+        from src.agents.fanout import search_branch
+
+        output = {"search_results": "fresh", "messages": ["[Search] Found 1 results"]}
+        with patch("src.agents.fanout.search_agent", AsyncMock(return_value=output)):
+            result = await search_branch(_state("Latest tools"))
+
+        assert result == output
+
+
+class TestParallelWorkflow:
+    """Test the compiled fan-out graph."""
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently_and_merge(self):
+        """Both branches should overlap and their outputs reach explain."""
+        from src.agents.workflow import create_parallel_workflow
+
+        async def rag(state):
+            await asyncio.sleep(0.2)
+            return {
+                "retrieved_context": "catalog",
+                "retrieved_tool_ids": ["pinecone"],
+                "messages": ["[RAG] Retrieved 1 relevant tools"],
+            }
+
+        async def search(state):
+            await asyncio.sleep(0.2)
+            return {"search_results": "web", "messages": ["[Search] Found 1 results"]}
+
+        seen = {}
+
+        async def explain(state):
+            seen.update(state)
+            return {"final_response": "answer", "messages": ["[Explain] Generated response"]}
+
+        with patch("src.agents.fanout.rag_agent", rag), \
+             patch("src.agents.fanout.search_agent", search), \
+             patch("src.agents.workflow.explain_agent", explain), \
+             patch("src.agents.fanout.settings.tavily_api_key", "tvly-test"):
+            graph = create_parallel_workflow().compile()
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await graph.ainvoke(_state("Latest vector database releases"))
+            elapsed = loop.time() - started
+
+        assert elapsed < 0.35
+        assert result["final_response"] == "answer"
+        assert seen["retrieved_tool_ids"] == ["pinecone"]
+        assert seen["search_results"] == "web"
+        assert "[RAG] Retrieved 1 relevant tools" in result["messages"]
+        assert "[Search] Found 1 results" in result["messages"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_retrieval_overlaps_search(self):
+        """Wall time should track the slowest branch even when retrieval blocks."""
+        import time
+
+        from src.agents.workflow import create_parallel_workflow
+
+        def blocking_search(**kwargs):
+            time.sleep(0.4)
+            return [{"id": "pinecone-db"}]
+
+        async def search(state):
+            await asyncio.sleep(0.3)
+            return {"search_results": "web", "messages": ["[Search] Found 1 results"]}
+
+        async def explain(state):
+            return {"final_response": "answer", "messages": []}
+
+        with patch("src.agents.rag_agent.search_tools", side_effect=blocking_search), \
+             patch("src.agents.fanout.search_agent", search), \
+             patch("src.agents.workflow.explain_agent", explain), \
+             patch("src.agents.fanout.settings.tavily_api_key", "tvly-test"):
+            graph = create_parallel_workflow().compile()
+            started = time.perf_counter()
+            result = await graph.ainvoke(_state("Latest vector database releases"))
+            elapsed = time.perf_counter() - started
+
+        # max(0.4, 0.3) rather than their 0.7s sum
+        assert elapsed < 0.6
+        assert result["retrieved_tool_ids"] == ["pinecone-db"]
+        assert result["search_results"] == "web"
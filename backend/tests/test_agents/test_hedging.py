@@ -0,0 +1,156 @@
+"""Tests for hedged LLM requests."""
+
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.agents.hedging import HedgePolicy, hedged
+
+
+def slow_runnable(reply: str, delay: float, calls: list[str]):
+    async def call(input):
+        calls.append(reply)
+        await asyncio.sleep(delay)
+        return reply
+
+    return RunnableLambda(call)
+
+
+def warmed_policy(latency: float = 0.01, **overrides) -> HedgePolicy:
+    options = dict(percentile=0.9, min_delay=0.0, min_samples=5, budget_ratio=1.0)
+    options.update(overrides)
+    policy = HedgePolicy(**options)
+    for _ in range(5):
+        policy.observe("key", latency)
+    return policy
+
+
+class TestHedgePolicy:
+    """Test hedge delay and budget accounting."""
+
+    def test_no_delay_until_enough_samples(self):
+        """Hedging should stay off until latency history exists."""
+        policy = HedgePolicy(min_samples=3)
+        policy.observe("key", 1.0)
+
+        assert policy.delay("key") is None
+
+    def test_delay_uses_percentile_with_floor(self):
+        """The hedge delay should be the latency percentile, at least min_delay."""
+        policy = HedgePolicy(percentile=0.5, min_delay=0.5, min_samples=3)
+        for latency in (0.1, 0.2, 3.0):
+            policy.observe("key", latency)
+
+        assert policy.delay("key") == 0.5
+
+        policy.observe("key", 4.0)
+        assert policy.delay("key") == 3.0
+
+    def test_budget_limits_hedge_share(self):
+        """Only budget_ratio of requests should be allowed to hedge."""
+        policy = HedgePolicy(budget_ratio=0.1)
+        allowed = 0
+        for _ in range(100):
+            policy.on_request()
+            allowed += policy.try_spend()
+
+        assert allowed == 10
+
+
+class TestHedgedRunnable:
+    """Test racing the primary against the hedge."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """A primary finishing before the delay should not trigger a hedge."""
+        calls = []
+        runnable = hedged(
+            "key",
+            slow_runnable("primary", 0.0, calls),
+            slow_runnable("hedge", 0.0, calls),
+            warmed_policy(latency=0.5),
+        )
+
+        assert await runnable.ainvoke("hi") == "primary"
+        assert calls == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_hedge(self):
+        """A stalled primary should be hedged and the faster reply returned."""
+        calls = []
+        runnable = hedged(
+            "key",
+            slow_runnable("primary", 5.0, calls),
+            slow_runnable("hedge", 0.0, calls),
+            warmed_policy(),
+        )
+
+        assert await asyncio.wait_for(runnable.ainvoke("hi"), 1.0) == "hedge"
+        assert calls == ["primary", "hedge"]
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_waits_for_primary(self):
+        """Without budget the primary result should be awaited unhedged."""
+        calls = []
+        runnable = hedged(
+            "key",
+            slow_runnable("primary", 0.05, calls),
+            slow_runnable("hedge", 0.0, calls),
+            warmed_policy(budget_ratio=0.0),
+        )
+
+        assert await runnable.ainvoke("hi") == "primary"
+        assert calls == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_over(self):
+        """A primary error before the delay should fall over to the secondary."""
+
+        async def fail(input):
+            raise RuntimeError("provider down")
+
+        calls = []
+        runnable = hedged(
+            "key",
+            RunnableLambda(fail),
+            slow_runnable("hedge", 0.0, calls),
+            HedgePolicy(),
+        )
+
+        assert await runnable.ainvoke("hi") == "hedge"
+
+    @pytest.mark.asyncio
+    async def test_lost_primary_latency_is_recorded(self):
+        """A primary beaten by the hedge should still enter the latency window."""
+        policy = warmed_policy(latency=0.02)
+        runnable = hedged(
+            "key",
+            slow_runnable("primary", 5.0, []),
+            slow_runnable("hedge", 0.05, []),
+            policy,
+        )
+
+        assert await runnable.ainvoke("hi") == "hedge"
+        assert len(policy._latencies["key"]) == 6
+        assert policy._latencies["key"][-1] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_streamed_calls_are_not_hedged(self):
+        """Calls streaming to a client should wait for the primary."""
+        from src.agents.hedging import STREAMING_CONFIG_KEY
+
+        calls = []
+        runnable = hedged(
+            "key",
+            slow_runnable("primary", 0.1, calls),
+            slow_runnable("hedge", 0.0, calls),
+            warmed_policy(),
+        )
+
+        result = await runnable.ainvoke(
+            "hi", {"configurable": {STREAMING_CONFIG_KEY: True}}
+        )
+
+        assert result == "primary"
+        assert calls == ["primary"]
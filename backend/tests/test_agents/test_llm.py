@@ -0,0 +1,136 @@
+"""Tests for the LLM client registry and provider failover."""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+from src.agents.llm import LLMRegistry, get_chain, get_llm
+
+
+class Schema(BaseModel):
+    answer: str
+
+
+@pytest.fixture
+def registry():
+    """Fresh registry patched in for get_llm with only OpenAI configured."""
+    registry = LLMRegistry()
+    with patch("src.agents.llm.llm_registry", registry), \
+         patch("src.agents.llm.settings.openai_api_key", "sk-test"), \
+         patch("src.agents.llm.settings.groq_api_key", None):
+        yield registry
+
+
+class TestLLMRegistry:
+    """Test runnable caching and pooled clients."""
+
+    def test_same_arguments_reuse_runnable(self, registry):
+        """Repeated calls should reuse one provider runnable per argument set."""
+        get_llm(temperature=0, structured_output=Schema)
+        get_llm(temperature=0, structured_output=Schema)
+
+        assert len(registry) == 1
+
+    def test_different_arguments_share_http_client(self, registry):
+        """Runnables for one provider should share a pooled HTTP client."""
+        get_llm(temperature=0.7)
+        get_llm(temperature=0, structured_output=Schema)
+        plain = registry.get(("openai", "gpt-4o-mini", 0.7, None), MagicMock())
+
+        assert len(registry) == 2
+        assert plain.http_async_client is registry.http_client("openai")
+        assert registry.pool_stats() == {"openai": {"active": 0, "idle": 0}}
+
+    def test_tier_selects_provider_model(self, registry):
+        """A tier should resolve to that tier's model for the provider."""
+        with patch("src.agents.model_tiers.settings.model_tiers_str", "strong=gpt-4o|big"):
+            get_llm(temperature=0, tier="strong")
+        model = registry.get(("openai", "gpt-4o", 0, None), MagicMock())
+
+        assert model.model_name == "gpt-4o"
+        assert len(registry) == 1
+
+    def test_factory_runs_once(self):
+        """A cached key should not rebuild its runnable."""
+        registry = LLMRegistry()
+        factory = MagicMock(return_value=object())
+
+        registry.get(("openai", "m", 0.0, None), factory)
+        registry.get(("openai", "m", 0.0, None), factory)
+
+        factory.assert_called_once()
+
+    def test_same_arguments_reuse_assembled_llm(self, registry):
+        """The failover runnable should be assembled once per argument set."""
+        assert get_llm(temperature=0) is get_llm(temperature=0)
+        assert get_llm(temperature=0) is not get_llm(temperature=0.7)
+
+    def test_prompt_chains_built_once_per_prompt(self, registry):
+        """Prompt chains should be reused per prompt name and provider models."""
+        prompt = ChatPromptTemplate.from_messages([("human", "{query}")])
+
+        first = get_chain("a", prompt, temperature=0, structured_output=Schema)
+        assert get_chain("a", prompt, temperature=0, structured_output=Schema) is first
+        assert get_chain("b", prompt, temperature=0, structured_output=Schema) is not first
+        assert get_chain("a", prompt, temperature=0) is not first
+        assert len(registry) == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_clears_clients(self, registry):
+        """Closing should drop pooled clients and cached runnables."""
+        get_llm(temperature=0)
+        client = registry.http_client("openai")
+
+        await registry.aclose()
+
+        assert client.is_closed
+        assert len(registry) == 0
+
+
+class TestProviderFailover:
+    """Test call-time failover between providers."""
+
+    @pytest.mark.asyncio
+    async def test_primary_serves_when_healthy(self, fake_providers):
+        """Healthy primary should answer without touching the fallback."""
+        response = await get_llm(temperature=0).ainvoke("hi")
+
+        assert response.content == "answer from openai"
+        assert fake_providers["groq"].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_provider_error(self, fake_providers):
+        """A failing primary should fall through to the next provider."""
+        fake_providers["openai"].error = httpx.ConnectError("rate limited")
+
+        response = await get_llm(temperature=0).ainvoke("hi")
+
+        assert response.content == "answer from groq"
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_primary(self, fake_providers):
+        """Once the breaker opens the primary should not be called at all."""
+        from src.agents import llm
+
+        fake_providers["openai"].error = httpx.ConnectError("down")
+        for _ in range(llm.settings.circuit_min_calls):
+            await get_llm(temperature=0).ainvoke("hi")
+        calls_before = fake_providers["openai"].calls
+
+        response = await get_llm(temperature=0).ainvoke("hi")
+
+        assert llm.circuit_breakers["openai"].state == "open"
+        assert fake_providers["openai"].calls == calls_before
+        assert response.content == "answer from groq"
+
+    @pytest.mark.asyncio
+    async def test_raises_when_all_providers_fail(self, fake_providers):
+        """The last provider error should surface when nothing succeeds."""
+        for provider in fake_providers.values():
+            provider.error = httpx.ConnectError("down")
+
+        with pytest.raises(httpx.ConnectError):
+            await get_llm(temperature=0).ainvoke("hi")
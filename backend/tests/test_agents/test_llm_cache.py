@@ -0,0 +1,150 @@
+"""Tests for the exact-match LLM response cache."""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from pydantic import BaseModel
+
+from src.agents.llm import get_llm
+from src.agents.llm_cache import LLMResponseCache, is_cacheable, make_key
+
+
+class Decision(BaseModel):
+    next_agent: str
+
+
+class TestLLMResponseCache:
+    """Test cache tiers, keys and expiry."""
+
+    def test_key_changes_with_any_input(self):
+        """Every part of the request should affect the key."""
+        base = make_key("openai", "gpt-4o-mini", 0, Decision, [HumanMessage("hi")])
+
+        assert base == make_key("openai", "gpt-4o-mini", 0, Decision, [HumanMessage("hi")])
+        assert base != make_key("groq", "gpt-4o-mini", 0, Decision, [HumanMessage("hi")])
+        assert base != make_key("openai", "gpt-4o-mini", 0, None, [HumanMessage("hi")])
+        assert base != make_key("openai", "gpt-4o-mini", 0, Decision, [HumanMessage("hey")])
+
+    def test_round_trips_messages_and_models(self):
+        """Both chat messages and structured outputs should be restored."""
+        cache = LLMResponseCache(ttl=60)
+        cache.set("message", AIMessage(content="hello"))
+        cache.set("model", Decision(next_agent="rag"))
+
+        assert cache.get("message").content == "hello"
+        assert cache.get("model", Decision) == Decision(next_agent="rag")
+
+    def test_expired_entries_miss(self):
+        """Entries older than the TTL should not be returned."""
+        cache = LLMResponseCache(ttl=60)
+        with patch("src.agents.llm_cache.time.time", return_value=1000.0):
+            cache.set("key", AIMessage(content="old"))
+        with patch("src.agents.llm_cache.time.time", return_value=1061.0):
+            assert cache.get("key") is None
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """The SQLite tier should serve entries to a fresh process."""
+        path = str(tmp_path / "llm_cache.db")
+        LLMResponseCache(ttl=60, path=path).set("key", AIMessage(content="persisted"))
+
+        assert LLMResponseCache(ttl=60, path=path).get("key").content == "persisted"
+
+    def test_memory_tier_is_bounded(self):
+        """The in-memory tier should evict least recently used entries."""
+        cache = LLMResponseCache(ttl=60, max_entries=1)
+        cache.set("a", AIMessage(content="a"))
+        cache.set("b", AIMessage(content="b"))
+
+        assert cache.get("a") is None
+        assert cache.get("b").content == "b"
+
+    def test_expired_rows_are_deleted_on_write(self, tmp_path):
+        """Pruning should remove expired rows from the SQLite file."""
+        path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(ttl=60, path=path, prune_every=1)
+        with patch("src.agents.llm_cache.time.time", return_value=1000.0):
+            cache.set("old", AIMessage(content="old"))
+        with patch("src.agents.llm_cache.time.time", return_value=1061.0):
+            cache.set("new", AIMessage(content="new"))
+
+        keys = [row[0] for row in cache._db.execute("SELECT key FROM llm_cache")]
+        assert keys == ["new"]
+
+    def test_disk_tier_is_capped(self, tmp_path):
+        """Rows over the cap should be deleted, soonest-expiring first."""
+        path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(ttl=60, path=path, max_rows=2, prune_every=1)
+        for index, key in enumerate(["a", "b", "c"]):
+            with patch("src.agents.llm_cache.time.time", return_value=1000.0 + index):
+                cache.set(key, AIMessage(content=key))
+
+        keys = {row[0] for row in cache._db.execute("SELECT key FROM llm_cache")}
+        assert keys == {"b", "c"}
+
+    @pytest.mark.asyncio
+    async def test_async_disk_io_runs_off_the_event_loop(self, tmp_path):
+        """aget/aset should hand SQLite work to a worker thread."""
+        import asyncio
+
+        path = str(tmp_path / "llm_cache.db")
+        writer = LLMResponseCache(ttl=60, path=path)
+        with patch(
+            "src.agents.llm_cache.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            await writer.aset("key", AIMessage(content="persisted"))
+            cached = await LLMResponseCache(ttl=60, path=path).aget("key")
+
+        assert cached.content == "persisted"
+        assert to_thread.call_count == 2
+
+    def test_locked_write_is_skipped(self, tmp_path):
+        """A write lock held by another worker should skip the write, not raise."""
+        import sqlite3
+        import time
+
+        path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(ttl=60, path=path)
+
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.perf_counter()
+            cache.set("key", AIMessage(content="skipped"))
+            elapsed = time.perf_counter() - started
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+
+        assert elapsed < 1.0
+        cache._memory.clear()
+        assert cache.get("key") is None
+
+    def test_only_deterministic_calls_cached_by_default(self):
+        """Sampled calls should need an explicit opt-in."""
+        assert is_cacheable(0) is True
+        assert is_cacheable(0.7) is False
+
+        with patch("src.agents.llm_cache.settings.llm_cache_all_temperatures", True):
+            assert is_cacheable(0.7) is True
+
+
+class TestCachedLLMCalls:
+    """Test the cache in front of provider calls."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_skips_provider(self, fake_providers):
+        """An identical temperature-0 prompt should be served from cache."""
+        first = await get_llm(temperature=0).ainvoke("hi")
+        second = await get_llm(temperature=0).ainvoke("hi")
+
+        assert second.content == first.content
+        assert fake_providers["openai"].calls == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_calls_not_cached(self, fake_providers):
+        """Higher-temperature calls should reach the provider every time."""
+        await get_llm(temperature=0.7).ainvoke("hi")
+        await get_llm(temperature=0.7).ainvoke("hi")
+
+        assert fake_providers["openai"].calls == 2
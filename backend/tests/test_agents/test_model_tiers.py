@@ -0,0 +1,55 @@
+"""Tests for complexity-based model tiering."""
+
+from unittest.mock import patch
+
+from src.agents.model_tiers import parse_tier_ladder, select_tier, tier_model
+
+LADDER = "fast=small-a|small-b,standard=mid-a|mid-b,strong=big-a|big-b"
+
+
+class TestTierLadder:
+    """Test ladder parsing and per-provider model lookup."""
+
+    def test_parses_tiers_in_order(self):
+        """Tiers should keep their configured order and provider models."""
+        ladder = parse_tier_ladder(LADDER)
+
+        assert list(ladder) == ["fast", "standard", "strong"]
+        assert ladder["strong"] == {"openai": "big-a", "groq": "big-b"}
+
+    def test_unknown_tier_uses_default(self):
+        """Unknown or missing tiers should fall back to the provider default."""
+        with patch("src.agents.model_tiers.settings.model_tiers_str", LADDER):
+            assert tier_model("fast", "groq") == "small-b"
+            assert tier_model("missing", "openai") is None
+            assert tier_model(None, "openai") is None
+
+
+class TestSelectTier:
+    """Test complexity scoring."""
+
+    def test_simple_definition_uses_fast_tier(self):
+        """Definitions with little context should use the cheapest tier."""
+        with patch("src.agents.model_tiers.settings.model_tiers_str", LADDER):
+            assert select_tier("definition", tool_count=2, context_tokens=500) == "fast"
+
+    def test_recommendation_uses_standard_tier(self):
+        """Typical recommendations should use the middle tier."""
+        with patch("src.agents.model_tiers.settings.model_tiers_str", LADDER):
+            assert select_tier("recommendation", tool_count=3, context_tokens=800) == "standard"
+
+    def test_large_comparison_uses_strong_tier(self):
+        """Many-tool comparisons with large context should use the top tier."""
+        with patch("src.agents.model_tiers.settings.model_tiers_str", LADDER):
+            assert select_tier("comparison", tool_count=5, context_tokens=2500) == "strong"
+
+
+class TestCheapestTier:
+    """Test the deadline fallback tier."""
+
+    def test_cheapest_is_first_tier(self):
+        """The first configured tier should be used when short on time."""
+        from src.agents.model_tiers import cheapest_tier
+
+        with patch("src.agents.model_tiers.settings.model_tiers_str", LADDER):
+            assert cheapest_tier() == "fast"
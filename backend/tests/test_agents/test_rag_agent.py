@@ -1,9 +1,10 @@
 """Tests for the RAG agent."""
 
-import pytest
 from unittest.mock import patch
 
-from src.agents.state import AgentState
+import pytest
+
+from src.data.seed_tools import get_tool_by_id
 
 
 class TestRAGAgent:
@@ -43,3 +44,104 @@ class TestRAGAgent:
             
             assert len(result["messages"]) > 0
             assert "[RAG]" in result["messages"][0]
+
+    @pytest.mark.asyncio
+    async def test_rag_agent_uses_precomputed_embedding(self, sample_agent_state):
+        """RAG agent should search by vector when an embedding is supplied."""
+        from src.agents.rag_agent import rag_agent
+
+        state = {**sample_agent_state, "query_embedding": [0.1, 0.2]}
+        with patch(
+            "src.agents.rag_agent.search_tools_by_vector", return_value=[{"id": "openai-api"}]
+        ) as by_vector, patch("src.agents.rag_agent.search_tools") as by_text:
+            result = await rag_agent(state)
+
+        by_vector.assert_called_once()
+        by_text.assert_not_called()
+        assert result["retrieved_tool_ids"] == ["openai-api"]
+
+    @pytest.mark.asyncio
+    async def test_rag_agent_carries_previous_tools(self, sample_agent_state):
+        """Tools from the previous chat turn should stay in context."""
+        from src.agents.rag_agent import rag_agent
+        from src.data.seed_tools import get_all_tools
+
+        other_id = next(t.id for t in get_all_tools() if t.id != "openai-api")
+        state = {**sample_agent_state, "previous_tool_ids": [other_id]}
+        with patch("src.agents.rag_agent.search_tools", return_value=[{"id": "openai-api"}]):
+            result = await rag_agent(state)
+
+        assert result["retrieved_tool_ids"] == ["openai-api"]
+        assert get_tool_by_id(other_id).name in result["retrieved_context"]
+
+    @pytest.mark.asyncio
+    async def test_rag_agent_carry_over_stays_bounded(self, sample_agent_state):
+        """Across chat turns only the previous turn's top tools are carried."""
+        from src.agents.rag_agent import TOP_K, rag_agent
+        from src.data.seed_tools import get_all_tools
+        from src.sessions import ChatSession
+
+        all_ids = [tool.id for tool in get_all_tools()]
+        session = ChatSession(id="s")
+        first_turn_ids = all_ids[:TOP_K]
+
+        for turn in range(4):
+            hits = all_ids[turn * TOP_K:(turn + 1) * TOP_K]
+            state = {**sample_agent_state, "previous_tool_ids": session.last_tool_ids}
+            with patch(
+                "src.agents.rag_agent.search_tools",
+                return_value=[{"id": tool_id} for tool_id in hits],
+            ):
+                result = await rag_agent(state)
+            session.record_turn(f"turn {turn}", "answer", result["retrieved_tool_ids"])
+
+            assert result["retrieved_tool_ids"] == hits
+            assert len(session.last_tool_ids) <= TOP_K
+
+        # Tools from the first turn have dropped out of the context
+        assert not any(
+            f"## {get_tool_by_id(tool_id).name}\n" in result["retrieved_context"]
+            for tool_id in first_turn_ids
+        )
+
+    @pytest.mark.asyncio
+    async def test_rag_agent_puts_named_tools_first(self, sample_agent_state):
+        """Tools named in the query should lead the context even if search missed them."""
+        from src.agents.rag_agent import rag_agent
+
+        state = {**sample_agent_state, "query": "Pinecone vs Weaviate"}
+        with patch("src.agents.rag_agent.search_tools", return_value=[{"id": "openai-api"}]):
+            result = await rag_agent(state)
+
+        assert result["retrieved_tool_ids"] == ["pinecone-db", "weaviate-db", "openai-api"]
+
+    @pytest.mark.asyncio
+    async def test_rag_agent_filters_by_query_constraints(self, sample_agent_state):
+        """A single category and a free preference should narrow the search."""
+        from src.agents.rag_agent import rag_agent
+
+        state = {**sample_agent_state, "query": "Best free vector database"}
+        with patch(
+            "src.agents.rag_agent.search_tools", return_value=[{"id": "chroma-db"}]
+        ) as search:
+            await rag_agent(state)
+
+        search.assert_called_once_with(
+            query="Best free vector database", category="vector_db", pricing="free", k=5
+        )
+
+    @pytest.mark.asyncio
+    async def test_rag_agent_relaxes_filters_without_matches(self, sample_agent_state):
+        """A filtered search with no matches should be retried unfiltered."""
+        from src.agents.rag_agent import rag_agent
+
+        state = {**sample_agent_state, "query": "Best free vector database"}
+        with patch(
+            "src.agents.rag_agent.search_tools", side_effect=[[], [{"id": "pinecone-db"}]]
+        ) as search:
+            result = await rag_agent(state)
+
+        assert search.call_count == 2
+        assert search.call_args.kwargs["category"] is None
+        assert search.call_args.kwargs["pricing"] is None
+        assert result["retrieved_tool_ids"] == ["pinecone-db"]
@@ -1,8 +1,9 @@
 """Tests for the search agent web search functionality."""
 
-import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from src.agents.state import AgentState
 
 
@@ -111,3 +112,27 @@ class TestSearchAgent:
             result = await search_agent(search_state)
 
             assert "https://example.com/test" in result["search_results"]
+
+    @pytest.mark.asyncio
+    async def test_search_agent_reuses_cached_results(self, search_state):
+        """A repeated query should be answered from the result cache."""
+        from src.agents.search_agent import search_agent
+
+        mock_response = {
+            "results": [
+                {"title": "Cached", "content": "Cached content", "url": "https://example.com/c"}
+            ]
+        }
+
+        with patch("src.agents.search_agent.AsyncTavilyClient") as mock_client_class, \
+             patch("src.agents.search_agent.settings.tavily_api_key", "test-api-key"), \
+             patch("src.agents.search_agent.settings.search_cache_enabled", True):
+            mock_client = MagicMock()
+            mock_client.search = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value = mock_client
+
+            first = await search_agent(search_state)
+            second = await search_agent(search_state)
+
+        mock_client.search.assert_awaited_once()
+        assert first["search_results"] == second["search_results"]
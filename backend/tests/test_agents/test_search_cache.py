@@ -0,0 +1,113 @@
+"""Tests for the Tavily result cache."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.agents.search_cache import SearchCache
+
+
+def _fetch(*responses):
+    return AsyncMock(side_effect=list(responses))
+
+
+class TestSearchCache:
+    """Test TTL, stale-while-revalidate and fetch sharing."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_without_fetching(self):
+        """A repeated query inside the TTL should not call Tavily again."""
+        cache = SearchCache(ttl=60, stale_ttl=60, max_entries=10)
+        fetch = _fetch({"results": ["a"]})
+
+        first = await cache.get_or_fetch("Latest vector DBs", fetch)
+        second = await cache.get_or_fetch("  latest VECTOR dbs ", fetch)
+
+        assert first == second == {"results": ["a"]}
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self):
+        """An expired entry should be returned at once and refreshed in the background."""
+        cache = SearchCache(ttl=0.05, stale_ttl=60, max_entries=10)
+        fetch = _fetch({"results": ["old"]}, {"results": ["new"]})
+
+        await cache.get_or_fetch("query", fetch)
+        await asyncio.sleep(0.06)
+        stale = await cache.get_or_fetch("query", fetch)
+        await asyncio.sleep(0)
+        refreshed = await cache.get_or_fetch("query", fetch)
+
+        assert stale == {"results": ["old"]}
+        assert refreshed == {"results": ["new"]}
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entry_past_stale_window_is_refetched(self):
+        """Entries older than TTL plus the stale window should be fetched inline."""
+        cache = SearchCache(ttl=0.02, stale_ttl=0.02, max_entries=10)
+        fetch = _fetch({"results": ["old"]}, {"results": ["new"]})
+
+        await cache.get_or_fetch("query", fetch)
+        await asyncio.sleep(0.06)
+        assert await cache.get_or_fetch("query", fetch) == {"results": ["new"]}
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self):
+        """A refresh error should leave the stale response in place."""
+        cache = SearchCache(ttl=0.05, stale_ttl=60, max_entries=10)
+        fetch = _fetch({"results": ["old"]}, Exception("Tavily down"))
+
+        await cache.get_or_fetch("query", fetch)
+        await asyncio.sleep(0.06)
+        await cache.get_or_fetch("query", fetch)
+        await asyncio.sleep(0)
+        assert await cache.get_or_fetch("query", fetch) == {"results": ["old"]}
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Identical queries arriving together should make a single Tavily call."""
+        cache = SearchCache(ttl=60, stale_ttl=60, max_entries=10)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"results": ["a"]}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("query", fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert all(result == {"results": ["a"]} for result in results)
+
+    @pytest.mark.asyncio
+    async def test_timed_out_caller_still_caches_result(self):
+        """A fetch outliving its caller's deadline should populate the cache."""
+        cache = SearchCache(ttl=60, stale_ttl=60, max_entries=10)
+
+        async def slow_fetch():
+            await asyncio.sleep(0.05)
+            return {"results": ["late"]}
+
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.01):
+                await cache.get_or_fetch("query", slow_fetch)
+        await asyncio.sleep(0.1)
+
+        fetch = AsyncMock()
+        assert await cache.get_or_fetch("query", fetch) == {"results": ["late"]}
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        """The cache should stay within its entry bound."""
+        cache = SearchCache(ttl=60, stale_ttl=60, max_entries=2)
+        for query in ("a", "b", "c"):
+            await cache.get_or_fetch(query, _fetch({"query": query}))
+
+        fetch = _fetch({"query": "a again"})
+        assert await cache.get_or_fetch("a", fetch) == {"query": "a again"}
+        fetch.assert_awaited_once()
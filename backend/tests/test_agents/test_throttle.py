@@ -0,0 +1,223 @@
+"""Tests for provider pacing and the retry policy."""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langgraph.graph import END, StateGraph
+from typing_extensions import TypedDict
+
+from src.agents.llm import get_llm
+from src.agents.throttle import (
+    ProviderLimiter,
+    ProviderThrottledError,
+    RetryBudget,
+    TokenBucket,
+    is_retryable,
+    retry_after,
+)
+
+
+class RateLimitedError(Exception):
+    """Provider 429 carrying a Retry-After header."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str = "0"):
+        super().__init__("rate limited")
+        self.response = MagicMock(headers={"retry-after": retry_after})
+
+
+class StreamingProvider(BaseChatModel):
+    """Provider that streams word by word and can drop the first N streams."""
+
+    reply: str
+    drop_streams: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "streaming-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        for word in self.reply.split():
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            if self.calls <= self.drop_streams:
+                raise httpx.ReadTimeout("stream dropped")
+
+
+class AnswerState(TypedDict):
+    answer: str
+
+
+class TestTokenBucket:
+    """Test bucket refill and reservations."""
+
+    def test_burst_within_capacity_is_immediate(self):
+        """Reservations inside the capacity should not wait."""
+        bucket = TokenBucket(rate_per_minute=60)
+
+        assert bucket.reserve(60) == 0.0
+
+    def test_overdraft_waits_for_refill(self):
+        """Going past capacity should wait for the refill rate."""
+        with patch("src.agents.throttle.time.monotonic", return_value=0.0):
+            bucket = TokenBucket(rate_per_minute=60)
+            bucket.reserve(60)
+
+            assert bucket.reserve(2) == pytest.approx(2.0)
+
+    def test_disabled_bucket_never_waits(self):
+        """A zero rate should disable pacing."""
+        assert TokenBucket(rate_per_minute=0).reserve(1_000_000) == 0.0
+
+
+class TestProviderLimiter:
+    """Test request and token pacing."""
+
+    @pytest.mark.asyncio
+    async def test_long_wait_raises_and_refunds(self):
+        """Calls that would wait too long should fail fast and give tokens back."""
+        with patch("src.agents.throttle.time.monotonic", return_value=0.0):
+            limiter = ProviderLimiter("openai", 1, 0, max_wait=1.0)
+            await limiter.acquire(10)
+
+            with pytest.raises(ProviderThrottledError):
+                await limiter.acquire(10)
+            assert limiter._requests.reserve(0) == 0.0
+
+
+class TestRetryPolicy:
+    """Test retry classification and budget."""
+
+    def test_retryable_errors(self):
+        """Rate limits, 5xx and transport errors should be retried."""
+        assert is_retryable(RateLimitedError())
+        assert is_retryable(httpx.ConnectError("reset"))
+        assert not is_retryable(ValueError("bad schema"))
+
+    def test_reads_retry_after_header(self):
+        """Retry-After should be parsed from the error response."""
+        assert retry_after(RateLimitedError("2")) == 2.0
+        assert retry_after(ValueError()) is None
+
+    def test_budget_caps_retries(self):
+        """Retries should be limited to the budget ratio once banked credit is used."""
+        budget = RetryBudget(ratio=0.5, max_credit=1.0)
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+
+        budget.on_request()
+        budget.on_request()
+        assert budget.try_spend() is True
+
+
+class TestRetriedCalls:
+    """Test retries around provider calls."""
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried_on_same_provider(self, fake_providers):
+        """A single 429 should be retried rather than failing over."""
+        fake_providers["openai"].error = RateLimitedError()
+        fake_providers["openai"].fail_times = 1
+
+        response = await get_llm(temperature=0.7).ainvoke("hi")
+
+        assert response.content == "answer from openai"
+        assert fake_providers["openai"].calls == 2
+        assert fake_providers["groq"].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_fails_over(self, fake_providers):
+        """Errors that won't succeed on retry should go straight to failover."""
+        fake_providers["openai"].error = ValueError("bad request")
+
+        response = await get_llm(temperature=0.7).ainvoke("hi")
+
+        assert response.content == "answer from groq"
+        assert fake_providers["openai"].calls == 1
+
+    @pytest.mark.asyncio
+    async def test_dropped_stream_is_not_retried(self, fake_providers):
+        """A stream cut mid-answer should fail over instead of replaying tokens."""
+        fake_providers["openai"] = StreamingProvider(
+            reply="partial answer", drop_streams=1
+        )
+        fake_providers["groq"] = StreamingProvider(reply="full answer")
+
+        async def explain(state):
+            response = await get_llm(temperature=0.7).ainvoke("hi")
+            return {"answer": response.content}
+
+        graph = StateGraph(AnswerState)
+        graph.add_node("explain", explain)
+        graph.set_entry_point("explain")
+        graph.add_edge("explain", END)
+
+        tokens, answer = [], None
+        async for mode, event in graph.compile().astream(
+            {"answer": ""}, stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                answer = event["answer"]
+            elif event[0].content:
+                tokens.append(event[0].content)
+
+        assert fake_providers["openai"].calls == 1
+        assert answer.strip() == "full answer"
+        assert tokens == ["partial ", "full ", "answer "]
+
+    @pytest.mark.asyncio
+    async def test_unstreamed_timeout_is_still_retried(self, fake_providers):
+        """Errors before any token was streamed keep the normal retry policy."""
+        fake_providers["openai"].error = httpx.ReadTimeout("slow")
+        fake_providers["openai"].fail_times = 1
+
+        response = await get_llm(temperature=0.7).ainvoke("hi")
+
+        assert response.content == "answer from openai"
+        assert fake_providers["openai"].calls == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_are_paced(self, fake_providers):
+        """Every attempt, not just the first, should go through the limiter."""
+        from src.agents import llm
+
+        fake_providers["openai"].error = RateLimitedError()
+        fake_providers["openai"].fail_times = 1
+        limiter = llm.provider_limiters["openai"]
+
+        with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            response = await get_llm(temperature=0.7).ainvoke("hi")
+
+        assert response.content == "answer from openai"
+        assert acquire.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_throttled_retry_fails_over_without_tripping_breaker(
+        self, fake_providers
+    ):
+        """A retry the limiter refuses should fail over, not count as an outage."""
+        from src.agents import llm
+
+        fake_providers["openai"].error = RateLimitedError()
+        fake_providers["openai"].fail_times = 1
+        limiter = llm.provider_limiters["openai"]
+        refusal = ProviderThrottledError("openai", 30)
+
+        with patch.object(limiter, "acquire", side_effect=[None, refusal]):
+            response = await get_llm(temperature=0.7).ainvoke("hi")
+
+        assert response.content == "answer from groq"
+        assert fake_providers["openai"].calls == 1
+        assert False not in llm.circuit_breakers["openai"]._outcomes
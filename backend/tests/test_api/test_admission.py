@@ -0,0 +1,83 @@
+"""Tests for admission control on LLM-backed endpoints."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.api.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    admission_rejected_handler,
+)
+
+
+class TestAdmissionController:
+    """Test the global in-flight workflow limit."""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_limit(self):
+        """Requests within the limit should be admitted immediately."""
+        controller = AdmissionController(max_inflight=2, max_queue=0, queue_timeout=1)
+
+        await controller.acquire("/api/query")
+        await controller.acquire("/api/query")
+
+        controller.release()
+        controller.release()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Requests beyond the limit and queue should fail fast."""
+        controller = AdmissionController(max_inflight=1, max_queue=0, queue_timeout=1)
+        await controller.acquire("/api/query")
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire("/api/query")
+
+        assert exc_info.value.reason == "queue_full"
+        controller.release()
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_queue_timeout(self):
+        """Queued requests should be rejected once the wait times out."""
+        controller = AdmissionController(max_inflight=1, max_queue=1, queue_timeout=0.01)
+        await controller.acquire("/api/query")
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire("/api/query")
+
+        assert exc_info.value.reason == "queue_timeout"
+        assert controller.waiting == 0
+        controller.release()
+
+    @pytest.mark.asyncio
+    async def test_queued_request_admitted_on_release(self):
+        """A queued request should get the slot once it is released."""
+        controller = AdmissionController(max_inflight=1, max_queue=1, queue_timeout=1)
+        await controller.acquire("/api/query")
+
+        waiter = asyncio.create_task(controller.acquire("/api/query"))
+        await asyncio.sleep(0)
+        assert controller.waiting == 1
+
+        controller.release()
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert controller.waiting == 0
+        controller.release()
+
+
+class TestAdmissionRejectedHandler:
+    """Test the 503 response for saturated servers."""
+
+    @pytest.mark.asyncio
+    async def test_returns_503_with_retry_after(self):
+        """Rejected requests should get 503 and a Retry-After header."""
+        response = await admission_rejected_handler(
+            None, AdmissionRejectedError("queue_full", retry_after=10)
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "10"
+        assert json.loads(response.body)["error"] == "server_busy"
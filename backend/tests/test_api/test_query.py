@@ -1,7 +1,8 @@
 """Tests for API endpoints."""
 
+from unittest.mock import AsyncMock, patch
+
 import pytest
-from unittest.mock import patch, AsyncMock
 
 
 class TestHealthEndpoint:
@@ -118,3 +119,250 @@ class TestSubscribeEndpoint:
         
         # Should get validation error
         assert response.status_code == 422
+
+
+class TestStreamDisconnect:
+    """Test cancellation of streaming workflows on client disconnect."""
+
+    @pytest.mark.asyncio
+    async def test_workflow_cancelled_when_client_disconnects(self):
+        """The upstream workflow should be stopped once the client leaves."""
+        import asyncio
+        from unittest.mock import MagicMock
+
+        from src.api.main import _guard_disconnect
+
+        stopped = asyncio.Event()
+
+        async def workflow_events():
+            try:
+                while True:
+                    await asyncio.sleep(0.01)
+                    yield {"node": "supervisor"}
+            finally:
+                stopped.set()
+
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(side_effect=[False, False, True])
+
+        with patch("src.api.main.settings") as mock_settings:
+            mock_settings.sse_heartbeat_seconds = 0.005
+            events = [e async for e in _guard_disconnect(request, workflow_events())]
+
+        assert stopped.is_set()
+        # Heartbeat ticks are surfaced as None
+        assert None in events
+
+
+class TestBatchQueryEndpoint:
+    """Test the NDJSON batch query endpoint."""
+
+    def test_batch_streams_ndjson_and_dedupes(self):
+        """Each query should get a line; duplicates should run once."""
+        import json
+
+        from fastapi.testclient import TestClient
+
+        from src.api.main import app
+
+        async def fake_run_query(query, endpoint="workflow"):
+            return {"final_response": f"answer to {query}", "messages": []}
+
+        with patch("src.api.main.limiter.enabled", False), \
+             patch("src.api.main.run_query", new_callable=AsyncMock) as mock_run:
+            mock_run.side_effect = fake_run_query
+            response = TestClient(app).post(
+                "/api/query/batch",
+                json={"queries": ["Best vector DB?", "best vector db", "What is MCP?"]},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(line["index"] for line in lines) == [0, 1, 2]
+        assert mock_run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_concurrency_limit(self):
+        """No more than the configured number of queries should run at once."""
+        import asyncio
+
+        from src.api.main import _run_batch
+
+        running = 0
+        peak = 0
+
+        async def fake_run_query(query, endpoint="workflow"):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"final_response": query}
+
+        with patch("src.api.main.run_query", side_effect=fake_run_query), \
+             patch("src.api.main.settings") as mock_settings:
+            mock_settings.batch_query_concurrency = 2
+            results = [r async for r in _run_batch([f"q{i}" for i in range(6)], "/batch")]
+
+        assert len(results) == 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_per_query_errors(self):
+        """A failing query should produce an error line, not abort the batch."""
+        from src.api.main import _run_batch
+
+        async def fake_run_query(query, endpoint="workflow"):
+            if query == "bad":
+                raise RuntimeError("provider down")
+            return {"final_response": "ok"}
+
+        with patch("src.api.main.run_query", side_effect=fake_run_query):
+            results = [r async for r in _run_batch(["good", "bad"], "/batch")]
+
+        by_query = {r["query"]: r for r in results}
+        assert by_query["good"]["response"] == "ok"
+        assert by_query["bad"]["error"] == "provider down"
+
+
+class TestStreamEndpoint:
+    """Test the Server-Sent Events query endpoint."""
+
+    def test_streams_every_event(self):
+        """The first event, awaited before responding, should still be sent."""
+        from fastapi.testclient import TestClient
+
+        from src.api.main import app
+
+        async def fake_stream(query, conversation_history=None, endpoint="workflow"):
+            yield {"node": "rag", "messages": ["[RAG] Retrieved 1 relevant tools"]}
+            yield {"node": "explain", "messages": [], "final_response": "answer"}
+
+        with patch("src.api.main.limiter.enabled", False), \
+             patch("src.api.main.stream_query", fake_stream):
+            response = TestClient(app).post("/api/query/stream", json={"query": "What is MCP?"})
+
+        assert response.status_code == 200
+        assert "[RAG] Retrieved 1 relevant tools" in response.text
+        assert '"final_response": "answer"' in response.text
+        assert response.text.endswith('data: {"done": true}\n\n')
+
+    def test_saturated_server_returns_503(self):
+        """A stream that cannot get a workflow slot should be rejected up front."""
+        from fastapi.testclient import TestClient
+
+        from src.api.admission import AdmissionRejectedError
+        from src.api.main import app
+
+        async def rejected_stream(query, conversation_history=None, endpoint="workflow"):
+            raise AdmissionRejectedError("queue_full", retry_after=5)
+            yield
+
+        with patch("src.api.main.limiter.enabled", False), \
+             patch("src.api.main.stream_query", rejected_stream):
+            response = TestClient(app).post("/api/query/stream", json={"query": "What is MCP?"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+
+
+class TestJobsEndpoint:
+    """Test the asynchronous job API."""
+
+    def test_create_and_fetch_job(self):
+        """Creating a job should return an id that can be looked up."""
+        from fastapi.testclient import TestClient
+
+        from src.api.main import app
+
+        with patch("src.api.main.limiter.enabled", False):
+            client = TestClient(app)
+            created = client.post("/api/jobs", json={"query": "What is MCP?"})
+            fetched = client.get(f"/api/jobs/{created.json()['job_id']}")
+
+        assert created.status_code == 202
+        assert created.json()["status"] == "queued"
+        assert fetched.status_code == 200
+        assert fetched.json()["query"] == "What is MCP?"
+
+    def test_unknown_job_returns_404(self):
+        """Unknown job ids should return 404."""
+        from fastapi.testclient import TestClient
+
+        from src.api.main import app
+
+        with patch("src.api.main.limiter.enabled", False):
+            response = TestClient(app).get("/api/jobs/does-not-exist")
+
+        assert response.status_code == 404
+
+
+    @pytest.mark.asyncio
+    async def test_rejected_job_retries_for_a_slot(self):
+        """A saturated server should delay a job rather than fail it."""
+        from src.api.admission import AdmissionRejectedError
+        from src.api.main import _run_job_query
+
+        run_query = AsyncMock(
+            side_effect=[
+                AdmissionRejectedError("queue_full", retry_after=0),
+                {"final_response": "ok"},
+            ]
+        )
+        with patch("src.api.main.run_query", run_query):
+            result = await _run_job_query("What is MCP?")
+
+        assert result["response"] == "ok"
+        assert run_query.await_count == 2
+        assert run_query.call_args.kwargs["endpoint"] == "/api/jobs"
+
+
+class TestChatWebSocket:
+    """Test the multi-turn WebSocket chat endpoint."""
+
+    def test_session_carries_history_and_tools(self):
+        """Follow-up turns should receive prior history and tool ids."""
+        from fastapi.testclient import TestClient
+
+        from src.api.main import app
+
+        calls = []
+
+        async def fake_stream(query, conversation_history=None, previous_tool_ids=None,
+                              query_embedding=None, endpoint="workflow"):
+            calls.append((query, conversation_history, previous_tool_ids, query_embedding))
+            yield {"node": "rag", "messages": [], "retrieved_tool_ids": ["openai-api"]}
+            yield {"node": "explain", "messages": [], "final_response": f"answer to {query}"}
+
+        with patch("src.api.main.stream_query", fake_stream), \
+                patch("src.api.main.embed_query", return_value=[0.5]) as embed:
+            with TestClient(app).websocket_connect("/ws/chat") as ws:
+                session = ws.receive_json()
+                for message in ("What is MCP?", "Is it free?", "what is mcp"):
+                    ws.send_json({"message": message})
+                    events = []
+                    while not events or not events[-1].get("done"):
+                        events.append(ws.receive_json())
+
+        assert session["type"] == "session"
+        assert events[-2]["final_response"] == "answer to what is mcp"
+        assert calls[0][1] == [] and calls[0][2] == []
+        assert [m["content"] for m in calls[1][1]] == ["What is MCP?", "answer to What is MCP?"]
+        assert calls[1][2] == ["openai-api"]
+        assert calls[2][3] == [0.5]
+        # Third turn repeats the first query, so its embedding is reused
+        assert embed.call_count == 2
+
+    def test_invalid_message_returns_error(self):
+        """Messages outside the length bounds should be rejected per turn."""
+        from fastapi.testclient import TestClient
+
+        from src.api.main import app
+
+        with TestClient(app).websocket_connect("/ws/chat") as ws:
+            ws.receive_json()
+            ws.send_json({"message": ""})
+            error = ws.receive_json()
+
+        assert error["type"] == "error"
@@ -1,12 +1,9 @@
 """Tests for /api/tools endpoints."""
 
-import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
 
 from src.api.main import app
 
-
 client = TestClient(app)
 
 
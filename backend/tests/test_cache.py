@@ -0,0 +1,37 @@
+"""Tests for the in-memory cache."""
+
+from src.cache import SimpleCache
+
+
+class TestSimpleCache:
+    """Test TTL expiry and the size bound."""
+
+    def test_unique_keys_stay_bounded(self):
+        """Writing many distinct keys should never grow past the cap."""
+        cache = SimpleCache(max_entries=3)
+
+        for i in range(10):
+            cache.set(f"query:{i}", i)
+
+        assert len(cache._cache) == 3
+        assert cache.get("query:0") is None
+        assert cache.get("query:9") == 9
+
+    def test_reads_keep_entries_alive(self):
+        """The least recently used entry should be evicted, not the oldest write."""
+        cache = SimpleCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_expired_entries_are_misses(self):
+        """Entries past their TTL should not be served."""
+        cache = SimpleCache()
+        cache.set("a", 1, ttl=-1)
+
+        assert cache.get("a") is None
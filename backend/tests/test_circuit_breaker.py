@@ -0,0 +1,79 @@
+"""Tests for provider circuit breakers."""
+
+from unittest.mock import patch
+
+from src.circuit_breaker import CircuitBreaker
+
+
+def make_breaker(**overrides) -> CircuitBreaker:
+    options = dict(
+        failure_rate_threshold=0.5,
+        window_size=4,
+        min_calls=4,
+        slow_call_seconds=1.0,
+        open_seconds=30.0,
+    )
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_when_error_rate_crosses_threshold(self):
+        """Half the window failing should open the circuit."""
+        breaker = make_breaker()
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+
+    def test_waits_for_minimum_calls(self):
+        """A single failure should not open a cold circuit."""
+        breaker = make_breaker()
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_slow_calls_count_as_failures(self):
+        """Calls above the latency threshold should trip the breaker."""
+        breaker = make_breaker()
+        for _ in range(4):
+            breaker.record_success(2.0)
+
+        assert breaker.state == "open"
+
+    def test_half_open_allows_single_probe(self):
+        """After the cooldown only one probe call should be let through."""
+        breaker = make_breaker(min_calls=1, window_size=1)
+        with patch("src.circuit_breaker.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+        with patch("src.circuit_breaker.time.monotonic", return_value=131.0):
+            assert breaker.state == "half_open"
+            assert breaker.allow() is True
+            assert breaker.allow() is False
+
+    def test_probe_success_closes_circuit(self):
+        """A successful probe should close the circuit."""
+        breaker = make_breaker(min_calls=1, window_size=1)
+        with patch("src.circuit_breaker.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+        with patch("src.circuit_breaker.time.monotonic", return_value=131.0):
+            breaker.allow()
+            breaker.record_success(0.1)
+
+        assert breaker.state == "closed"
+
+    def test_probe_failure_reopens_circuit(self):
+        """A failed probe should reopen the circuit for another cooldown."""
+        breaker = make_breaker(min_calls=1, window_size=1)
+        with patch("src.circuit_breaker.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+        with patch("src.circuit_breaker.time.monotonic", return_value=131.0):
+            breaker.allow()
+            breaker.record_failure()
+            assert breaker.state == "open"
@@ -0,0 +1,125 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.coalesce import SingleFlight
+
+
+class TestSingleFlightDo:
+    """Test coalescing of awaitable calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_execute_once(self):
+        """Concurrent callers with the same key should share one execution."""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"final_response": "shared"}
+
+        results = await asyncio.gather(*[flight.do("same", work) for _ in range(5)])
+
+        assert calls == 1
+        assert all(r["final_response"] == "shared" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_execute_again(self):
+        """A finished flight should not be reused by later callers."""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", work) == 1
+        assert await flight.do("key", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self):
+        """Every coalesced caller should see the leader's error."""
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", work), flight.do("key", work), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestSingleFlightStream:
+    """Test fan-out of streamed events."""
+
+    @pytest.mark.asyncio
+    async def test_stream_fans_out_one_upstream(self):
+        """Concurrent subscribers should receive the same events from one upstream."""
+        flight = SingleFlight("test")
+        starts = 0
+
+        async def upstream():
+            nonlocal starts
+            starts += 1
+            for node in ["supervisor", "rag", "explain"]:
+                await asyncio.sleep(0.005)
+                yield {"node": node}
+
+        async def collect():
+            return [event async for event in flight.stream("key", upstream)]
+
+        first, second = await asyncio.gather(collect(), collect())
+
+        assert starts == 1
+        assert first == second
+        assert [e["node"] for e in first] == ["supervisor", "rag", "explain"]
+
+    @pytest.mark.asyncio
+    async def test_upstream_cancelled_when_all_subscribers_leave(self):
+        """Closing the last subscriber should cancel the shared upstream."""
+        flight = SingleFlight("test")
+        cancelled = asyncio.Event()
+
+        async def upstream():
+            try:
+                while True:
+                    await asyncio.sleep(0.005)
+                    yield {"node": "supervisor"}
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        stream = flight.stream("key", upstream)
+        await anext(stream)
+        await stream.aclose()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert "key" not in flight._streams
+
+    @pytest.mark.asyncio
+    async def test_upstream_survives_while_subscribers_remain(self):
+        """One subscriber leaving should not cancel the stream for others."""
+        flight = SingleFlight("test")
+
+        async def upstream():
+            for node in ["supervisor", "rag", "explain"]:
+                await asyncio.sleep(0.005)
+                yield {"node": node}
+
+        leaver = flight.stream("key", upstream)
+        stayer = flight.stream("key", upstream)
+        await anext(leaver)
+        first = await anext(stayer)
+        await leaver.aclose()
+
+        rest = [event async for event in stayer]
+
+        assert [e["node"] for e in [first, *rest]] == ["supervisor", "rag", "explain"]
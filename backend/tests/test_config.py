@@ -1,8 +1,6 @@
 """Tests for application configuration."""
 
-import pytest
 import os
-from unittest.mock import patch
 
 
 class TestEnvironmentConfig:
@@ -1,7 +1,8 @@
 """Tests for the vector store functionality."""
 
+from unittest.mock import patch
+
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
 
 from src.database.vectorstore import (
     get_embeddings,
@@ -0,0 +1,103 @@
+"""Tests for liveness/readiness probes and cached dependency state."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.health import HealthState, ProviderStatus, refresh_provider_health
+
+
+@pytest.fixture
+def probe_client():
+    """Test client without lifespan startup (probes must not depend on it)."""
+    return TestClient(app)
+
+
+class TestHealthState:
+    """Test the cached dependency state."""
+
+    def test_not_ready_until_index_loaded(self):
+        """Readiness should require validated embeddings and a loaded index."""
+        state = HealthState(
+            warmed_up=True, providers={"openai": ProviderStatus(configured=True)}
+        )
+        assert state.ready is False
+
+        state.embeddings_validated = True
+        state.index_loaded = True
+        assert state.ready is True
+
+    def test_not_ready_until_warmed_up(self):
+        """Readiness should wait for the startup warmup to finish."""
+        state = HealthState(
+            embeddings_validated=True,
+            index_loaded=True,
+            providers={"openai": ProviderStatus(configured=True)},
+        )
+        assert state.ready is False
+
+        state.warmed_up = True
+        assert state.ready is True
+
+    def test_records_provider_latency(self):
+        """Successful provider calls should record latency in milliseconds."""
+        state = HealthState()
+        state.record_provider_success("openai", 0.25)
+
+        assert state.providers["openai"].last_latency_ms == 250.0
+        assert state.providers["openai"].last_error is None
+
+    @pytest.mark.asyncio
+    async def test_refresh_records_failures(self):
+        """A failing provider probe should be recorded, not raised."""
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=httpx.ConnectError("down"))
+        state = HealthState()
+
+        with patch("src.health.health_state", state), \
+             patch("src.health.settings") as mock_settings:
+            mock_settings.openai_api_key = "sk-test"
+            mock_settings.groq_api_key = None
+            await refresh_provider_health(client)
+
+        assert state.providers["openai"].last_error == "down"
+        assert "groq" not in state.providers
+
+
+class TestProbeEndpoints:
+    """Test /livez and /readyz."""
+
+    def test_livez_does_no_work(self, probe_client):
+        """Liveness should succeed without touching any dependency."""
+        with patch("src.agents.llm.get_llm") as mock_get_llm:
+            response = probe_client.get("/livez")
+
+        assert response.status_code == 200
+        mock_get_llm.assert_not_called()
+
+    def test_readyz_503_when_not_ready(self, probe_client):
+        """Readiness should fail until startup has validated dependencies."""
+        with patch("src.api.main.health_state", HealthState()):
+            response = probe_client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+    def test_readyz_200_when_ready(self, probe_client):
+        """Readiness should report the cached state once ready."""
+        state = HealthState(
+            embeddings_validated=True,
+            index_loaded=True,
+            index_count=50,
+            warmed_up=True,
+            providers={"openai": ProviderStatus(configured=True)},
+        )
+
+        with patch("src.api.main.health_state", state):
+            response = probe_client.get("/readyz")
+
+        assert response.status_code == 200
+        assert response.json()["index_count"] == 50
@@ -0,0 +1,115 @@
+"""Tests for the asynchronous job queue and workers."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.jobs import Job, JobManager, MemoryJobBackend, RedisJobBackend
+
+
+class FakeRedis:
+    """Minimal local stand-in for the redis.asyncio commands the backend uses."""
+
+    def __init__(self):
+        self.lists: dict[str, list[bytes]] = {}
+        self.values: dict[str, tuple[bytes, float]] = {}
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value.encode())
+
+    async def brpop(self, key, timeout=0):
+        deadline = time.monotonic() + timeout
+        while True:
+            items = self.lists.get(key)
+            if items:
+                return key.encode(), items.pop()
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(0.001)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = (value.encode(), time.time() + ex)
+
+    async def get(self, key):
+        entry = self.values.get(key)
+        if entry is None or time.time() > entry[1]:
+            return None
+        return entry[0]
+
+
+async def _answer(query: str) -> dict:
+    return {"response": f"answer to {query}"}
+
+
+async def _wait_for_status(manager: JobManager, job_id: str, status: str) -> Job:
+    for _ in range(200):
+        job = await manager.get(job_id)
+        if job and job.status == status:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    """Run each test against both backends."""
+    if request.param == "redis":
+        return RedisJobBackend(FakeRedis())
+    return MemoryJobBackend()
+
+
+class TestJobManager:
+    """Test job submission and execution."""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_queued_job(self, backend):
+        """Submitting should return a job id without running the query."""
+        manager = JobManager(backend, runner=_answer)
+
+        job = await manager.submit("What is MCP?")
+        stored = await manager.get(job.id)
+
+        assert stored.status == "queued"
+        assert stored.query == "What is MCP?"
+
+    @pytest.mark.asyncio
+    async def test_workers_run_jobs(self, backend):
+        """Workers should execute queued jobs and store their results."""
+        manager = JobManager(backend, runner=_answer, workers=2)
+        manager.start()
+        try:
+            job = await manager.submit("What is MCP?")
+            done = await _wait_for_status(manager, job.id, "succeeded")
+        finally:
+            await manager.stop()
+
+        assert done.result == {"response": "answer to What is MCP?"}
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self, backend):
+        """A runner exception should mark the job failed."""
+        async def failing(query):
+            raise RuntimeError("provider down")
+
+        manager = JobManager(backend, runner=failing)
+        job = await manager.submit("What is MCP?")
+        await manager.run_job(job.id)
+
+        stored = await manager.get(job.id)
+        assert stored.status == "failed"
+        assert stored.error == "provider down"
+
+    @pytest.mark.asyncio
+    async def test_results_expire(self, backend):
+        """Job records should disappear after their TTL."""
+        manager = JobManager(backend, runner=_answer, result_ttl=0)
+        job = await manager.submit("What is MCP?")
+        await asyncio.sleep(0.01)
+
+        assert await manager.get(job.id) is None
+
+    @pytest.mark.asyncio
+    async def test_dequeue_times_out_when_empty(self, backend):
+        """An empty queue should return None after the timeout."""
+        assert await backend.dequeue(timeout=0.01) is None
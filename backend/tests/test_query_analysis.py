@@ -0,0 +1,114 @@
+"""Tests for single-pass query analysis."""
+
+from src.query_analysis import QueryAnalysis, analyze_query, query_analysis
+
+
+class TestQueryType:
+    """Test query type detection for response routing."""
+
+    def test_definition_what_is(self):
+        """'What is' questions should be detected as definition."""
+        assert analyze_query("What is a vector database?").query_type == "definition"
+        assert analyze_query("what is an MCP server?").query_type == "definition"
+
+    def test_definition_explain(self):
+        """'Explain' questions should be detected as definition."""
+        assert analyze_query("Explain how RAG works").query_type == "definition"
+
+    def test_definition_how_does(self):
+        """'How does' questions should be detected as definition."""
+        assert analyze_query("How does LangGraph work?").query_type == "definition"
+
+    def test_comparison_vs(self):
+        """'vs' questions should be detected as comparison."""
+        assert analyze_query("Pinecone vs Weaviate").query_type == "comparison"
+        assert analyze_query("Compare Pinecone vs. Weaviate").query_type == "comparison"
+        assert analyze_query("Compare OpenAI vs Anthropic").query_type == "comparison"
+
+    def test_comparison_difference(self):
+        """'difference' questions should be detected as comparison."""
+        analysis = analyze_query("What's the difference between Chroma and Qdrant?")
+        assert analysis.query_type == "comparison"
+
+    def test_recommendation_default(self):
+        """Tool selection questions should be detected as recommendation."""
+        assert analyze_query("Best MCP server for PostgreSQL?").query_type == "recommendation"
+        assert analyze_query("What's the best vector database?").query_type == "recommendation"
+        assert (
+            analyze_query("Which vector database should I use for RAG?").query_type
+            == "recommendation"
+        )
+
+    def test_keywords_match_whole_words_only(self):
+        """Keywords inside other words should not count."""
+        analysis = analyze_query("Canvas renderer for devs")
+        assert analysis.query_type == "recommendation"
+        assert not analysis.wants_recent
+
+
+class TestFormatAndConstraints:
+    """Test output-format wishes and pricing/licensing constraints."""
+
+    def test_tldr_and_table(self):
+        """TL;DR and table requests should be detected."""
+        analysis = analyze_query("TL;DR of the best agent frameworks, as a table")
+        assert analysis.wants_tldr
+        assert analysis.wants_table
+
+    def test_comparison_implies_table(self):
+        """Comparisons are always answered with a table."""
+        assert analyze_query("Pinecone vs Weaviate").wants_table
+
+    def test_free_and_open_source(self):
+        """Pricing and licensing preferences should be detected."""
+        assert analyze_query("Best free LLM").wants_free
+        assert analyze_query("Best open source embedding model").wants_open_source
+        assert analyze_query("Best open-source embedding model").wants_open_source
+
+    def test_recent(self):
+        """Questions about recent events should be detected."""
+        assert analyze_query("Latest Claude release").wants_recent
+        assert analyze_query("What's new in LangChain?").wants_recent
+        assert not analyze_query("What is RAG?").wants_recent
+
+    def test_new_alone_is_not_recent(self):
+        """'new' without a time phrase describes the user's project, not news."""
+        assert not analyze_query("Best vector database for my new project").wants_recent
+
+
+class TestMentions:
+    """Test tool and category mentions."""
+
+    def test_tool_names(self):
+        """Catalog tools named in the query should be resolved to ids, in order."""
+        assert analyze_query("Pinecone vs Weaviate").tool_ids == ("pinecone-db", "weaviate-db")
+
+    def test_bare_product_name(self):
+        """A unique product name without its suffix should still resolve."""
+        assert analyze_query("Is Tavily any good?").tool_ids == ("tavily-api",)
+
+    def test_shared_product_name_is_ignored(self):
+        """A name shared by several catalog tools is too ambiguous to resolve."""
+        assert analyze_query("Is OpenAI any good?").tool_ids == ()
+
+    def test_everyday_words_are_not_tools(self):
+        """Tool names that are common words should not count as mentions."""
+        assert analyze_query("Continue with the cursor on the table").tool_ids == ()
+
+    def test_categories(self):
+        """Category phrases should map to catalog categories."""
+        assert analyze_query("Best vector databases for RAG").categories == ("vector_db",)
+        assert analyze_query("An MCP server or a CLI?").categories == ("mcp", "cli")
+
+
+class TestQueryAnalysisFromState:
+    """Test reading the analysis from workflow state."""
+
+    def test_uses_stored_analysis(self):
+        """The analysis stored in state should be returned as-is."""
+        stored = QueryAnalysis(query_type="comparison")
+        assert query_analysis({"query": "What is RAG?", "query_analysis": stored}) is stored
+
+    def test_computes_when_missing(self):
+        """States without an analysis should be analyzed on demand."""
+        assert query_analysis({"query": "What is RAG?"}).query_type == "definition"
@@ -0,0 +1,72 @@
+"""Tests for WebSocket chat sessions."""
+
+from unittest.mock import patch
+
+from src.sessions import ChatSession, SessionStore
+
+
+class TestSessionStore:
+    """Test session LRU and idle eviction."""
+
+    def test_resumes_existing_session(self):
+        """A known session id should return the same session."""
+        store = SessionStore(max_sessions=10, idle_ttl=60)
+        session = store.get_or_create()
+
+        assert store.get_or_create(session.id) is session
+
+    def test_evicts_least_recently_used_beyond_capacity(self):
+        """The oldest session should be dropped when capacity is exceeded."""
+        store = SessionStore(max_sessions=2, idle_ttl=60)
+        first = store.get_or_create("a")
+        store.get_or_create("b")
+        store.touch(first)
+        store.get_or_create("c")
+
+        assert len(store) == 2
+        assert store.get_or_create("a") is first
+        assert store.get_or_create("b").history == []
+
+    def test_evicts_idle_sessions(self):
+        """Sessions idle beyond the TTL should be removed."""
+        store = SessionStore(max_sessions=10, idle_ttl=60)
+        with patch("src.sessions.time.monotonic", return_value=1000.0):
+            store.get_or_create("old")
+        with patch("src.sessions.time.monotonic", return_value=1100.0):
+            store.get_or_create("new")
+            store.evict_idle()
+
+        assert len(store) == 1
+        assert store.get_or_create("new").id == "new"
+
+
+class TestChatSession:
+    """Test per-session history and embedding cache."""
+
+    def test_record_turn_bounds_history(self):
+        """History should keep only the most recent messages."""
+        session = ChatSession(id="s")
+        with patch("src.sessions.settings.ws_session_history_messages", 4):
+            for i in range(5):
+                session.record_turn(f"q{i}", f"a{i}", [f"tool-{i}"])
+
+        assert len(session.history) == 4
+        assert session.history[-1]["content"] == "a4"
+        assert session.last_tool_ids == ["tool-4"]
+
+    def test_embedding_cache_uses_normalized_query(self):
+        """Embeddings should be reused for equivalent queries."""
+        session = ChatSession(id="s")
+        session.remember_embedding("What is MCP?", [0.1, 0.2])
+
+        assert session.cached_embedding("what is   mcp") == [0.1, 0.2]
+
+    def test_embedding_cache_is_bounded(self):
+        """The oldest embedding should be dropped beyond the limit."""
+        session = ChatSession(id="s")
+        with patch("src.sessions.settings.ws_session_embedding_cache", 2):
+            for i in range(3):
+                session.remember_embedding(f"query {i}", [float(i)])
+
+        assert session.cached_embedding("query 0") is None
+        assert session.cached_embedding("query 2") == [2.0]
@@ -0,0 +1,128 @@
+"""Tests for request tracing, the trace buffer and Server-Timing headers."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from src.api.main import app
+from src.tracing import TraceStore, server_timing, trace_store, tracer
+
+
+@pytest.fixture
+def client():
+    """Test client without lifespan startup or rate limiting."""
+    with patch("src.api.main.limiter.enabled", False):
+        yield TestClient(app)
+
+
+class TestTraceStore:
+    """Test the in-memory ring buffer."""
+
+    def test_evicts_oldest_trace(self):
+        """The buffer should keep only the most recent traces."""
+        store = TraceStore(max_traces=2)
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(store))
+        local_tracer = provider.get_tracer("test")
+
+        for request_id in ("a", "b", "c"):
+            with local_tracer.start_as_current_span("root", attributes={"request.id": request_id}):
+                pass
+
+        assert store.find("a") is None
+        assert [span.name for span in store.find("c")] == ["root"]
+
+    def test_server_timing_sums_repeated_spans(self):
+        """Spans sharing a name should be summed; the root is reported as total."""
+        with tracer.start_as_current_span("root") as root:
+            for _ in range(2):
+                with tracer.start_as_current_span("supervisor"):
+                    pass
+            with tracer.start_as_current_span("rag"):
+                pass
+
+        header = server_timing(trace_store.spans(root.get_span_context().trace_id), 0.25)
+
+        assert header.count("supervisor;dur=") == 1
+        assert "rag;dur=" in header
+        assert header.endswith("total;dur=250.0")
+
+
+class TestNodeSpans:
+    """Test that workflow nodes are traced."""
+
+    @pytest.mark.asyncio
+    async def test_node_span_nested_under_request(self):
+        """Nodes and their sub-steps should appear under the request's root span."""
+        from src.agents.deadline import run_node
+
+        async def rag(state):
+            with tracer.start_as_current_span("rag.embed"):
+                pass
+            return {"retrieved_tool_ids": []}
+
+        with tracer.start_as_current_span("POST /api/query", attributes={"request.id": "req-1"}):
+            await run_node("rag", rag, {"query": "q", "deadline": None})
+
+        spans = {span.name: span for span in trace_store.find("req-1")}
+        assert spans["rag.embed"].parent.span_id == spans["rag"].context.span_id
+        assert spans["rag"].parent.span_id == spans["POST /api/query"].context.span_id
+        assert spans["rag"].attributes["deadline.outcome"] == "ok"
+
+
+class TestTracingMiddleware:
+    """Test request ids, Server-Timing and the debug endpoint."""
+
+    def test_response_has_request_id_and_server_timing(self, client):
+        """Every HTTP response should carry its request id and timings."""
+        response = client.get("/livez")
+
+        assert len(response.headers["X-Request-ID"]) == 32
+        assert "total;dur=" in response.headers["Server-Timing"]
+
+    def test_client_request_id_is_not_used_for_lookup(self, client):
+        """A caller-chosen id should not name (or overwrite) a stored trace."""
+        with patch("src.api.main.settings.trace_endpoint_enabled", True):
+            first = client.get("/livez", headers={"X-Request-ID": "probe-1"})
+            client.get("/livez", headers={"X-Request-ID": "probe-1"})
+
+            assert first.headers["X-Request-ID"] != "probe-1"
+            assert client.get("/debug/traces/probe-1").status_code == 404
+
+            trace = client.get(f"/debug/traces/{first.headers['X-Request-ID']}").json()
+            assert trace["spans"][0]["attributes"]["request.client_id"] == "probe-1"
+
+    def test_query_trace_served_by_debug_endpoint(self, client):
+        """A query's spans should be retrievable by its request id."""
+
+        async def fake_run_query(query, endpoint="workflow"):
+            with tracer.start_as_current_span("explain"):
+                pass
+            return {"final_response": "answer", "messages": []}
+
+        with patch("src.api.main.run_query", AsyncMock(side_effect=fake_run_query)):
+            response = client.post("/api/query", json={"query": "What is MCP?"})
+
+        request_id = response.headers["X-Request-ID"]
+        assert "explain;dur=" in response.headers["Server-Timing"]
+
+        with patch("src.api.main.settings.trace_endpoint_enabled", True):
+            trace = client.get(f"/debug/traces/{request_id}").json()
+        names = [span["name"] for span in trace["spans"]]
+        assert names[0] == "POST /api/query"
+        assert "explain" in names
+
+    def test_unknown_trace_returns_404(self, client):
+        """Unknown or evicted request ids should return 404."""
+        with patch("src.api.main.settings.trace_endpoint_enabled", True):
+            response = client.get("/debug/traces/does-not-exist")
+        assert response.status_code == 404
+
+    def test_endpoint_disabled_by_default(self, client):
+        """Traces should not be served unless the endpoint is enabled."""
+        request_id = client.get("/livez").headers["X-Request-ID"]
+
+        assert client.get(f"/debug/traces/{request_id}").status_code == 404
@@ -4,13 +4,12 @@ Tests for utility functions.
 This module tests the helper functions in src/utils.py
 """
 
-import pytest
 from src.utils import (
+    format_tool_summary,
+    normalize_query,
+    safe_get,
     slugify,
     truncate,
-    safe_get,
-    format_tool_summary,
-    parse_query_intent,
     validate_tool_data,
 )
 
@@ -119,35 +118,6 @@ class TestFormatToolSummary:
         assert "Unknown" in result
 
 
-class TestParseQueryIntent:
-    """Test cases for parse_query_intent function."""
-
-    def test_comparison_detected(self):
-        """Comparison queries should be detected."""
-        intent = parse_query_intent("Compare OpenAI vs Anthropic")
-        assert intent["is_comparison"] is True
-
-    def test_recommendation_detected(self):
-        """Recommendation queries should be detected."""
-        intent = parse_query_intent("What's the best vector database?")
-        assert intent["is_recommendation"] is True
-
-    def test_definition_detected(self):
-        """Definition queries should be detected."""
-        intent = parse_query_intent("What is RAG?")
-        assert intent["is_definition"] is True
-
-    def test_free_filter_detected(self):
-        """Free preference should be detected."""
-        intent = parse_query_intent("Best free LLM")
-        assert intent["wants_free"] is True
-
-    def test_open_source_detected(self):
-        """Open source preference should be detected."""
-        intent = parse_query_intent("Best open source embedding model")
-        assert intent["wants_open_source"] is True
-
-
 class TestValidateToolData:
     """Test cases for validate_tool_data function."""
 
@@ -182,3 +152,15 @@ class TestValidateToolData:
         }
         errors = validate_tool_data(tool)
         assert any("category" in e.lower() for e in errors)
+
+
+class TestNormalizeQuery:
+    """Test cases for normalize_query function."""
+
+    def test_case_and_whitespace_normalized(self):
+        """Case and repeated whitespace should not affect the key."""
+        assert normalize_query("  Best   Vector DB ") == normalize_query("best vector db")
+
+    def test_trailing_punctuation_removed(self):
+        """Trailing question marks should be stripped."""
+        assert normalize_query("What is RAG?") == "what is rag"
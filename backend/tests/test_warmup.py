@@ -0,0 +1,59 @@
+"""Tests for the startup warmup stage."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.warmup import load_warmup_queries, run_warmup
+
+
+class TestLoadWarmupQueries:
+    """Test reading the warmup query list."""
+
+    def test_skips_comments_and_blank_lines(self, tmp_path):
+        """Only query lines should be returned, in file order."""
+        path = tmp_path / "queries.txt"
+        path.write_text("# header\nWhat is MCP?\n\n  What is RAG?  \n")
+
+        assert load_warmup_queries(str(path)) == ["What is MCP?", "What is RAG?"]
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        """A missing file should disable replay rather than fail startup."""
+        assert load_warmup_queries(str(tmp_path / "missing.txt")) == []
+
+    def test_bundled_list_is_not_empty(self):
+        """The default warmup list should ship with the package."""
+        assert load_warmup_queries()
+
+
+class TestRunWarmup:
+    """Test the warmup steps."""
+
+    @pytest.mark.asyncio
+    async def test_failed_step_does_not_stop_warmup(self):
+        """A failing step should be logged and later steps still run."""
+        with patch("src.warmup._warm_workflow"), \
+             patch("src.warmup._warm_vectorstore", side_effect=RuntimeError("down")), \
+             patch("src.warmup._warm_llms") as warm_llms, \
+             patch("src.warmup._warm_tokenizer"), \
+             patch("src.warmup._warm_search") as warm_search, \
+             patch("src.warmup.settings.warmup_replay_top_n", 0):
+            await run_warmup()
+
+        warm_llms.assert_called_once()
+        warm_search.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_replays_top_queries(self):
+        """The first N warmup queries should be replayed through the workflow."""
+        with patch("src.warmup._warm_workflow"), \
+             patch("src.warmup._warm_vectorstore"), \
+             patch("src.warmup._warm_llms"), \
+             patch("src.warmup._warm_tokenizer"), \
+             patch("src.warmup._warm_search"), \
+             patch("src.warmup.settings.warmup_replay_top_n", 2), \
+             patch("src.warmup.load_warmup_queries", return_value=["a", "b", "c"]), \
+             patch("src.agents.workflow.run_query", new=AsyncMock()) as run_query:
+            await run_warmup()
+
+        assert [call.args[0] for call in run_query.await_args_list] == ["a", "b"]
@@ -1,7 +1,8 @@
 """End-to-end workflow tests."""
 
+from unittest.mock import AsyncMock, patch
+
 import pytest
-from unittest.mock import patch, AsyncMock
 
 from src.agents.state import AgentState
 
@@ -91,3 +92,172 @@ class TestWorkflowRouting:
         
         result = route_to_agent(state)
         assert result == "end"
+
+
+class TestWorkflowResponseCache:
+    """Test the workflow-level response cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self):
+        """A repeated query should not re-run the workflow."""
+        from src.agents.workflow import run_query
+
+        with patch("src.agents.workflow.workflow.ainvoke", new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.return_value = {
+                "final_response": "Use Qdrant.",
+                "messages": ["[Explain] Generated recommendation response"],
+                "retrieved_tool_ids": ["qdrant"],
+                "search_results": "",
+            }
+
+            first = await run_query("Best vector database?")
+            second = await run_query("  best vector DATABASE ")
+
+            assert mock_invoke.await_count == 1
+            assert second["final_response"] == first["final_response"]
+            assert second["retrieved_tool_ids"] == ["qdrant"]
+            assert second["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_error_responses_not_cached(self):
+        """Explain errors should not be cached."""
+        from src.agents.workflow import run_query
+
+        with patch("src.agents.workflow.workflow.ainvoke", new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.return_value = {
+                "final_response": "I encountered an error generating a response: boom",
+                "messages": ["[Explain] Error: boom"],
+            }
+
+            await run_query("Best vector database?")
+            await run_query("Best vector database?")
+
+            assert mock_invoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_responses_use_shorter_ttl(self):
+        """Responses involving web search should expire sooner."""
+        from src.agents.workflow import _store_response
+
+        with patch("src.agents.workflow.cache") as mock_cache, \
+             patch("src.agents.workflow.settings") as mock_settings:
+            mock_settings.response_cache_ttl = 3600
+            mock_settings.response_cache_search_ttl = 300
+
+            _store_response("q", "answer", [], [], "Summary: fresh news")
+
+            assert mock_cache.set.call_args.args[2] == 300
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_cached_response(self):
+        """Streaming a cached query should replay it without the workflow."""
+        from src.agents.workflow import _store_response, stream_query
+
+        _store_response("What is MCP?", "MCP is a protocol.", ["[Explain] Generated"], [], "")
+
+        with patch("src.agents.workflow.workflow.astream") as mock_astream:
+            events = [event async for event in stream_query("what is mcp")]
+
+            mock_astream.assert_not_called()
+            assert events[-1]["final_response"] == "MCP is a protocol."
+            assert all(e["cached"] for e in events)
+
+
+class TestWorkflowStreaming:
+    """Test how streamed runs are configured."""
+
+    @pytest.mark.asyncio
+    async def test_stream_marks_run_as_streamed(self):
+        """Streamed runs should carry the flag that disables hedging."""
+        from src.agents.hedging import STREAMING_CONFIG_KEY
+        from src.agents.workflow import stream_query
+
+        async def no_events(*args, **kwargs):
+            return
+            yield
+
+        with patch(
+            "src.agents.workflow.workflow.astream", side_effect=no_events
+        ) as astream:
+            [event async for event in stream_query("What is MCP?")]
+
+        config = astream.call_args.args[1]
+        assert config["configurable"][STREAMING_CONFIG_KEY] is True
+
+
+class TestWorkflowAdmission:
+    """Test that only workflow executions take admission slots."""
+
+    @pytest.fixture
+    def saturated(self):
+        """An admission controller whose only slot is taken and has no queue."""
+        from src.api.admission import AdmissionController
+
+        controller = AdmissionController(max_inflight=1, max_queue=0, queue_timeout=1)
+        with patch("src.agents.workflow.admission", controller):
+            yield controller
+
+    @pytest.mark.asyncio
+    async def test_coalesced_queries_share_one_slot(self):
+        """Identical concurrent queries should need a single slot between them."""
+        import asyncio
+
+        from src.agents.workflow import run_query
+        from src.api.admission import AdmissionController
+
+        async def slow_invoke(state):
+            await asyncio.sleep(0.02)
+            return {"final_response": "Use Qdrant.", "messages": []}
+
+        controller = AdmissionController(max_inflight=1, max_queue=0, queue_timeout=1)
+        with patch("src.agents.workflow.admission", controller), \
+             patch("src.agents.workflow.workflow.ainvoke", side_effect=slow_invoke) as invoke:
+            results = await asyncio.gather(
+                *[run_query("Best vector database?") for _ in range(5)]
+            )
+
+        assert invoke.await_count == 1
+        assert all(r["final_response"] == "Use Qdrant." for r in results)
+        assert not controller._semaphore.locked()
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_admission(self, saturated):
+        """A cached answer should be served even when every slot is busy."""
+        from src.agents.workflow import _store_response, run_query
+
+        _store_response("What is MCP?", "MCP is a protocol.", [], [], "")
+        await saturated.acquire("/api/query")
+
+        result = await run_query("What is MCP?")
+
+        assert result["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_stream_rejected_before_first_event(self, saturated):
+        """A stream that cannot get a slot should fail before emitting anything."""
+        from src.agents.workflow import stream_query
+        from src.api.admission import AdmissionRejectedError
+
+        await saturated.acquire("/api/query")
+
+        with patch("src.agents.workflow.workflow.astream") as mock_astream:
+            with pytest.raises(AdmissionRejectedError):
+                await anext(stream_query("What is MCP?"))
+
+        mock_astream.assert_not_called()
+
+
+class TestLazyCompilation:
+    """Test that the graph is compiled on first use."""
+
+    def test_workflow_compiled_once_on_access(self):
+        """The module-level workflow should be the cached compiled graph."""
+        from src.agents import workflow as workflow_module
+
+        workflow_module.get_workflow.cache_clear()
+        assert workflow_module.get_workflow.cache_info().currsize == 0
+
+        compiled = workflow_module.workflow
+
+        assert compiled is workflow_module.get_workflow()
+        assert workflow_module.get_workflow.cache_info().misses == 1
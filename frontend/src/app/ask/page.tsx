@@ -217,6 +217,7 @@ function AskPageContent() {
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
       let finalResponse = "";
+      let partialResponse = "";
       let buffer = "";
 
       while (true) {
@@ -250,6 +251,21 @@ function AskPageContent() {
                 }
               }
 
+              // Incremental answer text: raw deltas or completed markdown sections
+              if (!finalResponse && (parsed.type === "delta" || parsed.type === "section")) {
+                partialResponse =
+                  parsed.type === "delta"
+                    ? partialResponse + parsed.delta
+                    : [partialResponse, parsed.markdown].filter(Boolean).join("\n\n");
+                if (isMountedRef.current) {
+                  setMessages((prev) =>
+                    prev.map((msg) =>
+                      msg.id === aiMsgId ? { ...msg, content: partialResponse } : msg
+                    )
+                  );
+                }
+              }
+
               if (parsed.final_response) {
                 finalResponse = parsed.final_response;
                 if (isMountedRef.current) {